@@ -0,0 +1,83 @@
+"""Benchmark the targeted loss-tree extractor against ``pd.read_html``.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_spa_extractor [--repeat N]
+
+For each ``assets/response*.html`` fixture it times the legacy path
+(``pd.read_html`` on the whole page + ``select_relevant_table``) and the
+lxml extractor (median of ``--repeat`` runs), checks that both yield the
+same table and prints the speedup.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+from tabulate import tabulate
+
+from src.services.parse_executor import parse_html_tables
+from src.services.spa_extractor import extract_loss_tree
+
+ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
+
+
+def legacy_extract(html: str) -> pd.DataFrame:
+    tables = parse_html_tables(html)
+    return next((df for df in tables if len(df) > 20), pd.DataFrame())
+
+
+def _median_of(func: Callable[[str], pd.DataFrame], html: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    rows = []
+    for path in sorted(ASSETS_DIR.glob("response*.html")):
+        html = path.read_text(encoding="utf-8")
+        same = legacy_extract(html).equals(extract_loss_tree(html))
+        legacy = _median_of(legacy_extract, html, args.repeat)
+        targeted = _median_of(extract_loss_tree, html, args.repeat)
+        rows.append(
+            [
+                path.name,
+                f"{len(html) / 1024:.0f} KB",
+                f"{legacy * 1000:.1f}",
+                f"{targeted * 1000:.1f}",
+                f"{legacy / targeted:.1f}x",
+                "yes" if same else "NO",
+            ]
+        )
+
+    print(
+        tabulate(
+            rows,
+            headers=[
+                "fixture",
+                "size",
+                "read_html ms",
+                "extractor ms",
+                "speedup",
+                "identical",
+            ],
+            tablefmt="psql",
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
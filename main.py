@@ -1,12 +1,18 @@
+import asyncio
+import multiprocessing
+
 import ttkbootstrap as ttk
 
 from src.dashboard_view import DashboardView
+from src.services.http_client import close_client_manager
 from src.services.logging_service import (
     install_global_exception_handler,
     log_exception,
     log_warning,
 )
-from src.utils.app_config import read_config
+from src.services.parse_executor import shutdown_parse_executor
+from src.services.record_writer import shutdown_record_writer
+from src.utils.app_config import get_config_service
 from src.utils.material_theme import apply_material_theme
 from src.utils.helpers import resource_path
 from async_tkinter_loop import async_mainloop
@@ -14,6 +20,7 @@ from async_tkinter_loop import async_mainloop
 
 def main() -> None:
     install_global_exception_handler()
+    event_loop = asyncio.new_event_loop()
     try:
         root = ttk.Window(
             title="C5 SPA Dashboard",
@@ -27,14 +34,35 @@ def main() -> None:
             log_warning("Gagal memuat ikon aplikasi", icon_exc)
 
         palette = apply_material_theme(root)
-        data_config = read_config()
-        dashboard = DashboardView(master=root, palette=palette, data_config=data_config)
+        config_service = get_config_service()
+        data_config = config_service.get()
+        if data_config.watch_config:
+            config_service.watch()
+        dashboard = DashboardView(
+            master=root,
+            palette=palette,
+            data_config=data_config,
+            event_loop=event_loop,
+        )
         dashboard.pack(fill="both", expand=True)
-        async_mainloop(root)
+        async_mainloop(root, event_loop=event_loop)
     except Exception as exc:  # noqa: BLE001 - fatal but logged
         log_exception("Unhandled error dalam siklus utama aplikasi", exc)
         raise
+    finally:
+        # Close pooled SPA connections on the loop that created them
+        try:
+            event_loop.run_until_complete(close_client_manager())
+        except Exception as exc:  # noqa: BLE001 - shutdown best effort
+            log_warning("Gagal menutup koneksi SPA", exc)
+        event_loop.close()
+        get_config_service().stop_watching()
+        shutdown_parse_executor()
+        # Make sure queued issue-card saves reach the disk before exiting
+        shutdown_record_writer()
 
 
 if __name__ == "__main__":
+    # Required for the optional process-based parse executor in frozen builds
+    multiprocessing.freeze_support()
     main()
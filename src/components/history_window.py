@@ -1,13 +1,100 @@
+import asyncio
+import tkinter as tk
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta
+from operator import itemgetter
+from typing import Optional
+
 import pandas as pd
 import ttkbootstrap as ttk
-from ttkbootstrap.tableview import Tableview
+from async_tkinter_loop import async_handler
+
+from src.components.virtual_table import VirtualTreeview
+from src.services.history_loader import HistoryLoader, filter_rows, merge_positions
+from src.services.logging_service import log_exception
+from src.services.record_search import search_available, search_records
+from src.services.record_service import (
+    FileMark,
+    RecordFilter,
+    count_records,
+    iter_record_pages,
+    read_appended_records,
+    sort_newest_first,
+)
+from src.utils.app_config import AppDataConfig
+from src.utils.csvhandle import load_users
+
+HISTORY_COLUMNS = ["tanggal", "shift", "lu", "issue", "detail", "action", "user"]
+
+# Period choices of the history window, in days back from today (None = all)
+HISTORY_PERIODS = {
+    "7 Hari Terakhir": 7,
+    "30 Hari Terakhir": 30,
+    "90 Hari Terakhir": 90,
+    "Semua": None,
+}
+DEFAULT_HISTORY_PERIOD = "30 Hari Terakhir"
+CUSTOM_HISTORY_PERIOD = "Kustom"
+ALL_SHIFTS = "Semua Shift"
+ALL_USERS = "Semua User"
+ALL_LUS = "Semua LU"
+HISTORY_SHIFTS = ["Shift 1", "Shift 2", "Shift 3"]
+
+
+def history_range(
+    period: str, today: Optional[date] = None
+) -> tuple[Optional[date], Optional[date]]:
+    """Return the inclusive (start, end) ``tanggal`` range of a period label."""
+
+    days = HISTORY_PERIODS.get(period)
+    if days is None:
+        return None, None
+    today = today or date.today()
+    return today - timedelta(days=days - 1), today
+
+
+def parse_history_date(text: str) -> Optional[date]:
+    """``YYYY-MM-DD`` from a date field; empty or invalid text means open."""
+
+    try:
+        return datetime.strptime(text.strip(), "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class HistoryTail:
+    """What a finished load read, so Refresh can read just what came after."""
 
-from src.utils.csvhandle import get_database_file_path
+    marks: dict[str, FileMark]
+    start: Optional[date]
+    end: Optional[date]
+    query: str
+    where: RecordFilter
+
+
+def read_history_tail(
+    tail: HistoryTail, config: Optional[AppDataConfig] = None
+) -> Optional[tuple[pd.DataFrame, dict[str, FileMark]]]:
+    """Rows appended since ``tail`` that match its period, filters and search.
+
+    Newest first, with the marks to use next time; None when the history
+    has to be reloaded instead.
+    """
+
+    appended = read_appended_records(
+        tail.marks, HISTORY_COLUMNS, config, tail.start, tail.end, where=tail.where
+    )
+    if appended is None:
+        return None
+    df, marks = appended
+    return sort_newest_first(filter_rows(df, tail.query)), marks
 
 
 class HistoryWindow(ttk.Toplevel):
-    def __init__(self, master: ttk.Window):
+    def __init__(self, master: ttk.Window, data_config: AppDataConfig | None = None):
         super().__init__(master)
+        self.data_config = data_config
         self.title("Issue Cards History")
         self.geometry("1200x650")
         self.minsize(800, 400)
@@ -31,10 +118,35 @@ class HistoryWindow(ttk.Toplevel):
             header,
             text="Refresh",
             bootstyle="info-outline",
-            command=self.load_data,
+            command=self.refresh,
         )
         self.btn_refresh.pack(side="right")
 
+        # Only the partitions/rows of the selected period are loaded
+        self.period = ttk.Combobox(
+            header,
+            bootstyle="info",
+            width=18,
+            cursor="hand2",
+            state="readonly",
+            values=[*HISTORY_PERIODS, CUSTOM_HISTORY_PERIOD],
+        )
+        self.period.set(DEFAULT_HISTORY_PERIOD)
+        self.period.bind("<<ComboboxSelected>>", self._on_period_selected)
+        self.period.pack(side="right", padx=(0, 8))
+
+        self.search_var = ttk.StringVar()
+        self.search_entry = ttk.Entry(
+            header, textvariable=self.search_var, bootstyle="info", width=24
+        )
+        self.search_entry.bind("<Return>", lambda _event: self.load_data())
+        self.search_entry.pack(side="right", padx=(0, 8))
+        ttk.Label(header, text="Cari", style="MaterialMuted.TLabel").pack(
+            side="right", padx=(0, 6)
+        )
+
+        self._create_filters(container)
+
         table_card = ttk.Frame(
             container, style="MaterialCard.TFrame", padding=(16, 14, 16, 18)
         )
@@ -42,12 +154,20 @@ class HistoryWindow(ttk.Toplevel):
         table_card.columnconfigure(0, weight=1)
         table_card.rowconfigure(1, weight=1)
 
-        ttk.Label(
+        self.count_label = ttk.Label(
             table_card, text="Riwayat Tersimpan", style="MaterialChip.TLabel"
-        ).grid(row=0, column=0, sticky="w", pady=(0, 10))
+        )
+        self.count_label.grid(row=0, column=0, sticky="w", pady=(0, 10))
+
+        self.progress = ttk.Progressbar(
+            table_card, mode="determinate", bootstyle="info", length=200
+        )
+        self.progress_label = ttk.Label(
+            table_card, text="", style="MaterialMuted.TLabel"
+        )
 
         self._table_container = ttk.Frame(table_card, style="MaterialCardBody.TFrame")
-        self._table_container.grid(row=1, column=0, sticky="nsew")
+        self._table_container.grid(row=1, column=0, columnspan=3, sticky="nsew")
 
         self.empty_state = ttk.Label(
             self._table_container,
@@ -58,104 +178,419 @@ class HistoryWindow(ttk.Toplevel):
             justify="center",
         )
 
-        self.table: Tableview | None = None
-        self.df = self._load_csv_data()
-        self._render_table()
+        # Rows are pulled from the store page by page while scrolling
+        self.table = VirtualTreeview(
+            self._table_container,
+            HISTORY_COLUMNS,
+            stretch_columns=("issue", "detail", "action"),
+            on_need_rows=lambda: self.after_idle(self._load_next_page),
+        )
+        self._load_task: Optional[asyncio.Task] = None
+        self._load_generation = 0
+        self._loader: Optional[HistoryLoader] = None
+        self._fetching: Optional[HistoryLoader] = None
+        self._counting: Optional[asyncio.Future] = None
+        self._read = 0
+        # Tail of the running load, kept once its last page was read
+        self._loading_tail: Optional[HistoryTail] = None
+        self._tail: Optional[HistoryTail] = None
+        self._refreshing = False
+        # Searches go to the FTS5 index; without it the loaded rows are filtered
+        self._full_text = search_available()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self._apply_period(DEFAULT_HISTORY_PERIOD)
+        self.load_data()
+
+    def _create_filters(self, parent: ttk.Frame) -> None:
+        """Date range, LU, shift and user filters, applied by the store."""
 
-    def _load_csv_data(self) -> pd.DataFrame:
-        """Load data from CSV file."""
-        try:
-            csv_path = get_database_file_path()
-            header_df = pd.read_csv(csv_path, nrows=0)
-            available_columns = list(header_df.columns)
-
-            desired_order = [
-                "tanggal",
-                "shift",
-                "lu",
-                "issue",
-                "detail",
-                "action",
-                "user",
-                # "saved_at",
-            ]
-            usecols = [col for col in desired_order if col in available_columns]
-
-            dtype_map = {column: "string" for column in (usecols or available_columns)}
-
-            df = pd.read_csv(
-                csv_path,
-                usecols=usecols or None,
-                dtype=dtype_map,
-                na_filter=False,
-                memory_map=True,
+        filters = ttk.Frame(parent, style="MaterialSurface.TFrame")
+        filters.pack(fill="x", pady=(0, 12))
+
+        self.date_from = self._date_field(filters, "Dari")
+        self.date_to = self._date_field(filters, "Sampai")
+
+        link_up = self.data_config.link_up if self.data_config else ()
+        self.lu_vars = {lu: tk.BooleanVar(value=False) for lu in link_up}
+        self.lu_button = ttk.Menubutton(
+            filters, text=ALL_LUS, bootstyle="info-outline", width=16
+        )
+        lu_menu = tk.Menu(self.lu_button, tearoff=0)
+        for lu, variable in self.lu_vars.items():
+            lu_menu.add_checkbutton(
+                label=lu, variable=variable, command=self._on_lu_changed
             )
-            if usecols:
-                df = df.reindex(columns=usecols)
-
-            sort_candidates = []
-            if "tanggal" in df.columns:
-                sort_candidates.append("tanggal")
-            if "shift" in df.columns:
-                sort_candidates.append("shift")
-
-            if sort_candidates:
-                df = df.sort_values(by=sort_candidates, ascending=False).reset_index(
-                    drop=True
+        self.lu_button.configure(menu=lu_menu)
+        self.lu_button.pack(side="left", padx=(0, 8))
+
+        self.shift_filter = ttk.Combobox(
+            filters,
+            bootstyle="info",
+            width=12,
+            cursor="hand2",
+            state="readonly",
+            values=[ALL_SHIFTS, *HISTORY_SHIFTS],
+        )
+        self.shift_filter.set(ALL_SHIFTS)
+        self.shift_filter.bind("<<ComboboxSelected>>", lambda _event: self.load_data())
+        self.shift_filter.pack(side="left", padx=(0, 8))
+
+        self.user_filter = ttk.Combobox(
+            filters,
+            bootstyle="info",
+            width=16,
+            cursor="hand2",
+            state="readonly",
+            values=[ALL_USERS, *load_users()],
+        )
+        self.user_filter.set(ALL_USERS)
+        self.user_filter.bind("<<ComboboxSelected>>", lambda _event: self.load_data())
+        self.user_filter.pack(side="left", padx=(0, 8))
+
+        ttk.Button(
+            filters,
+            text="Terapkan",
+            bootstyle="info",
+            command=self._on_dates_applied,
+        ).pack(side="left")
+
+    def _date_field(self, parent: ttk.Frame, label: str) -> ttk.DateEntry:
+        ttk.Label(parent, text=label, style="MaterialMuted.TLabel").pack(
+            side="left", padx=(0, 6)
+        )
+        field = ttk.DateEntry(
+            parent, bootstyle="info", width=11, dateformat=r"%Y-%m-%d"
+        )
+        field.entry.bind("<Return>", lambda _event: self._on_dates_applied())
+        field.pack(side="left", padx=(0, 8))
+        return field
+
+    def _apply_period(self, period: str) -> None:
+        """Fill the date fields from a period preset (empty = open end)."""
+
+        start, end = history_range(period)
+        for field, value in ((self.date_from, start), (self.date_to, end)):
+            field.entry.delete(0, "end")
+            if value is not None:
+                field.entry.insert(0, value.isoformat())
+
+    def _on_period_selected(self, _event=None) -> None:
+        if self.period.get() != CUSTOM_HISTORY_PERIOD:
+            self._apply_period(self.period.get())
+        self.load_data()
+
+    def _on_dates_applied(self) -> None:
+        self.period.set(CUSTOM_HISTORY_PERIOD)
+        self.load_data()
+
+    def _on_lu_changed(self) -> None:
+        selected = [lu for lu, variable in self.lu_vars.items() if variable.get()]
+        self.lu_button.configure(text=", ".join(selected) or ALL_LUS)
+        self.load_data()
+
+    def _date_range(self) -> tuple[Optional[date], Optional[date]]:
+        return (
+            parse_history_date(self.date_from.entry.get()),
+            parse_history_date(self.date_to.entry.get()),
+        )
+
+    def _record_filter(self) -> RecordFilter:
+        shift = self.shift_filter.get()
+        user = self.user_filter.get()
+        return RecordFilter(
+            lu=tuple(lu for lu, variable in self.lu_vars.items() if variable.get()),
+            shift=() if shift == ALL_SHIFTS else (shift,),
+            user=() if user == ALL_USERS else (user,),
+        )
+
+    def load_data(self) -> None:
+        """(Re)load the history in the background, cancelling a running load."""
+
+        self.cancel_load()
+        self._tail = None
+        self._load_generation += 1
+        self._load_history(self._load_generation)
+
+    def refresh(self) -> None:
+        """Add rows saved since the last load, or reload when that is not enough.
+
+        Only bytes appended to the card files are parsed and only the new rows
+        are inserted; a changed period, filter or search, a history not yet
+        scrolled to its last page, an edited card (the file is rewritten), the
+        SQLite backend and full-text search results fall back to
+        :meth:`load_data`.
+        """
+
+        tail = self._tail
+        start, end = self._date_range()
+        query = self.search_var.get().strip()
+        where = self._record_filter()
+        if tail is None or (tail.start, tail.end, tail.query, tail.where) != (
+            start,
+            end,
+            query,
+            where,
+        ):
+            self.load_data()
+            return
+        if self._refreshing:
+            return
+        self._refreshing = True
+        self._refresh_history(self._load_generation, tail)
+
+    def cancel_load(self) -> None:
+        if self._load_task is not None and not self._load_task.done():
+            self._load_task.cancel()
+        self._load_task = None
+        self._close_loader()
+
+    def _close_loader(self) -> None:
+        if self._loader is not None:
+            self._loader.close()
+            self._loader = None
+        if self._counting is not None:
+            self._counting.cancel()
+            self._counting = None
+
+    def _on_close(self) -> None:
+        self.cancel_load()
+        self.destroy()
+
+    @async_handler
+    async def _load_history(self, generation: int) -> None:
+        """Open the pages of the store and show the first one right away.
+
+        Further pages are read when the table scrolls near its last row.
+        """
+
+        if generation != self._load_generation:
+            return  # superseded before it started
+        start, end = self._date_range()
+        query = self.search_var.get().strip()
+        where = self._record_filter()
+        if query and self._full_text:
+            task = asyncio.current_task()
+            self._load_task = task
+            await self._search_history(task, query, start, end, where)
+            return
+        loop = asyncio.get_running_loop()
+
+        def progress(done: int, total: int) -> None:
+            # Called on the loader thread for every parsed CSV chunk
+            try:
+                loop.call_soon_threadsafe(
+                    self._show_read_progress, generation, done, total
                 )
+            except RuntimeError:
+                pass  # the loop closed while the window was shutting down
 
-            return df
-        except (FileNotFoundError, pd.errors.EmptyDataError):
-            return pd.DataFrame()
+        marks: dict[str, FileMark] = {}
+        self._loader = HistoryLoader(
+            iter_record_pages(
+                HISTORY_COLUMNS,
+                self.data_config,
+                start=start,
+                end=end,
+                marks=marks,
+                where=where,
+                progress=progress,
+            ),
+            HISTORY_COLUMNS,
+            query=query,
+        )
+        if (
+            self.data_config is not None
+            and self.data_config.storage_backend == "sqlite"
+        ):
+            # An indexed COUNT; the CSV backends report progress while parsing
+            # instead of reading the files a second time to count
+            self._counting = asyncio.ensure_future(
+                asyncio.to_thread(count_records, self.data_config, start, end, where)
+            )
+        self._read = 0
+        self._loading_tail = HistoryTail(marks, start, end, query, where)
+        await self._read_chunk(first=True)
+
+    @async_handler
+    async def _load_next_page(self) -> None:
+        await self._read_chunk(first=False)
 
-    def _prepare_table_data(self, df: pd.DataFrame) -> tuple[list, list]:
-        """Convert DataFrame to Tableview format."""
-        if df.empty:
-            return [], []
+    async def _read_chunk(self, first: bool) -> None:
+        """Read the next page of the running load into the table."""
 
-        # Column headers
-        coldata = df.columns.tolist()
+        loader = self._loader
+        if loader is None or self._fetching is not None:
+            return
+        self._fetching = loader
+        task = asyncio.current_task()
+        self._load_task = task
+        self._show_progress(self._read, self._total(self._counting))
+        try:
+            chunk = await loader.next_chunk()
+            rows = chunk.rows if chunk else []
+            if first:
+                self.table.set_rows(rows, complete=chunk is None)
+                if rows:
+                    self.table.fit_columns()
+            else:
+                self.table.append_rows(rows, complete=chunk is None)
+            if chunk is None:
+                self._tail = self._loading_tail
+                self._close_loader()
+            else:
+                self._read += chunk.read
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            if not isinstance(exc, (FileNotFoundError, pd.errors.EmptyDataError)):
+                log_exception("Gagal memuat riwayat", exc)  # keep the window usable
+            if first:
+                self.table.set_rows([], complete=True)
+            else:
+                self.table.append_rows([], complete=True)
+            self._close_loader()
+        finally:
+            if self._fetching is loader:
+                self._fetching = None
+            if self._load_task is task:
+                self._load_task = None
+                if self.winfo_exists():
+                    self._hide_progress()
 
-        # Row data as list of tuples
-        rowdata = list(df.itertuples(index=False, name=None))
+    async def _search_history(
+        self,
+        task: asyncio.Task,
+        query: str,
+        start: Optional[date],
+        end: Optional[date],
+        where: RecordFilter,
+    ) -> None:
+        """Show the best full-text matches for ``query``, best first."""
 
-        return coldata, rowdata
+        self._show_progress(0, None)
+        self.empty_state.configure(text="Mencari riwayat...")
+        try:
+            df = await asyncio.to_thread(
+                search_records,
+                query,
+                HISTORY_COLUMNS,
+                self.data_config,
+                start,
+                end,
+                where,
+            )
+            rows = list(df.fillna("").itertuples(index=False, name=None))
+            self.table.set_rows(rows, complete=True)
+            if rows:
+                self.table.fit_columns()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # noqa: BLE001 - keep the window usable
+            log_exception("Gagal mencari riwayat", exc)
+            self.table.set_rows([], complete=True)
+        finally:
+            if self._load_task is task:
+                self._load_task = None
+                if self.winfo_exists():
+                    self._hide_progress()
 
-    def load_data(self):
-        """Reload data from CSV file and refresh table."""
-        self.df = self._load_csv_data()
-        self._render_table()
+    @async_handler
+    async def _refresh_history(self, generation: int, tail: HistoryTail) -> None:
+        """Merge the rows appended since ``tail`` into the loaded history."""
 
-    def _render_table(self) -> None:
-        if self.table is not None:
-            self.table.destroy()
-            self.table = None
+        try:
+            if generation != self._load_generation:
+                return  # a reload started in the meantime
+            task = asyncio.current_task()
+            self._load_task = task
+            try:
+                appended = await asyncio.to_thread(
+                    read_history_tail, tail, self.data_config
+                )
+            except Exception as exc:  # noqa: BLE001 - a full reload still works
+                log_exception("Gagal memuat riwayat terbaru", exc)
+                appended = None
+            finally:
+                if self._load_task is task:
+                    self._load_task = None
+        finally:
+            self._refreshing = False
+        if generation != self._load_generation or not self.winfo_exists():
+            return
+        if appended is None:
+            self.load_data()
+            return
 
-        if self.empty_state.winfo_ismapped():
-            self.empty_state.pack_forget()
+        df, marks = appended
+        rows = list(
+            df.reindex(columns=HISTORY_COLUMNS)
+            .fillna("")
+            .itertuples(index=False, name=None)
+        )
+        sort_key = itemgetter(
+            HISTORY_COLUMNS.index("tanggal"), HISTORY_COLUMNS.index("shift")
+        )
+        self.table.insert_rows(merge_positions(self.table.rows, rows, sort_key), rows)
+        self._tail = replace(tail, marks=marks)
+        self._update_state()
+
+    @staticmethod
+    def _total(counting: Optional[asyncio.Future]) -> Optional[int]:
+        if (
+            counting is None
+            or not counting.done()
+            or counting.cancelled()
+            or counting.exception()
+        ):
+            return None
+        return counting.result()
 
-        if self.df.empty:
-            self.empty_state.pack(fill="both", expand=True)
+    def _show_progress(self, read: int, total: Optional[int]) -> None:
+        if not self.progress.winfo_manager():
+            self.progress_label.grid(row=0, column=1, sticky="e", padx=(0, 8))
+            self.progress.grid(row=0, column=2, sticky="e")
+        if total:
+            self.progress.configure(maximum=total, value=min(read, total))
+            self.progress_label.configure(text=f"Memuat {read}/{total} baris")
+        else:
+            self.progress.configure(maximum=1, value=0)
+            self.progress_label.configure(text=f"Memuat {read} baris")
+        self.empty_state.configure(text="Memuat riwayat...")
+        self._update_state()
+
+    def _show_read_progress(self, generation: int, done: int, total: int) -> None:
+        """Advance the bar while the loader parses the card files."""
+
+        if (
+            generation != self._load_generation
+            or self._fetching is None
+            or not total
+            or not self.winfo_exists()
+        ):
             return
+        self.progress.configure(maximum=total, value=min(done, total))
+        self.progress_label.configure(
+            text=f"Memuat riwayat {min(done, total) * 100 // total}%"
+        )
 
-        coldata, rowdata = self._prepare_table_data(self.df)
-        self.table = Tableview(
-            self._table_container,
-            coldata=coldata,
-            rowdata=rowdata,
-            searchable=True,
-            bootstyle="info",
-            height=28,
-            autofit=True,
-            # paginated=True,
-            # pagesize=30,
-            yscrollbar=True,
-        )
-        for column in ("issue", "detail", "action"):
-            if column in coldata:
-                col_index = coldata.index(column)
-                self.table.view.column(col_index, stretch=True)
-        if "user" in coldata:
-            user_index = coldata.index("user")
-            self.table.view.column(user_index, width=200, minwidth=140, stretch=False)
-        self.table.pack(fill="both", expand=True)
+    def _hide_progress(self) -> None:
+        self.progress.grid_remove()
+        self.progress_label.grid_remove()
+        self.empty_state.configure(text="Belum ada riwayat tersimpan.")
+        self._update_state()
+
+    def _update_state(self) -> None:
+        count = self.table.row_count
+        more = "" if self.table.complete else "+"
+        self.count_label.configure(text=f"Riwayat Tersimpan · {count}{more} baris")
+
+        if count == 0:
+            if self.table.winfo_manager():
+                self.table.pack_forget()
+            if not self.empty_state.winfo_manager():
+                self.empty_state.pack(fill="both", expand=True)
+            return
+        if self.empty_state.winfo_manager():
+            self.empty_state.pack_forget()
+        if not self.table.winfo_manager():
+            self.table.pack(fill="both", expand=True)
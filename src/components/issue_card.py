@@ -2,7 +2,7 @@ import tkinter as tk
 import uuid
 from pathlib import Path
 from tkinter import Menu, messagebox, font as tkfont
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 import ttkbootstrap as ttk
 import pandas as pd
@@ -10,6 +10,7 @@ from PIL import Image, ImageTk, UnidentifiedImageError
 from ttkbootstrap.scrolled import ScrolledFrame
 from ttkbootstrap.tooltip import ToolTip
 
+from src.components.suggestion_popup import SuggestionPopup
 from src.services.logging_service import log_exception, log_warning
 from src.utils.helpers import resource_path
 from src.utils.material_theme import MATERIAL_PALETTE
@@ -154,6 +155,15 @@ def setup_entry_placeholder(
     entry.bind("<FocusOut>", handle_focus_out, add="+")
 
 
+def set_entry_text(entry: ttk.Entry, text: str, text_color: str) -> None:
+    """Replace the text of a placeholder entry, leaving placeholder state."""
+
+    entry.delete(0, "end")
+    entry.insert(0, text)
+    entry.configure(foreground=text_color)
+    entry._placeholder_active = False
+
+
 # ----------------------------------------------------------------------
 # Action Item (klik kanan -> delete)
 # ----------------------------------------------------------------------
@@ -163,6 +173,7 @@ class ActionItem(ttk.Frame):
         master,
         on_remove=None,
         palette: Optional[Dict[str, str]] = None,
+        lu_provider: Optional[Callable[[], str]] = None,
         **kwargs,
     ):
         super().__init__(master, style="MaterialSubsection.TFrame", **kwargs)
@@ -195,6 +206,9 @@ class ActionItem(ttk.Frame):
             slant="italic",
         )
         self.entry.configure(font=entry_italic)
+        self.suggestions = SuggestionPopup(
+            self.entry, "action", lu_provider, palette=self.palette
+        )
 
         self.entry.bind("<Button-3>", self.show_context_menu)
         self.context_menu = Menu(self, tearoff=0)
@@ -203,6 +217,9 @@ class ActionItem(ttk.Frame):
     def focus_entry(self) -> None:
         self.entry.focus_set()
 
+    def set_text(self, text: str) -> None:
+        set_entry_text(self.entry, text, self.palette.get("on_surface", "#FFFFFF"))
+
     def show_context_menu(self, event: tk.Event):
         try:
             self.context_menu.tk_popup(event.x_root, event.y_root)
@@ -230,6 +247,7 @@ class DetailItem(ttk.Frame):
         on_remove=None,
         number: Optional[int] = None,
         palette: Optional[Dict[str, str]] = None,
+        lu_provider: Optional[Callable[[], str]] = None,
         **kwargs,
     ):
         super().__init__(
@@ -240,6 +258,7 @@ class DetailItem(ttk.Frame):
         )
         self.on_remove = on_remove
         self.palette = _resolve_palette(palette)
+        self.lu_provider = lu_provider
         self.action_items: List[ActionItem] = []
 
         header = ttk.Frame(self, style="MaterialSubsection.TFrame")
@@ -262,6 +281,9 @@ class DetailItem(ttk.Frame):
         )
         self.textbox.pack(side="left", fill="x", expand=True, padx=(5, 5))
         self.textbox.bind("<Button-3>", self.show_context_menu)
+        self.suggestions = SuggestionPopup(
+            self.textbox, "detail", lu_provider, palette=self.palette
+        )
 
         self.add_action_btn = ttk.Button(
             header,
@@ -295,6 +317,17 @@ class DetailItem(ttk.Frame):
     def focus_entry(self) -> None:
         self.textbox.focus_set()
 
+    def set_text(self, text: str) -> None:
+        set_entry_text(self.textbox, text, self.palette.get("on_surface", "#FFFFFF"))
+
+    def set_actions(self, actions: List[str]) -> None:
+        """Fill the action entries, adding entries as needed."""
+
+        for index, text in enumerate(actions):
+            if index >= len(self.action_items):
+                self.add_action()
+            self.action_items[index].set_text(text)
+
     def set_order(self, index: int) -> None:
         self.index_chip.configure(text=self._format_label(index))
 
@@ -309,6 +342,7 @@ class DetailItem(ttk.Frame):
             self.action_container,
             on_remove=self.remove_action,
             palette=self.palette,
+            lu_provider=self.lu_provider,
         )
         item.pack(fill="x", pady=(0, 0))
         self.action_items.append(item)
@@ -341,12 +375,14 @@ class IssueCard(ttk.Frame):
         master,
         on_delete=None,
         palette: Optional[Dict[str, str]] = None,
+        lu_provider: Optional[Callable[[], str]] = None,
         **kwargs,
     ):
         super().__init__(master, style="MaterialCard.TFrame", **kwargs)
         self.card_id = str(uuid.uuid4())
         self.on_delete = on_delete
         self.palette = _resolve_palette(palette)
+        self.lu_provider = lu_provider
         self.detail_items: List[DetailItem] = []
 
         self.columnconfigure(1, weight=1)
@@ -382,6 +418,9 @@ class IssueCard(ttk.Frame):
             weight="bold",
         )
         self.issue_entry.configure(font=bold_font)
+        self.suggestions = SuggestionPopup(
+            self.issue_entry, "issue", lu_provider, palette=self.palette
+        )
 
         self.add_detail_btn = ttk.Button(
             header,
@@ -434,6 +473,7 @@ class IssueCard(ttk.Frame):
             on_remove=self.remove_detail_item,
             number=len(self.detail_items) + 1,
             palette=self.palette,
+            lu_provider=self.lu_provider,
         )
         item.pack(fill="x", pady=(5, 0))
         self.detail_items.append(item)
@@ -457,10 +497,20 @@ class IssueCard(ttk.Frame):
 
     def set_issue(self, issue_text: str):
         """Populate the issue entry without triggering placeholder state."""
-        self.issue_entry.delete(0, "end")
-        self.issue_entry.insert(0, issue_text)
-        self.issue_entry.configure(foreground=self.palette.get("on_surface", "#FFFFFF"))
-        self.issue_entry._placeholder_active = False
+        set_entry_text(
+            self.issue_entry, issue_text, self.palette.get("on_surface", "#FFFFFF")
+        )
+
+    def set_details(self, details: List[Dict[str, object]]) -> None:
+        """Fill details and actions from ``{"detail", "actions"}`` entries."""
+
+        for index, entry in enumerate(details):
+            if index >= len(self.detail_items):
+                self.add_detail_item()
+            item = self.detail_items[index]
+            item.set_text(str(entry.get("detail", "")))
+            item.set_actions(list(entry.get("actions", [])))
+        self.issue_entry.focus_set()
 
     def get_data(self):
         if getattr(self.issue_entry, "_placeholder_active", False):
@@ -483,6 +533,7 @@ class IssueCardFrame(ttk.Frame):
         self,
         master,
         palette: Optional[Dict[str, str]] = None,
+        lu_provider: Optional[Callable[[], str]] = None,
         **kwargs,
     ):
         super().__init__(
@@ -492,6 +543,8 @@ class IssueCardFrame(ttk.Frame):
             **kwargs,
         )
         self.palette = _resolve_palette(palette)
+        # Returns the selected LU, whose texts are suggested first
+        self.lu_provider = lu_provider
         self.cards: Dict[str, IssueCard] = {}
 
         header = ttk.Frame(self, style="MaterialHeader.TFrame")
@@ -634,6 +687,7 @@ class IssueCardFrame(ttk.Frame):
             self.cards_container,
             on_delete=self.remove_card,
             palette=self.palette,
+            lu_provider=self.lu_provider,
         )
         card.pack(fill="x", pady=5)
         self.cards[card.card_id] = card
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+import ttkbootstrap as ttk
+
+from src.services.multi_fetch import FetchOutcome
+from src.utils.constants import SUMMARY_METRICS
+
+STATUS_LOADING = "Memuat..."
+STATUS_OK = "OK"
+STATUS_TIMEOUT = "Timeout"
+STATUS_FAILED = "Gagal"
+
+
+class OverviewWindow(ttk.Toplevel):
+    """KPI grid with one row per line, filled in as each fetch completes."""
+
+    def __init__(self, master: ttk.Window, palette: Optional[dict] = None):
+        super().__init__(master)
+        self.palette = palette or {}
+        self.title("Overview Semua Line")
+        self.geometry("900x420")
+        self.minsize(700, 300)
+        self.configure(background=self.palette.get("background", "#101418"))
+
+        container = ttk.Frame(
+            self, padding=(16, 18, 16, 16), style="MaterialSurface.TFrame"
+        )
+        container.pack(fill="both", expand=True)
+
+        header = ttk.Frame(container, style="MaterialSurface.TFrame")
+        header.pack(fill="x", pady=(0, 12))
+
+        ttk.Label(
+            header,
+            text="Overview Semua Line",
+            style="MaterialTitle.TLabel",
+        ).pack(anchor="w")
+        self.subtitle = ttk.Label(header, text="", style="MaterialSubtitle.TLabel")
+        self.subtitle.pack(anchor="w", pady=(4, 0))
+
+        table_card = ttk.Frame(
+            container, style="MaterialCard.TFrame", padding=(16, 14, 16, 18)
+        )
+        table_card.pack(fill="both", expand=True)
+        table_card.columnconfigure(0, weight=1)
+        table_card.rowconfigure(1, weight=1)
+
+        self.status_label = ttk.Label(table_card, text="", style="MaterialChip.TLabel")
+        self.status_label.grid(row=0, column=0, sticky="w", pady=(0, 10))
+
+        columns = ("LINE", *SUMMARY_METRICS, "STATUS")
+        self.tree = ttk.Treeview(
+            table_card, columns=columns, show="headings", height=10
+        )
+        for column in columns:
+            self.tree.heading(column, text=column)
+            self.tree.column(
+                column,
+                width=110 if column in ("LINE", "STATUS") else 90,
+                anchor="w" if column == "LINE" else "center",
+                stretch=True,
+            )
+        self.tree.grid(row=1, column=0, sticky="nsew")
+
+        scrollbar = ttk.Scrollbar(
+            table_card, orient="vertical", command=self.tree.yview
+        )
+        scrollbar.grid(row=1, column=1, sticky="ns")
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        self._pending = 0
+
+    def start(self, lines: Iterable[str], subtitle: str = "") -> None:
+        """Reset the grid and show every line as loading."""
+
+        self.subtitle.configure(text=subtitle)
+        self.tree.delete(*self.tree.get_children())
+        lines = list(lines)
+        for line in lines:
+            self.tree.insert(
+                "",
+                "end",
+                iid=line,
+                values=(line, *("" for _ in SUMMARY_METRICS), STATUS_LOADING),
+            )
+        self._pending = len(lines)
+        self._update_status()
+
+    def set_outcome(self, line: str, outcome: FetchOutcome) -> None:
+        """Fill the row of ``line`` with its KPIs or its failure status."""
+
+        if not self.tree.exists(line):
+            return
+        if outcome.ok:
+            summary = outcome.data.data_losses
+            metrics = [
+                str(getattr(summary, metric, "") or "") for metric in SUMMARY_METRICS
+            ]
+            status = STATUS_OK
+        else:
+            metrics = ["" for _ in SUMMARY_METRICS]
+            status = STATUS_TIMEOUT if outcome.timed_out else STATUS_FAILED
+        self.tree.item(line, values=(line, *metrics, status))
+        self._pending = max(0, self._pending - 1)
+        self._update_status()
+
+    def _update_status(self) -> None:
+        total = len(self.tree.get_children())
+        done = total - self._pending
+        self.status_label.configure(text=f"{done}/{total} line selesai")
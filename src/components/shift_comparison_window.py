@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import ttkbootstrap as ttk
+
+from src.components.overview_window import (
+    STATUS_FAILED,
+    STATUS_LOADING,
+    STATUS_OK,
+    STATUS_TIMEOUT,
+)
+from src.services.multi_fetch import FetchOutcome
+from src.utils.constants import SUMMARY_METRICS
+
+
+class ShiftComparisonWindow(ttk.Toplevel):
+    """Target vs actual of every shift of one day, side by side."""
+
+    def __init__(
+        self,
+        master: ttk.Window,
+        shifts: list[str],
+        palette: Optional[dict] = None,
+    ):
+        super().__init__(master)
+        self.palette = palette or {}
+        self.shifts = list(shifts)
+        self.title("Perbandingan Shift")
+        self.geometry("1000x380")
+        self.minsize(760, 300)
+        self.configure(background=self.palette.get("background", "#101418"))
+
+        container = ttk.Frame(
+            self, padding=(16, 18, 16, 16), style="MaterialSurface.TFrame"
+        )
+        container.pack(fill="both", expand=True)
+
+        header = ttk.Frame(container, style="MaterialSurface.TFrame")
+        header.pack(fill="x", pady=(0, 12))
+
+        ttk.Label(
+            header,
+            text="Perbandingan Shift",
+            style="MaterialTitle.TLabel",
+        ).pack(anchor="w")
+        self.subtitle = ttk.Label(header, text="", style="MaterialSubtitle.TLabel")
+        self.subtitle.pack(anchor="w", pady=(4, 0))
+
+        table_card = ttk.Frame(
+            container, style="MaterialCard.TFrame", padding=(16, 14, 16, 18)
+        )
+        table_card.pack(fill="both", expand=True)
+        table_card.columnconfigure(0, weight=1)
+        table_card.rowconfigure(1, weight=1)
+
+        self.status_label = ttk.Label(table_card, text="", style="MaterialChip.TLabel")
+        self.status_label.grid(row=0, column=0, sticky="w", pady=(0, 10))
+
+        columns = ["METRIK"]
+        for shift in self.shifts:
+            columns += [f"{shift} TARGET", f"{shift} ACTUAL"]
+        self.tree = ttk.Treeview(
+            table_card,
+            columns=columns,
+            show="headings",
+            height=len(SUMMARY_METRICS),
+        )
+        for column in columns:
+            self.tree.heading(column, text=column)
+            self.tree.column(
+                column,
+                width=100,
+                anchor="w" if column == "METRIK" else "center",
+                stretch=True,
+            )
+        self.tree.grid(row=1, column=0, sticky="nsew")
+
+        for metric in SUMMARY_METRICS:
+            self.tree.insert(
+                "", "end", iid=metric, values=(metric, *("" for _ in columns[1:]))
+            )
+
+        self._status = {shift: STATUS_LOADING for shift in self.shifts}
+        self._update_status()
+
+    def set_subtitle(self, text: str) -> None:
+        self.subtitle.configure(text=text)
+
+    def set_targets(self, targets: dict[str, dict[str, str]]) -> None:
+        """Fill the TARGET columns from ``{shift: {metric: target}}``."""
+
+        for shift, lookup in targets.items():
+            self._set_column(f"{shift} TARGET", lookup)
+
+    def set_outcome(self, shift: str, outcome: FetchOutcome) -> None:
+        """Fill the ACTUAL column of ``shift`` or mark it as failed."""
+
+        if shift not in self._status:
+            return
+        if outcome.ok:
+            summary = outcome.data.data_losses
+            self._set_column(
+                f"{shift} ACTUAL",
+                {
+                    metric: str(getattr(summary, metric, "") or "")
+                    for metric in SUMMARY_METRICS
+                },
+            )
+            self._status[shift] = STATUS_OK
+        else:
+            self._status[shift] = STATUS_TIMEOUT if outcome.timed_out else STATUS_FAILED
+        self._update_status()
+
+    def _set_column(self, column: str, lookup: dict[str, str]) -> None:
+        for metric in SUMMARY_METRICS:
+            if metric in lookup:
+                self.tree.set(metric, column, lookup[metric])
+
+    def _update_status(self) -> None:
+        self.status_label.configure(
+            text="  |  ".join(
+                f"{shift}: {status}" for shift, status in self._status.items()
+            )
+        )
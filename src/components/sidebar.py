@@ -174,6 +174,16 @@ class Sidebar(ttk.Frame):
         )
         self.btn_history.pack(fill=X, pady=(8, 2))
 
+        self.btn_overview = self._create_button(
+            section, "Overview", "info", "Ringkasan KPI semua line"
+        )
+        self.btn_overview.pack(fill=X, pady=2)
+
+        self.btn_compare_shifts = self._create_button(
+            section, "Compare Shifts", "info", "Bandingkan Shift 1, 2 dan 3"
+        )
+        self.btn_compare_shifts.pack(fill=X, pady=2)
+
         self.btn_manual = self._create_button(
             section, "Manual", "info", "Lihat panduan penggunaan"
         )
@@ -0,0 +1,177 @@
+"""Drop-down list of type-ahead suggestions under an Entry."""
+
+from __future__ import annotations
+
+import tkinter as tk
+from typing import Callable, Dict, Optional
+
+import ttkbootstrap as ttk
+
+from src.services.suggestion_index import DEFAULT_LIMIT, get_suggestion_index
+from src.utils.material_theme import MATERIAL_PALETTE
+
+# Keys that move the cursor or the selection without changing the text
+_NAVIGATION_KEYS = {
+    "Up",
+    "Down",
+    "Left",
+    "Right",
+    "Home",
+    "End",
+    "Return",
+    "KP_Enter",
+    "Tab",
+    "Escape",
+    "Shift_L",
+    "Shift_R",
+    "Control_L",
+    "Control_R",
+    "Alt_L",
+    "Alt_R",
+}
+# Delay before hiding on focus loss, so a click on the list still lands
+HIDE_DELAY_MS = 150
+
+
+class SuggestionPopup:
+    """Suggests saved texts of ``field`` while the user types in ``entry``.
+
+    Up/Down pick a suggestion, Enter or Tab accepts it, Escape closes the
+    list; a click on a suggestion accepts it too. ``lu_provider`` returns
+    the LU whose texts are suggested first.
+    """
+
+    def __init__(
+        self,
+        entry: ttk.Entry,
+        field: str,
+        lu_provider: Optional[Callable[[], str]] = None,
+        palette: Optional[Dict[str, str]] = None,
+        limit: int = DEFAULT_LIMIT,
+    ):
+        self.entry = entry
+        self.field = field
+        self.lu_provider = lu_provider
+        self.palette = palette or MATERIAL_PALETTE
+        self.limit = limit
+        self._window: Optional[tk.Toplevel] = None
+        self._listbox: Optional[tk.Listbox] = None
+        self._last_text = ""
+
+        entry.bind("<KeyRelease>", self._on_key_release, add="+")
+        entry.bind("<Down>", lambda _: self._move(1), add="+")
+        entry.bind("<Up>", lambda _: self._move(-1), add="+")
+        entry.bind("<Return>", self._on_accept_key, add="+")
+        entry.bind("<KP_Enter>", self._on_accept_key, add="+")
+        entry.bind("<Tab>", self._on_accept_key, add="+")
+        entry.bind("<Escape>", lambda _: self.hide(), add="+")
+        entry.bind("<FocusOut>", self._on_focus_out, add="+")
+        entry.bind("<Destroy>", lambda _: self.hide(), add="+")
+
+    @property
+    def visible(self) -> bool:
+        return self._window is not None
+
+    def _current_text(self) -> str:
+        if getattr(self.entry, "_placeholder_active", False):
+            return ""
+        return self.entry.get()
+
+    def _on_key_release(self, event: tk.Event) -> None:
+        if event.keysym in _NAVIGATION_KEYS:
+            return
+        text = self._current_text()
+        if text == self._last_text:
+            return
+        self._last_text = text
+        lu = self.lu_provider() if self.lu_provider else ""
+        suggestions = get_suggestion_index().suggest(
+            self.field, text, lu=lu, limit=self.limit
+        )
+        if suggestions:
+            self.show(suggestions)
+        else:
+            self.hide()
+
+    def show(self, suggestions: list[str]) -> None:
+        if self._window is None:
+            self._create_window()
+        assert self._listbox is not None
+        self._listbox.delete(0, "end")
+        for text in suggestions:
+            self._listbox.insert("end", text)
+        self._listbox.configure(height=len(suggestions))
+        self._window.geometry(
+            f"{self.entry.winfo_width()}x{self._listbox.winfo_reqheight()}"
+            f"+{self.entry.winfo_rootx()}"
+            f"+{self.entry.winfo_rooty() + self.entry.winfo_height()}"
+        )
+
+    def _create_window(self) -> None:
+        self._window = tk.Toplevel(self.entry)
+        self._window.overrideredirect(True)
+        self._window.attributes("-topmost", True)
+        self._listbox = tk.Listbox(
+            self._window,
+            activestyle="none",
+            exportselection=False,
+            borderwidth=1,
+            highlightthickness=0,
+            background=self.palette.get("surface_variant", "#3A4B5E"),
+            foreground=self.palette.get("on_surface", "#E4ECF5"),
+            selectbackground=self.palette.get("primary", "#0d6efd"),
+            selectforeground=self.palette.get("on_primary", "#ffffff"),
+            font=self.entry.cget("font") or None,
+        )
+        self._listbox.pack(fill="both", expand=True)
+        self._listbox.bind("<ButtonRelease-1>", lambda _: self.accept())
+
+    def hide(self) -> None:
+        if self._window is not None:
+            self._window.destroy()
+        self._window = None
+        self._listbox = None
+
+    def _move(self, step: int) -> Optional[str]:
+        if self._listbox is None:
+            return None
+        selection = self._listbox.curselection()
+        size = self._listbox.size()
+        index = selection[0] + step if selection else (0 if step > 0 else size - 1)
+        index = max(0, min(size - 1, index))
+        self._listbox.selection_clear(0, "end")
+        self._listbox.selection_set(index)
+        self._listbox.see(index)
+        return "break"
+
+    def _on_accept_key(self, _event: tk.Event) -> Optional[str]:
+        if self._listbox is None or not self._listbox.curselection():
+            self.hide()
+            return None
+        self.accept()
+        return "break"
+
+    def accept(self) -> None:
+        """Replace the entry text with the selected suggestion."""
+
+        if self._listbox is None or not self._listbox.curselection():
+            return
+        text = self._listbox.get(self._listbox.curselection()[0])
+        self.hide()
+        self.entry.delete(0, "end")
+        self.entry.insert(0, text)
+        self.entry.icursor("end")
+        self.entry._placeholder_active = False
+        self._last_text = text
+        self.entry.focus_set()
+
+    def _on_focus_out(self, _event: tk.Event) -> None:
+        self.entry.after(HIDE_DELAY_MS, self._hide_unless_focused)
+
+    def _hide_unless_focused(self) -> None:
+        try:
+            focused = self.entry.focus_get() is self.entry
+        except (KeyError, tk.TclError):
+            focused = False
+        if not focused:
+            self.hide()
@@ -0,0 +1,287 @@
+"""Treeview that only materializes the rows currently in view."""
+
+from __future__ import annotations
+
+import bisect
+import tkinter.font as tkfont
+from typing import Callable, Iterable, Optional, Sequence
+
+import ttkbootstrap as ttk
+
+SAMPLE_ROWS = 200
+MIN_COLUMN_WIDTH = 60
+MAX_COLUMN_WIDTH = 480
+COLUMN_PADDING = 24
+WHEEL_ROWS = 3
+DEFAULT_PREFETCH_ROWS = 100
+
+
+class VirtualTreeview(ttk.Frame):
+    """Fixed pool of Treeview items showing a window over a list of rows.
+
+    Rows are kept as plain tuples; scrolling rewrites the values of the few
+    items that fit on screen instead of inserting one item per row, so the
+    widget cost does not grow with the data. Rows can be appended while
+    the user scrolls: ``on_need_rows`` is called once the view comes within
+    ``prefetch_rows`` of the last loaded row and more rows are expected.
+    """
+
+    def __init__(
+        self,
+        master,
+        columns: Sequence[str],
+        *,
+        stretch_columns: Iterable[str] = (),
+        on_need_rows: Optional[Callable[[], None]] = None,
+        prefetch_rows: int = DEFAULT_PREFETCH_ROWS,
+    ):
+        super().__init__(master, style="MaterialCardBody.TFrame")
+        self.columns = tuple(columns)
+        self.stretch_columns = set(stretch_columns)
+        self.on_need_rows = on_need_rows
+        self.prefetch_rows = prefetch_rows
+
+        self.tree = ttk.Treeview(
+            self, columns=self.columns, show="headings", selectmode="browse"
+        )
+        for column in self.columns:
+            self.tree.heading(column, text=column, anchor="w")
+            self.tree.column(
+                column,
+                width=MIN_COLUMN_WIDTH * 2,
+                minwidth=MIN_COLUMN_WIDTH,
+                stretch=column in self.stretch_columns,
+            )
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(
+            self, orient="vertical", command=self._on_scrollbar
+        )
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        self._rows: list[tuple] = []
+        self._complete = True
+        self._requested = False
+        self._offset = 0
+        self._visible = 1
+        self._iids: list[str] = []
+        self._attached = 0
+        self._selected: Optional[int] = None
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self._on_wheel)
+        for key, handler in (
+            ("<Up>", lambda _e: self._move_selection(-1)),
+            ("<Down>", lambda _e: self._move_selection(1)),
+            ("<Prior>", lambda _e: self._move_selection(-self._visible)),
+            ("<Next>", lambda _e: self._move_selection(self._visible)),
+            ("<Home>", lambda _e: self._move_selection(-len(self._rows))),
+            ("<End>", lambda _e: self._move_selection(len(self._rows))),
+        ):
+            self.tree.bind(key, handler)
+
+    # --- data ------------------------------------------------------------
+
+    @property
+    def row_count(self) -> int:
+        return len(self._rows)
+
+    @property
+    def complete(self) -> bool:
+        return self._complete
+
+    @property
+    def rows(self) -> Sequence[tuple]:
+        return self._rows
+
+    def set_rows(self, rows: Iterable[tuple], complete: bool = True) -> None:
+        """Replace all rows and scroll back to the top."""
+
+        self._rows = list(rows)
+        self._complete = complete
+        self._requested = False
+        self._offset = 0
+        self._selected = None
+        self._render()
+
+    def append_rows(self, rows: Iterable[tuple], complete: bool = True) -> None:
+        """Add rows after the loaded ones, keeping the scroll position."""
+
+        self._rows.extend(rows)
+        self._complete = complete
+        self._requested = False
+        self._render()
+
+    def insert_rows(self, positions: Sequence[int], rows: Sequence[tuple]) -> None:
+        """Insert ``rows`` so that they end up at ``positions`` (ascending).
+
+        The selection stays on the same row; unless the view is at the top,
+        where new rows should show up, the visible rows stay in place too.
+        """
+
+        if not rows:
+            return
+        merged: list[tuple] = []
+        taken = 0
+        for position, row in zip(positions, rows):
+            before = position - len(merged)
+            merged.extend(self._rows[taken : taken + before])
+            taken += before
+            merged.append(row)
+        merged.extend(self._rows[taken:])
+
+        # Old row j moves down by the number of new rows placed before it
+        shifts = [position - index for index, position in enumerate(positions)]
+        if self._selected is not None:
+            self._selected += bisect.bisect_right(shifts, self._selected)
+        if self._offset > 0:
+            self._offset += bisect.bisect_right(shifts, self._offset)
+        self._rows = merged
+        self._render()
+
+    def selected_row(self) -> Optional[tuple]:
+        if self._selected is None or self._selected >= len(self._rows):
+            return None
+        return self._rows[self._selected]
+
+    def fit_columns(self, sample: Optional[Sequence[tuple]] = None) -> None:
+        """Fix column widths from a sample of rows (default: the first rows).
+
+        Widths follow the 90th percentile of the sampled values, so a single
+        long text does not widen its column; they are not recomputed when
+        more rows arrive.
+        """
+
+        sample = list(sample if sample is not None else self._rows[:SAMPLE_ROWS])
+        style = ttk.Style()
+        font_spec = style.lookup(self.tree.cget("style") or "Treeview", "font")
+        try:
+            font = tkfont.nametofont(font_spec or "TkDefaultFont")
+        except Exception:  # noqa: BLE001 - font given as a description
+            font = tkfont.Font(font=font_spec)
+
+        for index, column in enumerate(self.columns):
+            widths = sorted(
+                font.measure(str(row[index])) for row in sample if index < len(row)
+            )
+            typical = widths[int(len(widths) * 0.9) - 1] if widths else 0
+            width = max(font.measure(column), typical) + COLUMN_PADDING
+            self.tree.column(
+                column, width=min(MAX_COLUMN_WIDTH, max(MIN_COLUMN_WIDTH, width))
+            )
+
+    # --- rendering -------------------------------------------------------
+
+    def _row_height(self) -> int:
+        style = ttk.Style()
+        value = style.lookup(self.tree.cget("style") or "Treeview", "rowheight")
+        try:
+            return max(1, int(value))
+        except (TypeError, ValueError):
+            return 20
+
+    def _on_resize(self, event) -> None:
+        row_height = self._row_height()
+        # One row height is taken by the headings
+        visible = max(1, event.height // row_height - 1)
+        if visible != self._visible:
+            self._visible = visible
+            self._render()
+
+    def _sync_pool(self) -> None:
+        while len(self._iids) < self._visible:
+            iid = f"row{len(self._iids)}"
+            # New items start detached; _render attaches them in order
+            self.tree.insert("", "end", iid=iid)
+            self.tree.detach(iid)
+            self._iids.append(iid)
+        while len(self._iids) > self._visible:
+            self.tree.delete(self._iids.pop())
+            self._attached = min(self._attached, len(self._iids))
+
+    def _render(self) -> None:
+        self._sync_pool()
+        self._offset = max(0, min(self._offset, len(self._rows) - self._visible))
+        shown = max(0, min(self._visible, len(self._rows) - self._offset))
+
+        for position, iid in enumerate(self._iids[:shown]):
+            if position >= self._attached:
+                self.tree.move(iid, "", position)
+            self.tree.item(iid, values=self._rows[self._offset + position])
+        if shown < self._attached:
+            self.tree.detach(*self._iids[shown : self._attached])
+        self._attached = shown
+        self.tree.yview_moveto(0)
+
+        selected = self._selected
+        if selected is not None and self._offset <= selected < self._offset + shown:
+            iid = self._iids[selected - self._offset]
+            if self.tree.selection() != (iid,):
+                self.tree.selection_set(iid)
+            self.tree.focus(iid)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        self._update_scrollbar(shown)
+        self._maybe_request_rows()
+
+    def _update_scrollbar(self, shown: int) -> None:
+        total = len(self._rows) + (0 if self._complete else self._visible)
+        if total <= 0:
+            self.scrollbar.set(0, 1)
+            return
+        self.scrollbar.set(self._offset / total, (self._offset + shown) / total)
+
+    def _maybe_request_rows(self) -> None:
+        if self._complete or self._requested or self.on_need_rows is None:
+            return
+        if self._offset + self._visible + self.prefetch_rows >= len(self._rows):
+            self._requested = True
+            self.on_need_rows()
+
+    # --- scrolling -------------------------------------------------------
+
+    def scroll_to(self, offset: int) -> None:
+        offset = max(0, min(offset, len(self._rows) - self._visible))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+        else:
+            self._maybe_request_rows()
+
+    def _on_scrollbar(self, action: str, amount: str, unit: str = "") -> None:
+        if action == "moveto":
+            total = len(self._rows) + (0 if self._complete else self._visible)
+            self.scroll_to(int(float(amount) * total))
+        elif action == "scroll":
+            step = self._visible if unit == "pages" else 1
+            self.scroll_to(self._offset + int(amount) * step)
+
+    def _on_wheel(self, event) -> str:
+        if event.num == 4 or event.delta > 0:
+            direction = -1
+        else:
+            direction = 1
+        self.scroll_to(self._offset + direction * WHEEL_ROWS)
+        return "break"
+
+    def _on_select(self, _event=None) -> None:
+        selection = self.tree.selection()
+        if selection and selection[0] in self._iids:
+            self._selected = self._offset + self._iids.index(selection[0])
+
+    def _move_selection(self, step: int) -> str:
+        if not self._rows:
+            return "break"
+        current = self._offset if self._selected is None else self._selected
+        target = max(0, min(len(self._rows) - 1, current + step))
+        self._selected = target
+        if target < self._offset:
+            self._offset = target
+        elif target >= self._offset + self._visible:
+            self._offset = target - self._visible + 1
+        self._render()
+        return "break"
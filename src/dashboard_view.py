@@ -17,15 +17,25 @@ from src.components.report_toplevel import ReportView
 from src.components.sidebar import Sidebar
 from src.components.table_frame import TableFrame
 from src.services.logging_service import log_exception
-from src.services.record_service import append_cards_to_csv, build_record_rows
+from src.services.multi_fetch import SPARequest, fetch_data_spa, fetch_many
+from src.services.recommendation_index import get_recommendation_index
+from src.services.record_archive import archive_closed_snapshot
+from src.services.record_service import (
+    build_record_rows,
+    load_card_indexes_in_background,
+)
+from src.services.record_writer import get_record_writer
+from src.services.result_cache import get_data_spa_cache
 from src.services.spa_service import (
     DataLossesSummary,
-    SPADataProcessor,
+    DataSPA,
+    LinePerformanceDetail,
     MaxRetriesExceededError,
     get_url_period_loss_tree,
 )
-from src.utils.app_config import AppDataConfig
-from src.utils.csvhandle import get_targets_file_path, save_user
+from src.utils.app_config import AppDataConfig, ConfigListener, get_config_service
+from src.utils.constants import SHIFT_START_HOURS, SUMMARY_METRICS
+from src.utils.csvhandle import get_shift_targets, get_targets_file_path, save_user
 from src.utils.csvhandle import load_users
 from async_tkinter_loop import async_handler
 import asyncio
@@ -33,6 +43,22 @@ import asyncio
 MATERIAL_SECTION_PADDING = (16, 12, 16, 16)
 
 
+def threadsafe_listener(
+    event_loop: asyncio.AbstractEventLoop,
+    callback: ConfigListener,
+) -> ConfigListener:
+    """Config listener that runs ``callback`` on the thread of ``event_loop``.
+
+    Reloads are noticed on the watcher thread or whichever thread calls
+    ``get_config``; Tk may only be called from the thread pumping it.
+    """
+
+    def listener(config: AppDataConfig) -> None:
+        event_loop.call_soon_threadsafe(callback, config)
+
+    return listener
+
+
 class DashboardView(ttk.Frame):
     """Compose and expose the widgets used by the dashboard window."""
 
@@ -41,6 +67,7 @@ class DashboardView(ttk.Frame):
         master: ttk.Window,
         palette: Optional[dict] = None,
         data_config: Optional[AppDataConfig] = None,
+        event_loop: Optional[asyncio.AbstractEventLoop] = None,
     ):
         super().__init__(master)
         self.pack(fill="both", expand=True)
@@ -63,9 +90,26 @@ class DashboardView(ttk.Frame):
         self.sidebar.btn_target_editor.configure(command=self.show_target_editor)
         self.sidebar.btn_history.configure(command=self.show_history)
         self.sidebar.btn_report.configure(command=self.show_data)
+        self.sidebar.btn_overview.configure(command=self.show_overview)
+        self.sidebar.btn_compare_shifts.configure(command=self.show_shift_comparison)
         if hasattr(self.sidebar, "btn_manual"):
             self.sidebar.btn_manual.configure(command=self.show_manual)
 
+        # Edits of config.ini apply while running; ``event_loop`` is the loop
+        # that pumps Tk (async_mainloop), where the new config is applied
+        self._unsubscribe_config = (
+            get_config_service().subscribe(
+                threadsafe_listener(event_loop, self._apply_config)
+            )
+            if event_loop is not None
+            else lambda: None
+        )
+        self.bind("<Destroy>", self._on_destroy, add="+")
+
+        # Type-ahead suggestions and pre-filled details for the cards come
+        # from the saved history
+        load_card_indexes_in_background(self.data_config)
+
         existing_users = load_users()
         if hasattr(self.sidebar.entry_user, "configure"):
             self.sidebar.entry_user.configure(completevalues=existing_users)
@@ -89,13 +133,37 @@ class DashboardView(ttk.Frame):
         self.table_frame = TableFrame(self.main_content, palette=self.palette)
         self.table_frame.pack(side="left", fill="y", expand=False, pady=(10, 0))
 
-        self.card_frame = IssueCardFrame(self.main_content, palette=self.palette)
+        self.card_frame = IssueCardFrame(
+            self.main_content,
+            palette=self.palette,
+            lu_provider=lambda: self.sidebar.lu.get().strip(),
+        )
         self.card_frame.pack(side="right", fill="both", expand=True, pady=(0, 0))
 
         self.table_frame.issue_table.view.bind(
             "<Double-1>", self._handle_issue_row_double_click, add="+"
         )
 
+        # Clicking the Stops/Downtime headings sorts the issues of the last fetch
+        self._data_spa: Optional[DataSPA] = None
+        self._issue_sort: Optional[str] = None
+        issue_view = self.table_frame.issue_table.view
+        issue_view.heading("#3", command=lambda: self._sort_issue_table("stops"))
+        issue_view.heading("#4", command=lambda: self._sort_issue_table("downtime"))
+
+    def _apply_config(self, config: AppDataConfig) -> None:
+        """Use a reloaded configuration for the following fetches and saves."""
+
+        self.data_config = config
+        if list(self.sidebar.lu.cget("values") or ()) != list(config.link_up):
+            self.sidebar.lu.configure(values=list(config.link_up))
+            if config.link_up and self.sidebar.lu.get() not in config.link_up:
+                self.sidebar.lu.set(config.link_up[0])
+
+    def _on_destroy(self, event) -> None:
+        if event.widget is self:
+            self._unsubscribe_config()
+
     @async_handler
     async def save_data(self) -> None:
         """Persist all issue cards to the shared CSV using record_service."""
@@ -137,9 +205,16 @@ class DashboardView(ttk.Frame):
                 )
                 return
 
+            # Hand the rows to the write-behind queue: Save is usable again at
+            # once and the future resolves when the rows are durably on disk
+            ack = get_record_writer().submit(rows, self.data_config)
+            if hasattr(self.sidebar, "btn_save"):
+                try:
+                    self.sidebar.btn_save.configure(state="normal")
+                except Exception:
+                    pass
             try:
-                # Disk IO and pandas operations can be blocking; offload to a thread
-                destination = await asyncio.to_thread(append_cards_to_csv, rows)
+                destination = await asyncio.wrap_future(ack)
             except Exception as exc:  # noqa: BLE001 - surface error to user
                 log_exception("Gagal menyimpan data issue card", exc)
                 messagebox.showerror(
@@ -183,37 +258,18 @@ class DashboardView(ttk.Frame):
                 func_code,
             )
 
-            target_path = get_targets_file_path(lu_value, func_code)
-            try:
-                # pd.read_csv is blocking; run it in a thread to avoid freezing the UI
-                targets_df = await asyncio.to_thread(pd.read_csv, target_path)
-            except (FileNotFoundError, pd.errors.EmptyDataError, OSError):
-                targets_df = pd.DataFrame()
+            targets_df = await self._load_targets_df(lu_value, func_code)
 
-            try:
-                # SPADataProcessor.process performs network IO and heavy parsing
-                # which are blocking; run it on a thread to keep the Tk event loop
-                processor = SPADataProcessor(url=url, config=self.data_config)
-                await processor.start()
-                data_spa = await processor.get_data_spa()
-            except MaxRetriesExceededError as exc:
-                # Friendly warning for retry exhaustion
-                log_exception("Gagal memproses data dari SPA (max retries)", exc)
-                messagebox.showwarning(
-                    "Gagal mengambil data",
-                    f"Gagal mengambil data dari SPA setelah {exc.attempts} kali percobaan. "
-                    "Periksa koneksi jaringan Anda atau coba lagi nanti.",
-                    parent=self,
-                )
-                return
-            except Exception as exc:  # noqa: BLE001 - propagate via UI and log
-                log_exception("Gagal memproses data dari SPA", exc)
-                messagebox.showerror(
-                    "Gagal",
-                    "Terjadi kesalahan saat mengambil data dari SPA. Periksa log untuk detail.",
-                    parent=self,
-                )
-                return
+            # Selections viewed recently are repainted from memory
+            cache_key = (lu_value, func_code, date_value, shift_number)
+            spa_cache = get_data_spa_cache(self.data_config)
+            data_spa = spa_cache.get(cache_key)
+            if data_spa is None:
+                data_spa = await self._fetch_data_spa(url)
+                if data_spa is None:
+                    return
+                spa_cache.put(cache_key, data_spa)
+                self._archive_snapshot(cache_key, data_spa)
 
             data_losses = data_spa.data_losses
             stops_reason = data_spa.stops_reason
@@ -225,37 +281,23 @@ class DashboardView(ttk.Frame):
                 else:
                     self.header_frame.set_time_period("")
 
-            if not targets_df.empty and shift_column:
-                target_col = (
-                    shift_column if shift_column in targets_df.columns else None
-                )
-                if target_col:
-                    target_lookup = dict(
-                        zip(targets_df[targets_df.columns[0]], targets_df[target_col])
+            target_lookup = get_shift_targets(targets_df, shift_column)
+            if target_lookup:
+                rows = self.table_frame.result_table.view.get_children()
+                for row_id in rows:
+                    values = list(
+                        self.table_frame.result_table.view.item(row_id, "values")
                     )
-                    rows = self.table_frame.result_table.view.get_children()
-                    for row_id in rows:
-                        values = list(
-                            self.table_frame.result_table.view.item(row_id, "values")
-                        )
-                        if not values:
-                            continue
-                        metric_key = values[0]
-                        target_value = target_lookup.get(metric_key)
-                        if target_value is not None:
-                            values[1] = (
-                                ""
-                                if pd.isna(target_value)
-                                else str(target_value).strip("%")
-                            )
-                            self.table_frame.result_table.view.item(
-                                row_id, values=values
-                            )
+                    if not values:
+                        continue
+                    target_value = target_lookup.get(values[0])
+                    if target_value is not None:
+                        values[1] = target_value
+                        self.table_frame.result_table.view.item(row_id, values=values)
 
             if isinstance(data_losses, DataLossesSummary):
-                metrics_order = ["STOP", "PR", "MTBF", "UPDT", "PDT", "NATR"]
                 rows = self.table_frame.result_table.view.get_children()
-                for row_id, metric in zip(rows, metrics_order):
+                for row_id, metric in zip(rows, SUMMARY_METRICS):
                     actual_value = getattr(data_losses, metric, "")
                     values = list(
                         self.table_frame.result_table.view.item(row_id, "values")
@@ -266,17 +308,186 @@ class DashboardView(ttk.Frame):
                     self.table_frame.result_table.view.item(row_id, values=values)
 
             if isinstance(stops_reason, list) and stops_reason:
-                tree = self.table_frame.issue_table.view
-                tree.delete(*tree.get_children())
-                for detail in stops_reason:
-                    line = detail.Line or ""
-                    issue = detail.Detail or ""
-                    stops = detail.Stops or ""
-                    downtime = detail.Downtime or ""
-                    tree.insert("", "end", values=(line, issue, stops, downtime))
+                self._data_spa = data_spa
+                self._issue_sort = None
+                self._fill_issue_table(stops_reason)
         finally:
             self.header_frame.stop_progress()
 
+    def _fill_issue_table(self, details: List[LinePerformanceDetail]) -> None:
+        tree = self.table_frame.issue_table.view
+        tree.delete(*tree.get_children())
+        for detail in details:
+            line = detail.Line or ""
+            issue = detail.Detail or ""
+            stops = detail.Stops or ""
+            downtime = detail.Downtime or ""
+            tree.insert("", "end", values=(line, issue, stops, downtime))
+
+    def _sort_issue_table(self, by: str) -> None:
+        """Toggle the issue table between ``by`` (descending) and SPA order."""
+        if self._data_spa is None or not self._data_spa.stops_reason:
+            return
+        if self._issue_sort == by:
+            self._issue_sort = None
+            details = self._data_spa.stops_reason
+        else:
+            # Uses the numeric arrays parsed during extraction, no re-parsing
+            self._issue_sort = by
+            details = self._data_spa.sorted_reasons(by)
+        self._fill_issue_table(details)
+
+    async def _load_targets_df(self, lu_value: str, func_code: str) -> pd.DataFrame:
+        target_path = get_targets_file_path(lu_value, func_code)
+        try:
+            # pd.read_csv is blocking; run it in a thread to avoid freezing the UI
+            return await asyncio.to_thread(pd.read_csv, target_path)
+        except (FileNotFoundError, pd.errors.EmptyDataError, OSError):
+            return pd.DataFrame()
+
+    def _archive_snapshot(self, cache_key: tuple, data_spa: DataSPA) -> None:
+        """Copy a closed period into the Parquet archive off the UI thread."""
+
+        def report(future: asyncio.Future) -> None:
+            if not future.cancelled() and future.exception() is not None:
+                log_exception("Gagal mengarsipkan data SPA", future.exception())
+
+        asyncio.get_running_loop().run_in_executor(
+            None, archive_closed_snapshot, cache_key, data_spa
+        ).add_done_callback(report)
+
+    async def _fetch_data_spa(self, url: str) -> Optional[DataSPA]:
+        """Fetch and parse SPA data, reporting failures to the user."""
+        try:
+            # Network IO is async and parsing runs on the parse executor, so the
+            # Tk event loop stays responsive while this is awaited
+            data_spa = await fetch_data_spa(url, self.data_config)
+        except MaxRetriesExceededError as exc:
+            # Friendly warning for retry exhaustion
+            log_exception("Gagal memproses data dari SPA (max retries)", exc)
+            messagebox.showwarning(
+                "Gagal mengambil data",
+                f"Gagal mengambil data dari SPA setelah {exc.attempts} kali percobaan. "
+                "Periksa koneksi jaringan Anda atau coba lagi nanti.",
+                parent=self,
+            )
+            return None
+        except Exception as exc:  # noqa: BLE001 - propagate via UI and log
+            log_exception("Gagal memproses data dari SPA", exc)
+            messagebox.showerror(
+                "Gagal",
+                "Terjadi kesalahan saat mengambil data dari SPA. Periksa log untuk detail.",
+                parent=self,
+            )
+            return None
+
+        return data_spa
+
+    @async_handler
+    async def show_overview(self) -> None:
+        """Fetch every configured line concurrently into one KPI grid."""
+        from src.components.overview_window import OverviewWindow
+
+        lines = [
+            str(value)
+            for value in (self.sidebar.lu.cget("values") or ())
+            if str(value).strip()
+        ]
+        if not lines:
+            messagebox.showinfo(
+                "Informasi",
+                "Belum ada line (link_up) yang dikonfigurasi.",
+                parent=self,
+            )
+            return
+
+        func_code = self.sidebar.func_location.get()[:4].strip()
+        shift_label = self.sidebar.select_shift.get().strip()
+        shift_number = shift_label.split()[-1] if shift_label else ""
+        date_value = self.sidebar.dt.get_date().strftime("%Y-%m-%d")
+
+        requests = {}
+        for line in lines:
+            lu_value = line.strip("LU")
+            requests[line] = SPARequest(
+                url=self._get_url(lu_value, date_value, shift_number, func_code),
+                cache_key=(lu_value, func_code, date_value, shift_number),
+            )
+
+        overview = OverviewWindow(self.winfo_toplevel(), palette=self.palette)
+        overview.transient(self.winfo_toplevel())
+        overview.start(
+            lines,
+            subtitle=f"{self.sidebar.func_location.get()} | {date_value}, {shift_label}",
+        )
+
+        def show_result(line, outcome) -> None:
+            if overview.winfo_exists():
+                overview.set_outcome(line, outcome)
+
+        self.sidebar.btn_overview.configure(state="disabled")
+        self.header_frame.start_progress()
+        try:
+            await fetch_many(requests, self.data_config, on_result=show_result)
+        except Exception as exc:  # noqa: BLE001 - surface error to user
+            log_exception("Gagal memuat overview semua line", exc)
+        finally:
+            self.header_frame.stop_progress()
+            self.sidebar.btn_overview.configure(state="normal")
+
+    @async_handler
+    async def show_shift_comparison(self) -> None:
+        """Fetch all shifts of the selected day concurrently and compare them."""
+        from src.components.shift_comparison_window import ShiftComparisonWindow
+
+        lu_value = self.sidebar.lu.get().strip("LU")
+        func_code = self.sidebar.func_location.get()[:4].strip()
+        date_value = self.sidebar.dt.get_date().strftime("%Y-%m-%d")
+
+        requests = {
+            f"Shift {shift_number}": SPARequest(
+                url=self._get_url(lu_value, date_value, shift_number, func_code),
+                cache_key=(lu_value, func_code, date_value, shift_number),
+            )
+            for shift_number in SHIFT_START_HOURS
+        }
+
+        comparison = ShiftComparisonWindow(
+            self.winfo_toplevel(), shifts=list(requests), palette=self.palette
+        )
+        comparison.transient(self.winfo_toplevel())
+        comparison.set_subtitle(
+            f"{self.sidebar.func_location.get()} {self.sidebar.lu.get()} | {date_value}"
+        )
+
+        def show_result(shift_label, outcome) -> None:
+            if comparison.winfo_exists():
+                comparison.set_outcome(shift_label, outcome)
+
+        self.sidebar.btn_compare_shifts.configure(state="disabled")
+        self.header_frame.start_progress()
+        try:
+            targets_df = await self._load_targets_df(lu_value, func_code)
+            if comparison.winfo_exists():
+                comparison.set_targets(
+                    {
+                        shift_label: get_shift_targets(targets_df, shift_label)
+                        for shift_label in requests
+                    }
+                )
+            # One request per shift, all in flight at once on the pooled client
+            await fetch_many(
+                requests,
+                self.data_config,
+                max_concurrency=len(requests),
+                on_result=show_result,
+            )
+        except Exception as exc:  # noqa: BLE001 - surface error to user
+            log_exception("Gagal memuat perbandingan shift", exc)
+        finally:
+            self.header_frame.stop_progress()
+            self.sidebar.btn_compare_shifts.configure(state="normal")
+
     def show_data(self) -> None:
         lines: List[str] = []
         for _, card in enumerate(self.card_frame.cards.values(), start=1):
@@ -376,7 +587,9 @@ class DashboardView(ttk.Frame):
         """Open the history viewer window."""
         from src.components.history_window import HistoryWindow
 
-        history_window = HistoryWindow(self.winfo_toplevel())
+        history_window = HistoryWindow(
+            self.winfo_toplevel(), data_config=self.data_config
+        )
         history_window.transient(self.winfo_toplevel())
         history_window.grab_set()
         history_window.focus_force()
@@ -421,7 +634,13 @@ class DashboardView(ttk.Frame):
             if card is not None:
                 card.delete_card()
 
-        self.card_frame.add_card(issue_text=issue_text)
+        card = self.card_frame.add_card(issue_text=issue_text)
+        # Pre-fill what was usually written for this stop reason on this LU
+        recommended = get_recommendation_index().recommend(
+            issue_text, lu=self.sidebar.lu.get().strip()
+        )
+        if recommended:
+            card.set_details(recommended)
 
     def _get_url(self, link_up, date_entry, shift, functional_location="PACK") -> str:
         """Helper method to generate URLs based on environment."""
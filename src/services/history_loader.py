@@ -0,0 +1,110 @@
+"""Background reads of history pages for the History window.
+
+``iter_record_pages`` is a blocking iterator (CSV parsing, SQLite cursor).
+``HistoryLoader`` advances it on a private single worker thread, so the Tk
+event loop only awaits finished chunks, and an SQLite cursor is always used
+from the thread that opened it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional, Sequence
+
+import pandas as pd
+
+
+def filter_rows(df: pd.DataFrame, query: str) -> pd.DataFrame:
+    """Rows where any column contains ``query`` (case-insensitive)."""
+
+    if not query or df.empty:
+        return df
+    mask = pd.Series(False, index=df.index)
+    for column in df.columns:
+        mask |= df[column].astype(str).str.contains(query, case=False, regex=False)
+    return df[mask]
+
+
+def merge_positions(
+    existing: Sequence[tuple],
+    new: Sequence[tuple],
+    key: Callable[[tuple], tuple],
+) -> list[int]:
+    """Where each of ``new`` lands when merged into ``existing``.
+
+    Both sequences are sorted newest first by ``key``. A new row goes before
+    existing rows with an equal key, as it was saved after them. Returns the
+    index of every new row in the merged list, in order.
+    """
+
+    positions = []
+    low = 0
+    for index, row in enumerate(new):
+        wanted = key(row)
+        # Existing rows are descending: count those strictly newer than ``row``
+        high = len(existing)
+        while low < high:
+            middle = (low + high) // 2
+            if key(existing[middle]) > wanted:
+                low = middle + 1
+            else:
+                high = middle
+        positions.append(low + index)
+    return positions
+
+
+@dataclass
+class HistoryChunk:
+    """Display rows of one page and how many stored rows were read for it."""
+
+    rows: list[tuple]
+    read: int
+
+
+class HistoryLoader:
+    """Pulls pages from ``pages`` one chunk at a time off the event loop."""
+
+    def __init__(
+        self,
+        pages: Iterator[pd.DataFrame],
+        columns: Sequence[str],
+        query: str = "",
+    ):
+        self.columns = list(columns)
+        self.query = query
+        self._pages = pages
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="history-loader"
+        )
+        self._closed = False
+
+    def _read_chunk(self) -> Optional[HistoryChunk]:
+        read = 0
+        for page in self._pages:
+            read += len(page)
+            page = filter_rows(page, self.query)
+            if not page.empty:
+                page = page.reindex(columns=self.columns).fillna("")
+                return HistoryChunk(list(page.itertuples(index=False, name=None)), read)
+        return HistoryChunk([], read) if read else None
+
+    async def next_chunk(self) -> Optional[HistoryChunk]:
+        """Next chunk with matching rows, or None once the pages are exhausted."""
+
+        if self._closed:
+            return None
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._read_chunk)
+
+    def close(self) -> None:
+        """Stop reading; the page iterator is closed on the worker thread."""
+
+        if self._closed:
+            return
+        self._closed = True
+        close = getattr(self._pages, "close", None)
+        if close is not None:
+            self._executor.submit(close)
+        self._executor.shutdown(wait=False)
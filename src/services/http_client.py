@@ -0,0 +1,239 @@
+"""Shared, pooled HTTP clients for SPA requests.
+
+Creating a fresh ``httpx.AsyncClient`` for every fetch repeats the TCP, TLS
+and NTLM handshakes each time. NTLM authenticates the *connection*, so keeping
+connections alive lets follow-up requests skip the three-leg handshake
+entirely. ``SPAClientManager`` keeps one keep-alive pool per base URL and
+credential set and hands the same client to every caller.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import ssl
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.utils.app_config import (
+    AppDataConfig,
+    get_config_service,
+    resolve_ca_bundle_path,
+)
+from src.utils.auth import build_ntlm_auth, resolve_credentials
+from src.utils.constants import HEADERS
+
+CLIENT_TIMEOUT = 30.0
+MAX_CONNECTIONS = 8
+MAX_KEEPALIVE_CONNECTIONS = 4
+KEEPALIVE_EXPIRY = 120.0  # seconds an idle connection stays in the pool
+
+ClientKey = tuple[str, str, str]
+
+
+# (bundle path, mtime_ns, size) of the PEM file; ("",) for httpx's store
+SSLContextKey = tuple
+_ssl_contexts: dict[SSLContextKey, ssl.SSLContext] = {}
+_ssl_contexts_lock = threading.Lock()
+
+
+def _ssl_context_key(cafile: Optional[Path]) -> SSLContextKey:
+    if cafile is None:
+        return ("",)
+    try:
+        stat = cafile.stat()
+    except OSError:
+        return (str(cafile), None, None)
+    return (str(cafile), stat.st_mtime_ns, stat.st_size)
+
+
+def get_ssl_context(ca_bundle: Optional[str] = None) -> ssl.SSLContext:
+    """Return the shared SSL context trusting ``ca_bundle`` (or httpx's store).
+
+    Loading a PEM bundle costs milliseconds, and httpx would do it for every
+    client given a path. One context per bundle is built on first use; the
+    bundle file's mtime and size are part of the key, so a regenerated or
+    replaced bundle gets a new context. ``clear_ssl_contexts`` (called when
+    the config changes) drops them all.
+    """
+
+    # Resolve path compatible with PyInstaller/runtime
+    cafile = resolve_ca_bundle_path(ca_bundle) if ca_bundle else None
+    key = _ssl_context_key(cafile)
+    context = _ssl_contexts.get(key)
+    if context is not None:
+        return context
+    with _ssl_contexts_lock:
+        context = _ssl_contexts.get(key)
+        if context is None:
+            if cafile is not None:
+                context = ssl.create_default_context(cafile=str(cafile))
+            else:
+                context = httpx.create_ssl_context()
+            # Older versions of the same bundle are not needed any more
+            for stale in [other for other in _ssl_contexts if other[0] == key[0]]:
+                del _ssl_contexts[stale]
+            _ssl_contexts[key] = context
+        return context
+
+
+def clear_ssl_contexts() -> None:
+    """Forget the cached SSL contexts; the next client rebuilds them."""
+
+    with _ssl_contexts_lock:
+        _ssl_contexts.clear()
+
+
+def resolve_verify(config: Optional[AppDataConfig]) -> bool | ssl.SSLContext:
+    """Return the ``verify`` argument for httpx based on the TLS settings."""
+
+    if config is not None and not config.verify_ssl:
+        return False
+    return get_ssl_context(config.ca_bundle if config else None)
+
+
+def _base_url(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _credential_fingerprint(config: Optional[AppDataConfig]) -> str:
+    # Hash the credentials so they never sit in a long-lived dict key.
+    credentials = resolve_credentials(config)
+    if credentials is None:
+        return ""
+    return hashlib.sha256("\0".join(credentials).encode("utf-8")).hexdigest()
+
+
+class SPAClientManager:
+    """Application-scoped registry of keep-alive ``httpx.AsyncClient`` pools."""
+
+    def __init__(
+        self,
+        *,
+        timeout: float = CLIENT_TIMEOUT,
+        max_connections: int = MAX_CONNECTIONS,
+        max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = KEEPALIVE_EXPIRY,
+    ):
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._clients: dict[ClientKey, httpx.AsyncClient] = {}
+        self._stale: list[httpx.AsyncClient] = []
+        self._invalidated = False
+
+    def _make_key(self, url: str, config: Optional[AppDataConfig]) -> ClientKey:
+        verify = resolve_verify(config)
+        return (
+            _base_url(url),
+            _credential_fingerprint(config),
+            # The shared context object stands for its bundle
+            str(id(verify)) if isinstance(verify, ssl.SSLContext) else str(verify),
+        )
+
+    def get_client(
+        self, url: str, config: Optional[AppDataConfig] = None
+    ) -> httpx.AsyncClient:
+        """Return the pooled client for ``url``'s base URL and ``config``.
+
+        A new client is only created the first time a base URL is seen or when
+        the credentials/TLS settings for that base URL change; the replaced
+        client is closed in the background.
+        """
+
+        if self._invalidated:
+            self._invalidated = False
+            self._stale.extend(self._clients.values())
+            self._clients.clear()
+
+        key = self._make_key(url, config)
+        client = self._clients.get(key)
+        if client is not None and not client.is_closed:
+            return client
+
+        for other_key in [k for k in self._clients if k[0] == key[0]]:
+            logging.debug("SPAClientManager: configuration changed for %s", key[0])
+            self._stale.append(self._clients.pop(other_key))
+        if self._stale:
+            try:
+                asyncio.get_running_loop().create_task(self._close_stale())
+            except RuntimeError:
+                pass  # no running loop; closed on the next reset()/aclose()
+
+        client = httpx.AsyncClient(
+            auth=build_ntlm_auth(config) if config else None,
+            headers=HEADERS,
+            timeout=self.timeout,
+            verify=resolve_verify(config),
+            limits=self.limits,
+            follow_redirects=True,
+        )
+        self._clients[key] = client
+        return client
+
+    def invalidate(self, _config: Optional[AppDataConfig] = None) -> None:
+        """Drop every pooled client and SSL context on the next ``get_client``.
+
+        Safe to call from any thread, e.g. as a config change listener; the
+        clients are closed on the event loop that uses them.
+        """
+
+        clear_ssl_contexts()
+        self._invalidated = True
+
+    async def reset(self) -> None:
+        """Close every pooled client so the next request rebuilds them."""
+
+        self._stale.extend(self._clients.values())
+        self._clients.clear()
+        await self._close_stale()
+
+    async def aclose(self) -> None:
+        """Close all pooled connections (call once on application shutdown)."""
+
+        await self.reset()
+
+    async def _close_stale(self) -> None:
+        while self._stale:
+            client = self._stale.pop()
+            try:
+                await client.aclose()
+            except Exception as exc:  # noqa: BLE001 - best effort on shutdown
+                logging.warning("SPAClientManager: failed to close client: %s", exc)
+
+
+_manager: Optional[SPAClientManager] = None
+_unsubscribe: Optional[Callable[[], None]] = None
+
+
+def get_client_manager() -> SPAClientManager:
+    """Return the process-wide :class:`SPAClientManager`."""
+
+    global _manager, _unsubscribe
+    if _manager is None:
+        _manager = SPAClientManager()
+        # Pools keep the old base URL, credentials and TLS settings alive
+        _unsubscribe = get_config_service().subscribe(_manager.invalidate)
+    return _manager
+
+
+async def close_client_manager() -> None:
+    """Close the shared client manager if it was ever created."""
+
+    global _manager, _unsubscribe
+    if _manager is None:
+        return
+    if _unsubscribe is not None:
+        _unsubscribe()
+        _unsubscribe = None
+    await _manager.aclose()
+    _manager = None
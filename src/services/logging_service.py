@@ -8,7 +8,7 @@ from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from typing import Optional
 
-from src.utils.app_config import read_config
+from src.utils.app_config import get_config
 from src.utils.helpers import get_script_folder
 
 
@@ -32,7 +32,7 @@ def get_logger() -> logging.Logger:
     if _logger:
         return _logger
 
-    config = read_config()
+    config = get_config()
     environment = config.environment
 
     logger = logging.getLogger("app")
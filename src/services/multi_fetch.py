@@ -0,0 +1,153 @@
+"""Concurrent SPA fetches with bounded concurrency and per-request timeouts.
+
+Used for views that need several SPA pages at once (e.g. the overview of
+every configured line). Requests share the pooled HTTP client, the on-disk
+response cache and the in-memory ``DataSPA`` cache, and a failing or slow
+request only affects its own entry in the result.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable, Mapping, Optional, TypeVar
+
+from src.services.http_client import get_client_manager
+from src.services.response_cache import get_response_cache
+from src.services.result_cache import DataSPAKey, get_data_spa_cache
+from src.services.spa_service import DataSPA, SPADataProcessor
+from src.utils.app_config import AppDataConfig
+
+DEFAULT_MAX_CONCURRENCY = 3
+DEFAULT_REQUEST_TIMEOUT = 60.0  # seconds per request, including retries
+DEFAULT_MAX_RETRIES = 3
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class SPARequest:
+    """One SPA page to fetch, optionally cached under ``cache_key``."""
+
+    url: str
+    cache_key: Optional[DataSPAKey] = None
+
+
+@dataclass
+class FetchOutcome:
+    """Result of one request: either ``data`` or the ``error`` it raised."""
+
+    data: Optional[DataSPA] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.data is not None
+
+    @property
+    def timed_out(self) -> bool:
+        return isinstance(self.error, asyncio.TimeoutError)
+
+
+async def gather_bounded(
+    jobs: Mapping[K, Callable[[], Awaitable[T]]],
+    *,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT,
+    on_done: Optional[Callable[[K, Optional[T], Optional[BaseException]], None]] = None,
+) -> dict[K, tuple[Optional[T], Optional[BaseException]]]:
+    """Run ``jobs`` concurrently, at most ``max_concurrency`` at a time.
+
+    Each job gets its own ``timeout``. Failures are captured per key instead
+    of cancelling the other jobs, so callers always get partial results;
+    ``on_done`` is called as soon as each job finishes.
+    """
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(
+        key: K, job: Callable[[], Awaitable[T]]
+    ) -> tuple[K, tuple[Optional[T], Optional[BaseException]]]:
+        async with semaphore:
+            try:
+                result: tuple[Optional[T], Optional[BaseException]] = (
+                    await asyncio.wait_for(job(), timeout),
+                    None,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001 - reported per key
+                logging.warning("gather_bounded: job %r failed: %r", key, exc)
+                result = (None, exc)
+        if on_done is not None:
+            on_done(key, *result)
+        return key, result
+
+    results = await asyncio.gather(*(run(key, job) for key, job in jobs.items()))
+    return dict(results)
+
+
+async def fetch_data_spa(
+    url: str,
+    config: Optional[AppDataConfig] = None,
+    *,
+    max_retries: int = 5,
+) -> DataSPA:
+    """Fetch and parse one SPA page using the shared client and caches."""
+
+    processor = SPADataProcessor(
+        url=url,
+        config=config,
+        max_retries=max_retries,
+        client=get_client_manager().get_client(url, config),
+        response_cache=get_response_cache(config),
+    )
+    await processor.start()
+    return await processor.get_data_spa()
+
+
+async def fetch_many(
+    requests: Mapping[K, SPARequest],
+    config: Optional[AppDataConfig] = None,
+    *,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    on_result: Optional[Callable[[K, FetchOutcome], None]] = None,
+) -> dict[K, FetchOutcome]:
+    """Fetch several SPA pages concurrently and return one outcome per key.
+
+    ``on_result`` receives each outcome as soon as it is available, which
+    lets the UI fill in rows progressively.
+    """
+
+    spa_cache = get_data_spa_cache(config)
+
+    def make_job(request: SPARequest) -> Callable[[], Awaitable[DataSPA]]:
+        async def job() -> DataSPA:
+            if request.cache_key is not None:
+                cached = spa_cache.get(request.cache_key)
+                if cached is not None:
+                    return cached
+            data_spa = await fetch_data_spa(
+                request.url, config, max_retries=max_retries
+            )
+            if request.cache_key is not None:
+                spa_cache.put(request.cache_key, data_spa)
+            return data_spa
+
+        return job
+
+    def report(key: K, data: Optional[DataSPA], error: Optional[BaseException]) -> None:
+        if on_result is not None:
+            on_result(key, FetchOutcome(data, error))
+
+    results = await gather_bounded(
+        {key: make_job(request) for key, request in requests.items()},
+        max_concurrency=max_concurrency,
+        timeout=timeout,
+        on_done=report,
+    )
+    return {key: FetchOutcome(data, error) for key, (data, error) in results.items()}
@@ -0,0 +1,119 @@
+"""Off-loop executor for CPU-bound HTML parsing.
+
+Parsing a full SPA page with pandas/lxml takes hundreds of milliseconds and
+would freeze the ``async_mainloop`` UI if it ran on the event loop. The
+``ParseExecutor`` runs that work on a bounded thread or process pool and
+exposes it as an awaitable. Incremental parsers that are fed while a page
+streams in get a separate single thread, so each one is only ever touched
+by one thread and its chunks are parsed in order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from io import StringIO
+from typing import Any, Callable, Optional, TypeVar
+
+import pandas as pd
+
+from src.utils.app_config import AppDataConfig
+
+PARSE_EXECUTOR_KINDS = ("thread", "process")
+DEFAULT_PARSE_EXECUTOR = "thread"
+DEFAULT_PARSE_WORKERS = 2
+MAX_PARSE_WORKERS = 4
+
+T = TypeVar("T")
+
+
+def parse_html_tables(html: str) -> list[pd.DataFrame]:
+    """Parse every ``<table>`` in ``html`` (module level so it pickles)."""
+
+    return pd.read_html(StringIO(html), encoding="utf-8")
+
+
+class ParseExecutor:
+    """Bounded thread or process pool used for HTML-to-table work."""
+
+    def __init__(
+        self, kind: str = DEFAULT_PARSE_EXECUTOR, workers: int = DEFAULT_PARSE_WORKERS
+    ):
+        if kind not in PARSE_EXECUTOR_KINDS:
+            raise ValueError(
+                f"Unknown parse executor '{kind}', expected one of {PARSE_EXECUTOR_KINDS}"
+            )
+        self.kind = kind
+        self.workers = max(1, min(int(workers), MAX_PARSE_WORKERS))
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="spa-parse"
+                )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``func(*args, **kwargs)`` on the pool without blocking the loop."""
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), partial(func, *args, **kwargs)
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_executor: Optional[ParseExecutor] = None
+_stream_executor: Optional[ParseExecutor] = None
+
+
+def get_parse_executor(config: Optional[AppDataConfig] = None) -> ParseExecutor:
+    """Return the shared parse executor, rebuilding it when its settings change."""
+
+    global _executor
+    kind = config.parse_executor if config else DEFAULT_PARSE_EXECUTOR
+    workers = config.parse_workers if config else DEFAULT_PARSE_WORKERS
+    if kind not in PARSE_EXECUTOR_KINDS:
+        logging.warning("Unknown parse_executor '%s', using threads", kind)
+        kind = DEFAULT_PARSE_EXECUTOR
+
+    if _executor is not None and (
+        _executor.kind != kind
+        or _executor.workers != max(1, min(workers, MAX_PARSE_WORKERS))
+    ):
+        _executor.shutdown()
+        _executor = None
+    if _executor is None:
+        _executor = ParseExecutor(kind, workers)
+    return _executor
+
+
+def get_stream_parse_executor() -> ParseExecutor:
+    """Return the single-thread executor for incremental (streaming) parsers."""
+
+    global _stream_executor
+    if _stream_executor is None:
+        _stream_executor = ParseExecutor("thread", 1)
+    return _stream_executor
+
+
+def shutdown_parse_executor() -> None:
+    """Stop the shared parse executors (call once on application shutdown)."""
+
+    global _executor, _stream_executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+    if _stream_executor is not None:
+        _stream_executor.shutdown()
+        _stream_executor = None
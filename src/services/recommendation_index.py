@@ -0,0 +1,176 @@
+"""Details and actions that usually go with a stop reason, from history.
+
+For every issue text ``RecommendationIndex`` counts, per LU, on how many
+saved cards each detail was written for it and each action for that
+detail. The few most frequent ones are kept precomputed per issue, so
+``recommend`` is a dictionary lookup and a card created from the SPA issue
+table can be pre-filled without delay. The counts are read from the store
+by ``load_card_indexes_in_background`` at startup; a save only recomputes
+the lists of the issues it touched and a re-saved card replaces its
+earlier counts.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from typing import Iterable, Mapping
+
+import pandas as pd
+
+from src.services.suggestion_index import ALL_LUS, normalize
+
+RECOMMENDED_DETAILS = 2
+RECOMMENDED_ACTIONS = 3
+
+# Columns ``load`` needs from ``load_records``
+LOAD_COLUMNS = ["card_id", "lu", "issue", "detail", "action"]
+
+# Precomputed recommendation of one issue: ((detail, (action, ...)), ...)
+Recommendation = tuple[tuple[str, tuple[str, ...]], ...]
+
+
+class RecommendationIndex:
+    """Issue → detail → action co-occurrence counts; thread safe."""
+
+    def __init__(self) -> None:
+        self._details: dict[tuple[str, str], Counter] = {}
+        self._actions: dict[tuple[str, str, str], Counter] = {}
+        self._texts: dict[str, str] = {}
+        self._cards: dict[str, Counter] = {}
+        self._top: dict[tuple[str, str], Recommendation] = {}
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._pending: list[list[Mapping[str, object]]] = []
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded.is_set()
+
+    def _card_counts(self, rows: Iterable[Mapping[str, object]]) -> dict[str, Counter]:
+        """Per card, the detail and action keys it contributes, once each.
+
+        Keys are ``("detail", lu, issue, detail)`` and
+        ``("action", lu, issue, detail, action)``, all normalized.
+        """
+
+        cards: dict[str, Counter] = {}
+        for row in rows:
+            issue, detail, action = (
+                str(row.get(field) or "").strip()
+                for field in ("issue", "detail", "action")
+            )
+            issue_key, detail_key = normalize(issue), normalize(detail)
+            if not issue_key or not detail_key:
+                continue
+            action_key = normalize(action)
+            self._texts[detail_key] = detail
+            if action_key:
+                self._texts[action_key] = action
+            counts = cards.setdefault(str(row.get("card_id") or ""), Counter())
+            for scope in {str(row.get("lu") or ""), ALL_LUS}:
+                counts[("detail", scope, issue_key, detail_key)] = 1
+                if action_key:
+                    counts[("action", scope, issue_key, detail_key, action_key)] = 1
+        return cards
+
+    def _add(self, counts: Counter, sign: int, touched: set) -> None:
+        for key, count in counts.items():
+            kind, scope, issue_key, detail_key = key[:4]
+            if kind == "detail":
+                counter = self._details.setdefault((scope, issue_key), Counter())
+                counter[detail_key] += sign * count
+                if counter[detail_key] <= 0:
+                    del counter[detail_key]
+            else:
+                counter = self._actions.setdefault(
+                    (scope, issue_key, detail_key), Counter()
+                )
+                counter[key[4]] += sign * count
+                if counter[key[4]] <= 0:
+                    del counter[key[4]]
+            touched.add((scope, issue_key))
+
+    def _apply(self, rows: Iterable[Mapping[str, object]], touched: set) -> None:
+        for card_id, counts in self._card_counts(rows).items():
+            previous = self._cards.get(card_id)
+            if previous:
+                self._add(previous, -1, touched)
+            self._add(counts, 1, touched)
+            if card_id:
+                self._cards[card_id] = counts
+
+    def _recompute(self, touched: Iterable[tuple[str, str]]) -> None:
+        for scope, issue_key in touched:
+            details = self._details.get((scope, issue_key))
+            if not details:
+                self._top.pop((scope, issue_key), None)
+                continue
+            self._top[(scope, issue_key)] = tuple(
+                (
+                    self._texts[detail_key],
+                    tuple(
+                        self._texts[action_key]
+                        for action_key, _ in self._actions.get(
+                            (scope, issue_key, detail_key), Counter()
+                        ).most_common(RECOMMENDED_ACTIONS)
+                    ),
+                )
+                for detail_key, _ in details.most_common(RECOMMENDED_DETAILS)
+            )
+
+    def load(self, df: pd.DataFrame) -> None:
+        """Count every saved row (``load_records`` output) from scratch.
+
+        Saves that arrive while the rows are being read are applied on top,
+        unless the read already contained their card.
+        """
+
+        rows = df.to_dict("records")
+        loaded_cards = {str(row.get("card_id")) for row in rows}
+        with self._lock:
+            self._details, self._actions, self._cards, self._top = {}, {}, {}, {}
+            touched: set = set()
+            self._apply(rows, touched)
+            for pending in self._pending:
+                self._apply(
+                    (
+                        row
+                        for row in pending
+                        if str(row.get("card_id")) not in loaded_cards
+                    ),
+                    touched,
+                )
+            self._pending = []
+            self._recompute(touched)
+            self._loaded.set()
+
+    def add_rows(self, rows: Iterable[Mapping[str, object]]) -> None:
+        """Count the rows of saved cards, replacing earlier saves of them."""
+
+        rows = list(rows)
+        with self._lock:
+            if not self._loaded.is_set():
+                self._pending.append(rows)
+                return
+            touched: set = set()
+            self._apply(rows, touched)
+            self._recompute(touched)
+
+    def recommend(self, issue: str, lu: str = ALL_LUS) -> list[dict]:
+        """Most frequent details of ``issue`` with their most frequent actions.
+
+        The entries have the ``{"detail", "actions"}`` shape of card data.
+        History of ``lu`` is used when it has the issue, else every LU's.
+        """
+
+        key = normalize(issue)
+        top = self._top.get((lu, key)) or self._top.get((ALL_LUS, key)) or ()
+        return [{"detail": detail, "actions": list(actions)} for detail, actions in top]
+
+
+_index = RecommendationIndex()
+
+
+def get_recommendation_index() -> RecommendationIndex:
+    return _index
@@ -0,0 +1,408 @@
+"""Parquet archive of closed months: issue cards and parsed SPA snapshots.
+
+Trend views over several months should not re-parse text CSV. Months that
+are closed are kept as one zstd-compressed Parquet file each under
+``data/archive/`` (``cards-2025-11.parquet``, ``spa-2025-11.parquet``),
+sorted by lu/tanggal/shift so row-group statistics let readers skip most of
+a file. Reads only open the months that overlap the requested range, load
+only the requested columns and push lu/tanggal/shift filters down to the
+Parquet scan.
+
+``pyarrow`` is optional (``pip install pyarrow``); without it the archive
+is simply not used. Old CSV partitions (``storage_backend = partitioned``)
+are rolled into the archive with::
+
+    python -m src.services.record_archive --compact [--keep-months 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import logging
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Optional, Sequence
+
+import pandas as pd
+
+from src.services.record_partitions import (
+    PARTITION_PREFIX,
+    UNDATED_KEY,
+    month_files,
+    partition_files,
+    partition_key,
+)
+from src.services.record_service import replace_atomically
+from src.services.result_cache import DataSPAKey
+from src.services.spa_service import (
+    DataLossesSummary,
+    DataSPA,
+    LinePerformanceDetail,
+)
+from src.utils.csvhandle import DATABASE_COLUMNS, get_archive_folder
+from src.utils.file_lock import FileLock
+from src.utils.helpers import is_period_closed
+
+CARDS_PREFIX = "cards-"
+SPA_PREFIX = "spa-"
+ARCHIVE_SUFFIX = ".parquet"
+ARCHIVE_COMPRESSION = "zstd"
+ROW_GROUP_ROWS = 64_000
+DEFAULT_KEEP_MONTHS = 2  # current and previous month stay as CSV
+
+SNAPSHOT_KEY_COLUMNS = ("lu", "func_location", "tanggal", "shift")
+LOSS_COLUMNS = tuple(DataLossesSummary.model_fields)
+REASON_COLUMNS = tuple(LinePerformanceDetail.model_fields)
+
+
+class ArchiveUnavailableError(RuntimeError):
+    """Raised when an archive operation needs ``pyarrow`` and it is missing."""
+
+
+def archive_available() -> bool:
+    """True when ``pyarrow`` can be imported."""
+
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ArchiveUnavailableError(
+            "The Parquet archive needs the optional 'pyarrow' package"
+        ) from exc
+    return pa, pc, ds, pq
+
+
+def archive_path(prefix: str, key: str, folder: Optional[Path] = None) -> Path:
+    return Path(folder or get_archive_folder()) / f"{prefix}{key}{ARCHIVE_SUFFIX}"
+
+
+def archive_files(
+    prefix: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    folder: Optional[Path] = None,
+) -> list[Path]:
+    """Archived months of ``prefix`` overlapping [start, end]."""
+
+    return month_files(
+        Path(folder or get_archive_folder()), prefix, ARCHIVE_SUFFIX, start, end
+    )
+
+
+def _filter_expression(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    **equals: Optional[str | Sequence[str]],
+):
+    """Scan filter on ``tanggal`` (inclusive range) and exact column values."""
+
+    _, _, ds, _ = _pyarrow()
+    clauses = []
+    if start is not None or end is not None:
+        clauses.append(ds.field("tanggal") != "")
+    if start is not None:
+        clauses.append(ds.field("tanggal") >= start.isoformat())
+    if end is not None:
+        clauses.append(ds.field("tanggal") <= end.isoformat())
+    for column, value in equals.items():
+        if value is None:
+            continue
+        if isinstance(value, str):
+            clauses.append(ds.field(column) == value)
+        else:
+            clauses.append(ds.field(column).isin(list(value)))
+
+    expression = None
+    for clause in clauses:
+        expression = clause if expression is None else expression & clause
+    return expression
+
+
+def _scan_table(files: list[Path], columns: Optional[Sequence[str]], expression):
+    if not files:
+        return None
+    _, _, ds, _ = _pyarrow()
+    dataset = ds.dataset([str(path) for path in files], format="parquet")
+    names = dataset.schema.names
+    selected = list(dict.fromkeys(col for col in columns or names if col in names))
+    return dataset.to_table(columns=selected, filter=expression)
+
+
+def _scan(
+    files: list[Path], columns: Optional[Sequence[str]], expression
+) -> Optional[pd.DataFrame]:
+    table = _scan_table(files, columns, expression)
+    if table is None:
+        return None
+    pa, _, _, _ = _pyarrow()
+    return table.to_pandas(
+        types_mapper={pa.string(): pd.StringDtype(), pa.int64(): pd.Int64Dtype()}.get
+    )
+
+
+def _write_parquet(table, path: Path) -> None:
+    _, _, _, pq = _pyarrow()
+    replace_atomically(
+        path,
+        lambda temp_path: pq.write_table(
+            table,
+            temp_path,
+            compression=ARCHIVE_COMPRESSION,
+            row_group_size=ROW_GROUP_ROWS,
+        ),
+    )
+
+
+# --- issue cards ---------------------------------------------------------
+
+
+def read_archived_cards(
+    columns: Optional[list[str]] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    lu: Optional[str | Sequence[str]] = None,
+    shift: Optional[str | Sequence[str]] = None,
+    folder: Optional[Path] = None,
+    month: Optional[str] = None,
+    user: Optional[str | Sequence[str]] = None,
+) -> pd.DataFrame:
+    """Archived card rows, string columns, filtered inside the Parquet scan.
+
+    ``month`` (``YYYY-MM``) restricts the scan to that month's file.
+    """
+
+    if month is not None:
+        path = archive_path(CARDS_PREFIX, month, folder)
+        files = [path] if path.exists() else []
+    else:
+        files = archive_files(CARDS_PREFIX, start, end, folder)
+    df = _scan(
+        files, columns, _filter_expression(start, end, lu=lu, shift=shift, user=user)
+    )
+    if df is None:
+        return pd.DataFrame(columns=list(columns or DATABASE_COLUMNS), dtype="string")
+    return df
+
+
+def _cards_table(df: pd.DataFrame):
+    pa, _, _, _ = _pyarrow()
+    columns = list(DATABASE_COLUMNS) + [
+        col for col in df.columns if col not in DATABASE_COLUMNS
+    ]
+    df = (
+        df.reindex(columns=columns)
+        .fillna("")
+        .astype(str)
+        .sort_values(["lu", "tanggal", "shift"], kind="stable")
+    )
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def compact_partitions(
+    keep_months: int = DEFAULT_KEEP_MONTHS,
+    today: Optional[date] = None,
+    partitions_folder: Optional[Path] = None,
+    archive_folder: Optional[Path] = None,
+) -> list[str]:
+    """Roll CSV partitions older than ``keep_months`` into the archive.
+
+    A month that is already archived (a card was saved late) is merged, the
+    CSV version of a card replacing the archived one. The CSV partition is
+    deleted only after the archive file was written and its row count
+    checked. Returns the compacted month keys.
+    """
+
+    _, _, _, pq = _pyarrow()
+    today = today or date.today()
+    month_index = today.year * 12 + today.month - 1 - max(0, keep_months - 1)
+    cutoff = f"{month_index // 12:04d}-{month_index % 12 + 1:02d}"
+
+    compacted = []
+    for path in partition_files(folder=partitions_folder):
+        key = path.stem[len(PARTITION_PREFIX) :]
+        if key == UNDATED_KEY or key >= cutoff:
+            continue
+        target = archive_path(CARDS_PREFIX, key, archive_folder)
+        with FileLock(path):
+            df = pd.read_csv(
+                path, dtype=str, keep_default_na=False, encoding="utf-8-sig"
+            )
+            if target.exists():
+                archived = pq.read_table(target).to_pandas()
+                archived = archived[~archived["card_id"].isin(set(df["card_id"]))]
+                df = pd.concat([archived, df], ignore_index=True)
+            table = _cards_table(df)
+            _write_parquet(table, target)
+            if pq.read_metadata(target).num_rows != len(df):
+                raise RuntimeError(f"Archive {target} does not match {path}")
+            path.unlink()
+        logging.info("Compacted %s into %s (%d rows)", path.name, target.name, len(df))
+        compacted.append(key)
+    return compacted
+
+
+# --- SPA snapshots -------------------------------------------------------
+
+
+def _snapshot_schema():
+    pa, _, _, _ = _pyarrow()
+    fields = [(column, pa.string()) for column in SNAPSHOT_KEY_COLUMNS]
+    fields += [(column, pa.string()) for column in LOSS_COLUMNS]
+    fields += [(column, pa.string()) for column in ("Line", "Detail", "Stops")]
+    fields += [
+        ("Downtime", pa.string()),
+        ("StopCount", pa.int64()),
+        ("DowntimeSeconds", pa.float64()),
+    ]
+    return pa.schema(fields)
+
+
+def snapshot_table(key: DataSPAKey, data: DataSPA):
+    """One row per stop reason, the summary repeated (dictionary-encoded).
+
+    A snapshot without reasons is stored as a single row with ``Line`` null.
+    """
+
+    pa, _, _, _ = _pyarrow()
+    reasons = [detail.model_dump() for detail in data.stops_reason] or [
+        dict.fromkeys(REASON_COLUMNS)
+    ]
+    shared = dict(zip(SNAPSHOT_KEY_COLUMNS, key))
+    shared.update(data.data_losses.model_dump())
+    columns = {
+        name: [reason.get(name, shared.get(name)) for reason in reasons]
+        for name in _snapshot_schema().names
+    }
+    return pa.Table.from_pydict(columns, schema=_snapshot_schema())
+
+
+def archive_spa_snapshot(
+    key: DataSPAKey, data: DataSPA, folder: Optional[Path] = None
+) -> Path:
+    """Store (or replace) the snapshot of ``key`` in its month file."""
+
+    pa, pc, _, pq = _pyarrow()
+    path = archive_path(SPA_PREFIX, partition_key(key[2]), folder)
+    table = snapshot_table(key, data)
+    with FileLock(path):
+        if path.exists():
+            existing = pq.read_table(path, schema=_snapshot_schema())
+            same_key = None
+            for column, value in zip(SNAPSHOT_KEY_COLUMNS, key):
+                clause = pc.equal(existing[column], value)
+                same_key = clause if same_key is None else pc.and_(same_key, clause)
+            existing = existing.filter(pc.invert(same_key))
+            table = pa.concat_tables([existing, table])
+        table = table.sort_by(
+            [(column, "ascending") for column in SNAPSHOT_KEY_COLUMNS]
+        )
+        _write_parquet(table, path)
+    return path
+
+
+_archived_snapshots: set[DataSPAKey] = set()
+_archived_lock = threading.Lock()
+
+
+def archive_closed_snapshot(key: DataSPAKey, data: DataSPA) -> bool:
+    """Archive ``data`` once per process if its period is closed.
+
+    Returns False (and does nothing) for running periods, snapshots already
+    archived by this process, or when ``pyarrow`` is not installed.
+    """
+
+    _, _, date_value, shift = key
+    if not archive_available() or not is_period_closed(date_value, shift):
+        return False
+    with _archived_lock:
+        if key in _archived_snapshots:
+            return False
+        _archived_snapshots.add(key)
+    try:
+        archive_spa_snapshot(key, data)
+    except Exception:
+        with _archived_lock:
+            _archived_snapshots.discard(key)
+        raise
+    return True
+
+
+def read_spa_archive(
+    columns: Optional[list[str]] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    lu: Optional[str | Sequence[str]] = None,
+    shift: Optional[str | Sequence[str]] = None,
+    func_location: Optional[str | Sequence[str]] = None,
+    folder: Optional[Path] = None,
+) -> pd.DataFrame:
+    """Archived stop reasons (with their period summary) for trend analysis."""
+
+    files = archive_files(SPA_PREFIX, start, end, folder)
+    expression = _filter_expression(
+        start, end, lu=lu, shift=shift, func_location=func_location
+    )
+    df = _scan(files, columns, expression)
+    if df is None:
+        return pd.DataFrame(columns=list(columns or _snapshot_schema().names))
+    return df
+
+
+def load_spa_snapshot(
+    key: DataSPAKey, folder: Optional[Path] = None
+) -> Optional[DataSPA]:
+    """Rebuild the archived ``DataSPA`` of ``key``, or None if not archived."""
+
+    lu, func_location, date_value, shift = key
+    files = [archive_path(SPA_PREFIX, partition_key(date_value), folder)]
+    if not files[0].exists():
+        return None
+    expression = _filter_expression(
+        lu=lu, func_location=func_location, tanggal=date_value, shift=shift
+    )
+    table = _scan_table(files, None, expression)
+    if table is None or table.num_rows == 0:
+        return None
+
+    rows = table.to_pylist()
+    losses = DataLossesSummary(**{column: rows[0][column] for column in LOSS_COLUMNS})
+    stops_reason = [
+        LinePerformanceDetail(**{column: row[column] for column in REASON_COLUMNS})
+        for row in rows
+        if row["Line"] is not None
+    ]
+    return DataSPA(data_losses=losses, stops_reason=stops_reason)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Parquet archive of closed months")
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="roll old CSV partitions (data/partitions) into the archive",
+    )
+    parser.add_argument(
+        "--keep-months",
+        type=int,
+        default=DEFAULT_KEEP_MONTHS,
+        help="recent months to keep as CSV (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.compact:
+        compacted = compact_partitions(keep_months=args.keep_months)
+        print(f"Compacted {len(compacted)} partitions: {', '.join(compacted)}")
+    for path in archive_files(CARDS_PREFIX) + archive_files(SPA_PREFIX):
+        print(path.name)
+
+
+if __name__ == "__main__":
+    main()
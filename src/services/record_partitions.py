@@ -0,0 +1,455 @@
+"""Month-partitioned CSV storage for issue-card records.
+
+Instead of one ever-growing ``database.csv``, every calendar month of
+``tanggal`` gets its own file under ``data/partitions/``
+(``cards-2025-11.csv``; rows without a valid date go to
+``cards-undated.csv``). Each partition is an ordinary card CSV, written
+with the same locked append/upsert helpers as ``database.csv``. A
+date-range read only opens the months that overlap the range, so loading
+the last week costs the same however much history has piled up.
+
+Existing CSV history can be split into partitions with::
+
+    python -m src.services.record_partitions --migrate [path/to/database.csv]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import date
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import pandas as pd
+
+from src.services.record_service import (
+    HISTORY_PAGE_ROWS,
+    FileMark,
+    ReadProgress,
+    RecordFilter,
+    append_cards_to_csv,
+    append_revisions,
+    iter_frame_pages,
+    latest_card_versions,
+    read_appended_csv,
+    read_cards_csv,
+    remove_cards_from_csv,
+    sort_newest_first,
+    upsert_cards_to_csv,
+    with_sort_columns,
+)
+from src.utils.csvhandle import (
+    DATABASE_COLUMNS,
+    get_database_file_path,
+    get_partitions_folder,
+)
+
+PARTITION_PREFIX = "cards-"
+UNDATED_KEY = "undated"
+MIGRATION_CHUNK_ROWS = 50_000
+# CSV files already split by ``migrate_csv``, kept in the partitions folder
+MIGRATIONS_FILE = "migrations.json"
+
+
+def partition_key(tanggal: str) -> str:
+    """Return the ``YYYY-MM`` partition of an ISO date, or ``undated``."""
+
+    try:
+        parsed = date.fromisoformat(str(tanggal).strip()[:10])
+    except ValueError:
+        return UNDATED_KEY
+    return f"{parsed.year:04d}-{parsed.month:02d}"
+
+
+def partition_path(key: str, folder: Optional[Path] = None) -> Path:
+    return Path(folder or get_partitions_folder()) / f"{PARTITION_PREFIX}{key}.csv"
+
+
+def month_files(
+    folder: Path,
+    prefix: str,
+    suffix: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> list[Path]:
+    """Files ``<prefix><YYYY-MM><suffix>`` overlapping [start, end], oldest first.
+
+    The undated file can only match an unbounded read.
+    """
+
+    bounded = start is not None or end is not None
+    first = start.strftime("%Y-%m") if start is not None else None
+    last = end.strftime("%Y-%m") if end is not None else None
+
+    selected = []
+    for path in sorted(Path(folder).glob(f"{prefix}*{suffix}")):
+        key = path.name[len(prefix) : -len(suffix)]
+        if key == UNDATED_KEY:
+            if not bounded:
+                selected.append(path)
+            continue
+        if first is not None and key < first:
+            continue
+        if last is not None and key > last:
+            continue
+        selected.append(path)
+    return selected
+
+
+def partition_files(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    folder: Optional[Path] = None,
+) -> list[Path]:
+    """Existing CSV partitions overlapping [start, end], oldest month first."""
+
+    return month_files(
+        Path(folder or get_partitions_folder()), PARTITION_PREFIX, ".csv", start, end
+    )
+
+
+def _group_by_partition(
+    rows: list[dict[str, str]],
+) -> dict[str, list[dict[str, str]]]:
+    groups: dict[str, list[dict[str, str]]] = {}
+    for row in rows:
+        groups.setdefault(partition_key(row.get("tanggal", "")), []).append(row)
+    return groups
+
+
+def save_partitioned(
+    rows: list[dict[str, str]],
+    keep_revisions: bool = False,
+    folder: Optional[Path] = None,
+) -> Path:
+    """Upsert ``rows`` into their month partitions; return the folder.
+
+    All rows of a card share its ``tanggal``, so a card is upserted into a
+    single partition. When its date was corrected to another month, its rows
+    in the other partitions are deleted afterwards (a crash in between leaves
+    a duplicate, never a lost card); with ``keep_revisions`` they are logged
+    as the replaced version. Which partitions hold a card comes from the
+    cached card_id set of each file.
+    """
+
+    folder = Path(folder or get_partitions_folder())
+    groups = _group_by_partition(latest_card_versions(rows))
+    for key, group in groups.items():
+        upsert_cards_to_csv(
+            group, keep_revisions=keep_revisions, file_path=partition_path(key, folder)
+        )
+
+    for path in partition_files(folder=folder):
+        key = path.name[len(PARTITION_PREFIX) : -len(".csv")]
+        moved = {
+            row.get("card_id", "")
+            for other, group in groups.items()
+            if other != key
+            for row in group
+        }
+        if not moved:
+            continue
+        removed = remove_cards_from_csv(moved, path)
+        if keep_revisions:
+            append_revisions(removed)
+    return folder
+
+
+def month_keys(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    folder: Optional[Path] = None,
+    archive_folder: Optional[Path] = None,
+) -> list[str]:
+    """Months with rows overlapping [start, end] (CSV or archive), oldest first.
+
+    The undated partition, if selected, comes last.
+    """
+
+    from src.services.record_archive import (
+        ARCHIVE_SUFFIX,
+        CARDS_PREFIX,
+        archive_available,
+        archive_files,
+    )
+
+    keys = {
+        path.name[len(PARTITION_PREFIX) : -len(".csv")]
+        for path in partition_files(start, end, folder)
+    }
+    if archive_available():
+        keys.update(
+            path.name[len(CARDS_PREFIX) : -len(ARCHIVE_SUFFIX)]
+            for path in archive_files(CARDS_PREFIX, start, end, archive_folder)
+        )
+    return sorted(keys - {UNDATED_KEY}) + sorted(keys & {UNDATED_KEY})
+
+
+def read_month(
+    key: str,
+    columns: Optional[list[str]] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    folder: Optional[Path] = None,
+    archive_folder: Optional[Path] = None,
+    marks: Optional[dict[str, FileMark]] = None,
+    where: Optional[RecordFilter] = None,
+    progress: Optional[ReadProgress] = None,
+) -> pd.DataFrame:
+    """Rows of one month, from its CSV partition and/or the Parquet archive.
+
+    A card saved again after its month was archived is taken from the CSV
+    partition. ``marks`` records how far the CSV partition was read and
+    ``progress`` follows its parsing.
+    """
+
+    from src.services.record_archive import archive_available, read_archived_cards
+
+    archived = None
+    if archive_available():
+        archived = read_archived_cards(
+            columns and [*columns, "card_id"],
+            start,
+            end,
+            folder=archive_folder,
+            month=key,
+            **(where.equals() if where else {}),
+        )
+        if archived.empty:
+            archived = None
+
+    read_columns = columns
+    if archived is not None and columns and "card_id" not in columns:
+        read_columns = [*columns, "card_id"]
+    path = partition_path(key, folder)
+    frame = None
+    if path.exists():
+        frame = read_cards_csv(path, read_columns, start, end, marks, where, progress)
+    if archived is not None and path.exists():
+        # A re-saved card hides its archived copy even if it no longer matches
+        resaved = frame
+        if where is not None and where.equals():
+            resaved = read_cards_csv(path, ["card_id"], start, end)
+        archived = archived[~archived["card_id"].isin(set(resaved["card_id"]))]
+    if frame is not None and frame.empty:
+        frame = None
+
+    frames = [part for part in (archived, frame) if part is not None]
+    if not frames:
+        return pd.DataFrame(columns=list(columns or DATABASE_COLUMNS), dtype="string")
+    df = pd.concat(frames, ignore_index=True)
+    if columns:
+        df = df.reindex(columns=[col for col in columns if col in df.columns])
+    return df
+
+
+def read_partitions(
+    columns: Optional[list[str]] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    folder: Optional[Path] = None,
+    archive_folder: Optional[Path] = None,
+    where: Optional[RecordFilter] = None,
+) -> pd.DataFrame:
+    """Load rows from the months that overlap the date range.
+
+    Months already compacted into the Parquet archive are read from there
+    when ``pyarrow`` is installed (see :func:`read_month`).
+    """
+
+    frames = [
+        read_month(key, columns, start, end, folder, archive_folder, None, where)
+        for key in month_keys(start, end, folder, archive_folder)
+    ]
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=list(columns or DATABASE_COLUMNS), dtype="string")
+    return pd.concat(frames, ignore_index=True)
+
+
+def count_partitions(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    folder: Optional[Path] = None,
+    archive_folder: Optional[Path] = None,
+    where: Optional[RecordFilter] = None,
+) -> int:
+    """Rows matching the filters, reading only the ``tanggal`` column."""
+
+    return sum(
+        len(
+            read_month(
+                key, ["tanggal"], start, end, folder, archive_folder, None, where
+            )
+        )
+        for key in month_keys(start, end, folder, archive_folder)
+    )
+
+
+def iter_partition_pages(
+    columns: Optional[list[str]] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    page_rows: int = HISTORY_PAGE_ROWS,
+    folder: Optional[Path] = None,
+    archive_folder: Optional[Path] = None,
+    marks: Optional[dict[str, FileMark]] = None,
+    where: Optional[RecordFilter] = None,
+    progress: Optional[ReadProgress] = None,
+) -> Iterator[pd.DataFrame]:
+    """Yield rows newest first, reading one month only when it is reached.
+
+    ``progress`` counts the bytes parsed over the CSV partitions of the
+    whole range, so it keeps advancing from month to month.
+    """
+
+    keys = month_keys(start, end, folder, archive_folder)
+    dated = [key for key in keys if key != UNDATED_KEY]
+    sizes = {}
+    for key in keys:
+        try:
+            sizes[key] = partition_path(key, folder).stat().st_size
+        except OSError:
+            sizes[key] = 0
+    total = sum(sizes.values())
+    done = 0
+    for key in dated[::-1] + [key for key in keys if key == UNDATED_KEY]:
+        df = read_month(
+            key,
+            with_sort_columns(columns),
+            start,
+            end,
+            folder,
+            archive_folder,
+            marks,
+            where,
+            progress and (lambda read, _size, base=done: progress(base + read, total)),
+        )
+        done += sizes[key]
+        yield from iter_frame_pages(sort_newest_first(df), columns, page_rows)
+
+
+def read_appended_partitions(
+    marks: dict[str, FileMark],
+    columns: Optional[list[str]] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    folder: Optional[Path] = None,
+    archive_folder: Optional[Path] = None,
+    where: Optional[RecordFilter] = None,
+) -> Optional[tuple[pd.DataFrame, dict[str, FileMark]]]:
+    """Rows added to the partitions since ``marks`` were taken, and new marks.
+
+    A partition created since then is new in full. Returns None when a
+    marked partition was rewritten or removed, or when the changed month
+    also has archived rows (a re-saved card would hide its archived copy).
+    """
+
+    from src.services.record_archive import (
+        CARDS_PREFIX,
+        archive_available,
+        archive_path,
+    )
+
+    paths = partition_files(start, end, folder)
+    if not set(marks) <= {str(path) for path in paths}:
+        return None
+
+    new_marks = dict(marks)
+    frames = []
+    for path in paths:
+        key = path.name[len(PARTITION_PREFIX) : -len(".csv")]
+        archived = (
+            archive_available()
+            and archive_path(CARDS_PREFIX, key, archive_folder).exists()
+        )
+        mark = marks.get(str(path))
+        if mark is None:
+            if archived:
+                return None
+            frames.append(read_cards_csv(path, columns, start, end, new_marks, where))
+            continue
+        appended = read_appended_csv(mark, columns, start, end, where)
+        if appended is None:
+            return None
+        frame, new_mark = appended
+        if archived and new_mark.offset != mark.offset:
+            return None
+        new_marks[str(path)] = new_mark
+        frames.append(frame)
+
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        df = pd.DataFrame(columns=list(columns or DATABASE_COLUMNS), dtype="string")
+    else:
+        df = pd.concat(frames, ignore_index=True)
+    return df, new_marks
+
+
+def migrate_csv(
+    csv_path: Path | str,
+    folder: Optional[Path] = None,
+    chunksize: int = MIGRATION_CHUNK_ROWS,
+) -> int:
+    """Split an existing ``database.csv`` into month partitions, chunk by chunk.
+
+    The rows are appended, so every imported CSV is recorded in
+    ``migrations.json`` in the folder; importing it again is skipped and
+    returns 0.
+    """
+
+    folder = Path(folder or get_partitions_folder())
+    source = str(Path(csv_path).resolve())
+    marker = folder / MIGRATIONS_FILE
+    try:
+        migrated = json.loads(marker.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        migrated = {}
+    if source in migrated:
+        return 0
+
+    total = 0
+    for chunk in pd.read_csv(
+        csv_path,
+        dtype=str,
+        keep_default_na=False,
+        encoding="utf-8-sig",
+        chunksize=chunksize,
+    ):
+        rows = chunk.to_dict("records")
+        for key, group in _group_by_partition(rows).items():
+            append_cards_to_csv(group, file_path=partition_path(key, folder))
+        total += len(rows)
+
+    migrated[source] = total
+    marker.write_text(json.dumps(migrated, indent=2), encoding="utf-8")
+    return total
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Month-partitioned card storage")
+    parser.add_argument(
+        "--migrate",
+        nargs="?",
+        const="",
+        metavar="CSV",
+        help="split a database.csv (default: data/database.csv)",
+    )
+    parser.add_argument("--folder", help="partition folder (default: data/partitions)")
+    args = parser.parse_args(argv)
+
+    folder = Path(args.folder or get_partitions_folder())
+    if args.migrate is not None:
+        csv_path = args.migrate or get_database_file_path()
+        migrated = migrate_csv(csv_path, folder)
+        if migrated:
+            print(f"Migrated {migrated} rows from {csv_path} into {folder}")
+        else:
+            print(f"{csv_path} was already migrated into {folder}")
+    for path in partition_files(folder=folder):
+        print(path.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""Full-text search over the issue, detail and action text of saved cards.
+
+The index is an SQLite FTS5 table in ``data/search.sqlite3``, next to the
+card store, whichever ``storage_backend`` is used. ``save_record_rows``
+keeps it current: the rows of every saved card replace that card's rows in
+the index. Results are ranked by BM25 (issue text weighs most) damped by
+the age of the row, so a good recent match comes before an equally good
+one from two years ago.
+
+The index is built from the store on first search, or explicitly with::
+
+    python -m src.services.record_search --rebuild
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Mapping, Optional, Sequence
+
+import pandas as pd
+
+from src.services.logging_service import log_warning
+from src.services.record_service import RecordFilter, load_records
+from src.utils.app_config import AppDataConfig
+from src.utils.csvhandle import DATABASE_COLUMNS, get_search_index_path
+
+SEARCH_INDEX_NAME = "search.sqlite3"
+BUSY_TIMEOUT_MS = 10_000
+REBUILD_CHUNK_ROWS = 5_000
+DEFAULT_LIMIT = 500
+# BM25 weights of the indexed columns, in table order
+COLUMN_WEIGHTS = {"issue": 3.0, "detail": 2.0, "action": 1.0}
+# A match this many days old ranks half as high as the same match today
+RECENCY_HALF_LIFE_DAYS = 180
+UNDATED_AGE_DAYS = 3650
+
+_STORED_COLUMNS = (
+    "card_id",
+    "detail_idx",
+    "action_idx",
+    "tanggal",
+    "shift",
+    "lu",
+    "user",
+    *COLUMN_WEIGHTS,
+)
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS search_rows (id INTEGER PRIMARY KEY, "
+    + ", ".join(f"\"{column}\" TEXT NOT NULL DEFAULT ''" for column in _STORED_COLUMNS)
+    + ")",
+    "CREATE INDEX IF NOT EXISTS idx_search_rows_card_id ON search_rows (card_id)",
+    "CREATE TABLE IF NOT EXISTS search_meta (key TEXT PRIMARY KEY, value TEXT)",
+    # External-content FTS table over search_rows, kept in sync by triggers
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5("
+    "issue, detail, action, content='search_rows', content_rowid='id',"
+    " tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS search_rows_ai AFTER INSERT ON search_rows BEGIN"
+    " INSERT INTO search_fts (rowid, issue, detail, action)"
+    " VALUES (new.id, new.issue, new.detail, new.action); END",
+    "CREATE TRIGGER IF NOT EXISTS search_rows_ad AFTER DELETE ON search_rows BEGIN"
+    " INSERT INTO search_fts (search_fts, rowid, issue, detail, action)"
+    " VALUES ('delete', old.id, old.issue, old.detail, old.action); END",
+)
+
+
+def _quote(column: str) -> str:
+    if column not in _STORED_COLUMNS:
+        raise ValueError(f"Unknown search column '{column}'")
+    return f'"{column}"'
+
+
+class SearchUnavailableError(RuntimeError):
+    """Raised when the SQLite library was built without FTS5."""
+
+
+def fts_query(text: str) -> Optional[str]:
+    """FTS5 query for free text: every word must match, as a word prefix.
+
+    Words are quoted, so FTS5 operators typed by the user are plain text.
+    Returns None when ``text`` has no words.
+    """
+
+    words = re.findall(r"\w+", text.lower())
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+class SearchIndex:
+    """FTS5 index of saved card rows, one SQLite file (WAL journal)."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with closing(self._connect()) as conn, conn:
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+        except sqlite3.OperationalError as exc:
+            if "fts5" in str(exc):
+                raise SearchUnavailableError(
+                    "The SQLite library has no FTS5 support"
+                ) from exc
+            raise
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        return conn
+
+    @staticmethod
+    def _values(rows: Iterable[Mapping[str, object]]) -> list[tuple[str, ...]]:
+        return [
+            tuple(
+                "" if row.get(column) is None else str(row.get(column))
+                for column in _STORED_COLUMNS
+            )
+            for row in rows
+        ]
+
+    def _insert(self, conn: sqlite3.Connection, values: list[tuple[str, ...]]) -> None:
+        columns = ", ".join(_quote(column) for column in _STORED_COLUMNS)
+        placeholders = ", ".join("?" for _ in _STORED_COLUMNS)
+        conn.executemany(
+            f"INSERT INTO search_rows ({columns}) VALUES ({placeholders})", values
+        )
+
+    def index_rows(self, rows: Iterable[Mapping[str, object]]) -> int:
+        """Replace the indexed rows of every card in ``rows``; one transaction."""
+
+        values = self._values(rows)
+        if not values:
+            return 0
+        card_ids = sorted({value[0] for value in values})
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "DELETE FROM search_rows WHERE card_id IN"
+                f" ({', '.join('?' for _ in card_ids)})",
+                card_ids,
+            )
+            self._insert(conn, values)
+        return len(values)
+
+    def rebuild(self, frames: Iterable[pd.DataFrame]) -> int:
+        """Index the given rows from scratch and mark the index as built."""
+
+        total = 0
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM search_rows")
+            conn.execute("INSERT INTO search_fts (search_fts) VALUES ('delete-all')")
+            for frame in frames:
+                values = self._values(frame.to_dict("records"))
+                self._insert(conn, values)
+                total += len(values)
+            conn.execute("INSERT INTO search_fts (search_fts) VALUES ('optimize')")
+            conn.execute(
+                "INSERT OR REPLACE INTO search_meta (key, value) VALUES ('built', ?)",
+                (date.today().isoformat(),),
+            )
+        return total
+
+    def is_built(self) -> bool:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT value FROM search_meta WHERE key = 'built'"
+            ).fetchone()
+        return row is not None
+
+    def count(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM search_rows").fetchone()[0]
+
+    def search(
+        self,
+        text: str,
+        columns: Sequence[str] = _STORED_COLUMNS,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        where: Optional[RecordFilter] = None,
+        limit: int = DEFAULT_LIMIT,
+        today: Optional[date] = None,
+    ) -> pd.DataFrame:
+        """Best ``limit`` rows matching ``text``, best first.
+
+        The rank is the BM25 score divided by ``1 + age / half-life``, where
+        the age is the number of days between ``tanggal`` and ``today``.
+        """
+
+        selected = [column for column in columns if column in _STORED_COLUMNS]
+        query = fts_query(text)
+        if query is None:
+            return pd.DataFrame(columns=selected, dtype="string")
+
+        clauses = ["search_fts MATCH ?"]
+        params: list[object] = [query]
+        if start is not None or end is not None:
+            clauses.append("r.tanggal <> ''")
+        if start is not None:
+            clauses.append("r.tanggal >= ?")
+            params.append(start.isoformat())
+        if end is not None:
+            clauses.append("r.tanggal <= ?")
+            params.append(end.isoformat())
+        for column, allowed in (where.equals() if where else {}).items():
+            clauses.append(f"r.{_quote(column)} IN ({', '.join('?' for _ in allowed)})")
+            params.extend(allowed)
+
+        weights = ", ".join(str(weight) for weight in COLUMN_WEIGHTS.values())
+        age = "coalesce(julianday(?) - julianday(nullif(r.tanggal, '')), ?)"
+        sql = (
+            f"SELECT {', '.join(f'r.{_quote(column)}' for column in selected)}"
+            " FROM search_fts JOIN search_rows AS r ON r.id = search_fts.rowid"
+            f" WHERE {' AND '.join(clauses)}"
+            f" ORDER BY bm25(search_fts, {weights})"
+            f" / (1.0 + max(0.0, {age}) / ?), r.id DESC LIMIT ?"
+        )
+        params += [
+            (today or date.today()).isoformat(),
+            UNDATED_AGE_DAYS,
+            RECENCY_HALF_LIFE_DAYS,
+            limit,
+        ]
+        with closing(self._connect()) as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return pd.DataFrame.from_records(rows, columns=selected).astype("string")
+
+
+def search_available() -> bool:
+    """True when the SQLite library supports FTS5."""
+
+    try:
+        with closing(sqlite3.connect(":memory:")) as conn:
+            conn.execute("CREATE VIRTUAL TABLE probe USING fts5(text)")
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+_indexes: dict[Path, SearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_search_index(path: Optional[Path | str] = None) -> SearchIndex:
+    """Return the shared index at ``path`` (default ``data/search.sqlite3``)."""
+
+    path = Path(path or get_search_index_path())
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = _indexes[path] = SearchIndex(path)
+        return index
+
+
+def index_saved_rows(
+    rows: Iterable[Mapping[str, object]], path: Optional[Path | str] = None
+) -> None:
+    """Update the index after a save; failures are logged, never raised.
+
+    The save itself already succeeded, and a stale index is fixed by the
+    next save of the card or a rebuild.
+    """
+
+    try:
+        get_search_index(path).index_rows(rows)
+    except (sqlite3.Error, SearchUnavailableError) as exc:
+        log_warning("Gagal memperbarui indeks pencarian", exc)
+
+
+def rebuild_search_index(
+    config: Optional[AppDataConfig] = None, path: Optional[Path | str] = None
+) -> int:
+    """Rebuild the index from every row of the configured store."""
+
+    df = load_records(list(DATABASE_COLUMNS), config)
+    frames = (
+        df.iloc[offset : offset + REBUILD_CHUNK_ROWS]
+        for offset in range(0, len(df), REBUILD_CHUNK_ROWS)
+    )
+    return get_search_index(path).rebuild(frames)
+
+
+def search_records(
+    text: str,
+    columns: Sequence[str],
+    config: Optional[AppDataConfig] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    where: Optional[RecordFilter] = None,
+    limit: int = DEFAULT_LIMIT,
+) -> pd.DataFrame:
+    """Ranked full-text matches; the index is built first if it never was."""
+
+    index = get_search_index()
+    if not index.is_built():
+        rebuild_search_index(config)
+    return index.search(text, columns, start, end, where, limit)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    from src.utils.app_config import read_config
+
+    parser = argparse.ArgumentParser(description="Issue-card full-text search")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="re-index every saved row"
+    )
+    parser.add_argument("query", nargs="*", help="words to search for")
+    args = parser.parse_args(argv)
+
+    config = read_config()
+    if args.rebuild:
+        print(f"Indexed {rebuild_search_index(config)} rows")
+    if args.query:
+        results = search_records(
+            " ".join(args.query), ["tanggal", "shift", "lu", "issue", "action"], config
+        )
+        print(results.head(20).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
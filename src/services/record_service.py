@@ -2,14 +2,33 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from datetime import datetime
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, Iterator, Optional
 
 import pandas as pd
 
-from src.utils.csvhandle import get_database_file_path
+from src.services.logging_service import log_warning
+from src.utils.app_config import AppDataConfig
+from src.utils.csvhandle import (
+    DATABASE_COLUMNS,
+    get_database_file_path,
+    get_revisions_file_path,
+)
+from src.utils.file_lock import FileLock
+
+STORAGE_BACKENDS = ("csv", "sqlite", "partitioned")
+HISTORY_PAGE_ROWS = 500
+# History order: newest tanggal/shift first, most recently saved first
+HISTORY_SORT_COLUMNS = ("tanggal", "shift")
 
 
 @dataclass
@@ -56,13 +75,17 @@ def build_record_rows(
             continue
 
         details = card_data.get("details", []) or [None]
-        for detail in details:
+        for detail_idx, detail in enumerate(details):
             detail_text = (detail or {}).get("detail", "") if detail else ""
             actions = (detail or {}).get("actions", []) or [""]
-            for action in actions:
+            for action_idx, action in enumerate(actions):
                 rows.append(
                     {
                         "card_id": card_data.get("id", ""),
+                        # Position of the row inside its card; together with
+                        # card_id this is the upsert key
+                        "detail_idx": str(detail_idx),
+                        "action_idx": str(action_idx),
                         "lu": lu,
                         "tanggal": tanggal,
                         "shift": shift,
@@ -76,14 +99,934 @@ def build_record_rows(
     return rows
 
 
-def append_cards_to_csv(rows: list[dict[str, str]]) -> Path:
-    file_path = Path(get_database_file_path())
+def read_csv_header(file_path: Path) -> Optional[list[str]]:
+    """Return the header of ``file_path``, or None for a missing/empty file."""
 
-    if file_path.exists():
-        existing_df = pd.read_csv(file_path)
-        combined = pd.concat([existing_df, pd.DataFrame(rows)], ignore_index=True)
-    else:
-        combined = pd.DataFrame(rows)
+    try:
+        with open(file_path, encoding="utf-8-sig", newline="") as handle:
+            return next(csv.reader(handle), None)
+    except FileNotFoundError:
+        return None
+
+
+def _ends_with_newline(file_path: Path) -> bool:
+    with open(file_path, "rb") as handle:
+        handle.seek(-1, os.SEEK_END)
+        return handle.read(1) in (b"\n", b"\r")
+
+
+def _render_csv_rows(
+    rows: list[dict[str, str]], columns: list[str], *, header: bool
+) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(
+        buffer,
+        fieldnames=columns,
+        restval="",
+        extrasaction="ignore",
+        lineterminator=os.linesep,
+    )
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def replace_atomically(file_path: Path, write: Callable[[Path], None]) -> None:
+    """Write a sibling temp file with ``write`` and rename it over ``file_path``."""
+
+    fd, name = tempfile.mkstemp(
+        dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp"
+    )
+    os.close(fd)
+    temp_path = Path(name)
+    try:
+        write(temp_path)
+        # mkstemp creates 0600 files; keep the permissions of the file replaced
+        if file_path.exists():
+            shutil.copymode(file_path, temp_path)
+        else:
+            temp_path.chmod(0o644)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def _append_csv_rows(
+    file_path: Path, rows: list[dict[str, str]], columns: list[str]
+) -> None:
+    text = _render_csv_rows(rows, columns, header=False)
+    if not _ends_with_newline(file_path):
+        text = os.linesep + text
+    # One write of the whole batch, forced to disk before it is acknowledged
+    with open(file_path, "a", encoding="utf-8", newline="") as handle:
+        handle.write(text)
+        handle.flush()
+        os.fsync(handle.fileno())
 
-    combined.to_csv(file_path, index=False, encoding="utf-8-sig")
+
+def _create_cards_csv(
+    file_path: Path, rows: list[dict[str, str]], columns: list[str]
+) -> None:
+    text = _render_csv_rows(rows, columns, header=True)
+    replace_atomically(
+        file_path,
+        lambda temp_path: temp_path.write_text(text, encoding="utf-8-sig", newline=""),
+    )
+
+
+def _rewrite_cards_csv(file_path: Path, rows: list[dict[str, str]]) -> None:
+    """Slow path: rewrite the whole file, merging both column sets."""
+
+    existing_df = pd.read_csv(file_path, dtype=str, keep_default_na=False)
+    combined = pd.concat([existing_df, pd.DataFrame(rows)], ignore_index=True)
+    replace_atomically(
+        file_path,
+        lambda temp_path: combined.to_csv(temp_path, index=False, encoding="utf-8-sig"),
+    )
+
+
+def append_cards_to_csv(
+    rows: list[dict[str, str]], file_path: Optional[Path] = None
+) -> Path:
+    """Append ``rows`` to the card database without rewriting existing rows.
+
+    Only the header line is read to check the schema; rows are written in
+    the file's column order. A new (or empty) file gets the UTF-8 BOM and a
+    header; appends never repeat either. When the file lacks a column the
+    rows carry, it is rewritten once with the merged header.
+
+    The whole operation holds a cross-process lock on the file, and files
+    are only ever created or rewritten through a temp file and rename, so
+    concurrent saves from several dashboards cannot lose rows.
+    ``file_path`` defaults to ``data/database.csv``.
+    """
+
+    file_path = Path(file_path or get_database_file_path())
+    if not rows:
+        return file_path
+
+    with FileLock(file_path):
+        header = read_csv_header(file_path)
+        if not header:
+            columns = list(DATABASE_COLUMNS)
+            columns += [key for key in rows[0] if key not in columns]
+            _create_cards_csv(file_path, rows, columns)
+        elif {key for row in rows for key in row} - set(header):
+            _rewrite_cards_csv(file_path, rows)
+        else:
+            _append_csv_rows(file_path, rows, header)
     return file_path
+
+
+def _stat_signature(file_path: Path) -> tuple[int, int, int]:
+    stat = file_path.stat()
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class CardIdIndex:
+    """card_id set of a CSV database, kept in sync with our own writes.
+
+    The set is rebuilt (reading the whole ``card_id`` column) whenever the
+    file changed behind our back, e.g. a save from another dashboard, so
+    the first save after every external change pays for one column read.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[Path, tuple[tuple[int, int, int], set[str]]] = {}
+
+    def card_ids(self, file_path: Path) -> set[str]:
+        signature = _stat_signature(file_path)
+        entry = self._entries.get(file_path)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        header = read_csv_header(file_path) or []
+        if "card_id" not in header:
+            ids: set[str] = set()
+        else:
+            ids = set(
+                pd.read_csv(
+                    file_path,
+                    usecols=["card_id"],
+                    dtype=str,
+                    keep_default_na=False,
+                    encoding="utf-8-sig",
+                )["card_id"]
+            )
+        self._entries[file_path] = (signature, ids)
+        return ids
+
+    def update(self, file_path: Path, ids: set[str]) -> None:
+        self._entries[file_path] = (_stat_signature(file_path), ids)
+
+
+_card_index = CardIdIndex()
+
+
+def append_revisions(replaced: pd.DataFrame) -> Optional[Path]:
+    """Log replaced rows, one compact JSON line per card version."""
+
+    if replaced.empty:
+        return None
+    replaced_at = datetime.now().isoformat(timespec="seconds")
+    shared = ["card_id", "lu", "tanggal", "shift"]
+    lines = []
+    for card_id, group in replaced.groupby("card_id", sort=False):
+        first = group.iloc[0]
+        entry = {key: str(first.get(key, "")) for key in shared}
+        entry["replaced_at"] = replaced_at
+        entry["rows"] = group.drop(
+            columns=[key for key in shared if key in group.columns]
+        ).to_dict("records")
+        lines.append(json.dumps(entry, ensure_ascii=False))
+
+    path = Path(get_revisions_file_path())
+    with FileLock(path), open(path, "a", encoding="utf-8") as handle:
+        handle.write("\n".join(lines) + "\n")
+    return path
+
+
+def latest_card_versions(rows: list[dict[str, str]]) -> list[dict[str, str]]:
+    """Drop rows superseded by a later version of their card in ``rows``.
+
+    One batch can hold several saves of the same card. A row whose
+    (detail_idx, action_idx) position was already seen for its card starts
+    a new version, which replaces every earlier row of that card. Legacy
+    rows without a position never start a version.
+    """
+
+    versions: dict[str, int] = {}
+    positions: dict[str, set[tuple[str, str]]] = {}
+    tagged: list[tuple[dict[str, str], int]] = []
+    for row in rows:
+        card_id = row.get("card_id", "")
+        position = (row.get("detail_idx", ""), row.get("action_idx", ""))
+        seen = positions.setdefault(card_id, set())
+        if position in seen:
+            versions[card_id] = versions.get(card_id, 0) + 1
+            seen.clear()
+        if position != ("", ""):
+            seen.add(position)
+        tagged.append((row, versions.get(card_id, 0)))
+    if not versions:
+        return rows
+    return [
+        row
+        for row, version in tagged
+        if version == versions.get(row.get("card_id", ""), 0)
+    ]
+
+
+def _merge_card_versions(
+    existing: pd.DataFrame, rows: list[dict[str, str]]
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Return (merged frame, replaced rows); new versions take the old place."""
+
+    new_df = pd.DataFrame(rows).fillna("")
+    card_ids = set(new_df["card_id"])
+    is_replaced = existing["card_id"].isin(card_ids)
+    replaced = existing[is_replaced]
+
+    # Sort key: kept rows stay where they are, a re-saved card goes where its
+    # first old row was, cards not seen before go to the end
+    first_position = (
+        replaced.reset_index().groupby("card_id", sort=False)["index"].min()
+    )
+    kept = existing[~is_replaced].assign(_order=existing.index[~is_replaced])
+    new_df["_order"] = (
+        new_df["card_id"].map(first_position).fillna(len(existing)).astype(float) + 0.5
+    )
+    merged = (
+        pd.concat([kept, new_df], ignore_index=True)
+        .sort_values("_order", kind="stable")
+        .drop(columns="_order")
+        .fillna("")
+        .reset_index(drop=True)
+    )
+    return merged, replaced
+
+
+def upsert_cards_to_csv(
+    rows: list[dict[str, str]],
+    keep_revisions: bool = False,
+    file_path: Optional[Path] = None,
+) -> Path:
+    """Save ``rows``, replacing the rows of cards that were saved before.
+
+    Rows are keyed by card_id plus their detail/action position. Saving
+    cards that are not in the file yet is a plain O(1) append; re-saving a
+    card rewrites the whole file (temp file and rename) with the new version
+    in place of the old one, so frequent re-saves of a large file belong in
+    the ``sqlite`` backend, which updates the card's rows only. With ``keep_revisions`` the replaced rows are
+    logged by :func:`append_revisions`. ``file_path`` defaults to
+    ``data/database.csv``.
+    """
+
+    file_path = Path(file_path or get_database_file_path())
+    rows = latest_card_versions(rows)
+    if not rows:
+        return file_path
+
+    with FileLock(file_path):
+        header = read_csv_header(file_path)
+        batch_ids = {row.get("card_id", "") for row in rows}
+        known_ids = _card_index.card_ids(file_path) if header else set()
+
+        if not header:
+            columns = list(DATABASE_COLUMNS)
+            columns += [key for key in rows[0] if key not in columns]
+            _create_cards_csv(file_path, rows, columns)
+        elif batch_ids & known_ids:
+            existing = pd.read_csv(
+                file_path, dtype=str, keep_default_na=False, encoding="utf-8-sig"
+            )
+            merged, replaced = _merge_card_versions(existing, rows)
+            replace_atomically(
+                file_path,
+                lambda temp_path: merged.to_csv(
+                    temp_path, index=False, encoding="utf-8-sig"
+                ),
+            )
+            if keep_revisions:
+                append_revisions(replaced)
+        elif {key for row in rows for key in row} - set(header):
+            _rewrite_cards_csv(file_path, rows)
+        else:
+            _append_csv_rows(file_path, rows, header)
+
+        _card_index.update(file_path, known_ids | batch_ids)
+    return file_path
+
+
+def remove_cards_from_csv(card_ids: set[str], file_path: Path) -> pd.DataFrame:
+    """Delete every row of ``card_ids`` from a card CSV; return the removed rows.
+
+    The file is only rewritten (temp file and rename) when it holds one of
+    the cards, which the cached card_id set answers without reading rows.
+    """
+
+    file_path = Path(file_path)
+    with FileLock(file_path):
+        if not read_csv_header(file_path):
+            return pd.DataFrame(columns=DATABASE_COLUMNS)
+        known_ids = _card_index.card_ids(file_path)
+        if not card_ids & known_ids:
+            return pd.DataFrame(columns=DATABASE_COLUMNS)
+        existing = pd.read_csv(
+            file_path, dtype=str, keep_default_na=False, encoding="utf-8-sig"
+        )
+        is_removed = existing["card_id"].isin(card_ids)
+        replace_atomically(
+            file_path,
+            lambda temp_path: existing[~is_removed].to_csv(
+                temp_path, index=False, encoding="utf-8-sig"
+            ),
+        )
+        _card_index.update(file_path, known_ids - card_ids)
+    return existing[is_removed]
+
+
+def _storage_backend(config: Optional[AppDataConfig]) -> str:
+    backend = config.storage_backend if config else "csv"
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(
+            f"Unknown storage_backend '{backend}', expected one of {STORAGE_BACKENDS}"
+        )
+    return backend
+
+
+def save_record_rows(
+    rows: list[dict[str, str]], config: Optional[AppDataConfig] = None
+) -> Path:
+    """Persist ``build_record_rows`` output to the configured backend.
+
+    Cards saved before are replaced (upsert on card_id and row position),
+    in the store, in the full-text search index and in the type-ahead
+    suggestions and action recommendations.
+    """
+
+    from src.services.recommendation_index import get_recommendation_index
+    from src.services.suggestion_index import get_suggestion_index
+
+    rows = latest_card_versions(rows)
+    destination = _save_to_backend(rows, config)
+    _update_search_index(rows, destination)
+    get_suggestion_index().add_rows(rows)
+    get_recommendation_index().add_rows(rows)
+    return destination
+
+
+def load_card_indexes_in_background(
+    config: Optional[AppDataConfig] = None,
+) -> threading.Thread:
+    """Fill the type-ahead suggestion and action recommendation indexes.
+
+    Both are built from one read of the store, on a thread so the UI does
+    not wait for it.
+    """
+
+    from src.services.recommendation_index import (
+        LOAD_COLUMNS as RECOMMENDATION_COLUMNS,
+        get_recommendation_index,
+    )
+    from src.services.suggestion_index import (
+        LOAD_COLUMNS as SUGGESTION_COLUMNS,
+        get_suggestion_index,
+    )
+
+    columns = list(dict.fromkeys([*SUGGESTION_COLUMNS, *RECOMMENDATION_COLUMNS]))
+
+    def load() -> None:
+        try:
+            df = load_records(columns, config)
+        except Exception as exc:  # noqa: BLE001 - both indexes are optional
+            log_warning("Gagal memuat saran dan rekomendasi dari riwayat", exc)
+            df = pd.DataFrame(columns=columns)
+        get_suggestion_index().load(df)
+        get_recommendation_index().load(df)
+
+    thread = threading.Thread(target=load, name="card-index-loader", daemon=True)
+    thread.start()
+    return thread
+
+
+def _save_to_backend(
+    rows: list[dict[str, str]], config: Optional[AppDataConfig]
+) -> Path:
+    keep_revisions = bool(config and config.keep_revisions)
+
+    backend = _storage_backend(config)
+    if backend == "sqlite":
+        from src.services.record_store import get_record_store
+
+        store = get_record_store()
+        replaced = store.upsert_rows(rows)
+        if keep_revisions:
+            append_revisions(replaced)
+        return store.path
+    if backend == "partitioned":
+        from src.services.record_partitions import save_partitioned
+
+        return save_partitioned(rows, keep_revisions=keep_revisions)
+    return upsert_cards_to_csv(rows, keep_revisions=keep_revisions)
+
+
+def _update_search_index(rows: list[dict[str, str]], destination: Path) -> None:
+    """Index the saved rows in the search index beside the store."""
+
+    from src.services.record_search import SEARCH_INDEX_NAME, index_saved_rows
+
+    # The CSV, the SQLite file and the partitions folder all sit in data/
+    index_saved_rows(rows, Path(destination).parent / SEARCH_INDEX_NAME)
+
+
+def in_date_range(
+    tanggal: pd.Series, start: Optional[date] = None, end: Optional[date] = None
+) -> pd.Series:
+    """Mask of ISO ``tanggal`` values within the inclusive [start, end] range."""
+
+    mask = pd.Series(True, index=tanggal.index)
+    if start is None and end is None:
+        return mask
+    mask &= tanggal != ""
+    if start is not None:
+        mask &= tanggal >= start.isoformat()
+    if end is not None:
+        mask &= tanggal <= end.isoformat()
+    return mask
+
+
+@dataclass(frozen=True)
+class RecordFilter:
+    """Exact-match filters on saved rows; an empty tuple matches anything.
+
+    Backends apply them while reading (SQL ``WHERE``, Parquet scan filter,
+    per-chunk rejection of CSV rows), so rows that do not match are never
+    kept in memory.
+    """
+
+    lu: tuple[str, ...] = ()
+    shift: tuple[str, ...] = ()
+    user: tuple[str, ...] = ()
+
+    def equals(self) -> dict[str, tuple[str, ...]]:
+        """The active filters as ``{column: allowed values}``."""
+
+        return {
+            column: values
+            for column, values in (
+                ("lu", self.lu),
+                ("shift", self.shift),
+                ("user", self.user),
+            )
+            if values
+        }
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        mask = pd.Series(True, index=df.index)
+        for column, values in self.equals().items():
+            if column in df.columns:
+                mask &= df[column].isin(values)
+            elif "" not in values:
+                mask &= False
+        return mask
+
+
+def _filtering(
+    start: Optional[date], end: Optional[date], where: Optional[RecordFilter]
+) -> bool:
+    return start is not None or end is not None or bool(where and where.equals())
+
+
+def _read_columns(
+    available_columns: list[str],
+    columns: Optional[list[str]],
+    start: Optional[date],
+    end: Optional[date],
+    where: Optional[RecordFilter] = None,
+) -> tuple[list[str], list[str]]:
+    """(columns to return, columns to parse) for a file with that header."""
+
+    usecols = [col for col in columns or [] if col in available_columns]
+    read_columns = list(usecols)
+    if usecols:
+        needed = list(where.equals()) if where else []
+        if start is not None or end is not None:
+            needed.append("tanggal")
+        read_columns.extend(col for col in needed if col not in read_columns)
+    read_columns = [col for col in read_columns if col in available_columns]
+    return usecols, read_columns
+
+
+def _matching_rows(
+    df: pd.DataFrame,
+    start: Optional[date],
+    end: Optional[date],
+    where: Optional[RecordFilter],
+) -> pd.DataFrame:
+    if start is not None or end is not None:
+        tanggal = (
+            df["tanggal"]
+            if "tanggal" in df.columns
+            else pd.Series("", index=df.index, dtype="string")
+        )
+        df = df[in_date_range(tanggal, start, end)]
+    if where is not None:
+        df = df[where.mask(df)]
+    return df
+
+
+CSV_CHUNK_ROWS = 50_000
+
+# Called with (bytes parsed so far, total bytes) while card CSVs are read
+ReadProgress = Callable[[int, int], None]
+
+
+def _parse_card_rows(
+    source,
+    usecols: list[str],
+    read_columns: list[str],
+    start: Optional[date],
+    end: Optional[date],
+    where: Optional[RecordFilter],
+    progress: Optional[Callable[[int], None]] = None,
+    **options,
+) -> tuple[pd.DataFrame, int]:
+    """Parse card rows, dropping non-matching rows chunk by chunk.
+
+    Returns the matching rows restricted to ``usecols`` (all columns when
+    empty) and the number of rows parsed. ``progress`` is called with the
+    bytes of the binary ``source`` consumed after every chunk.
+    """
+
+    options.update(usecols=read_columns or None, na_filter=False)
+    if not _filtering(start, end, where) and progress is None:
+        df = pd.read_csv(source, **options)
+        parsed = len(df)
+    else:
+        frames = []
+        parsed = 0
+        with pd.read_csv(source, chunksize=CSV_CHUNK_ROWS, **options) as reader:
+            for chunk in reader:
+                parsed += len(chunk)
+                frames.append(_matching_rows(chunk, start, end, where))
+                if progress is not None:
+                    progress(source.tell())
+        if frames:
+            df = pd.concat(frames, ignore_index=True)
+        else:
+            df = pd.DataFrame(columns=read_columns, dtype="string")
+    df = df.reset_index(drop=True)
+    if usecols:
+        df = df.reindex(columns=usecols)
+    return df, parsed
+
+
+@dataclass(frozen=True)
+class FileMark:
+    """How far a history load has read a card CSV.
+
+    ``offset`` is always at a line boundary; ``digest`` holds the bytes just
+    before it, so a file rewritten in place is detected even when its
+    identity and size still fit.
+    """
+
+    path: str
+    device: int
+    inode: int
+    offset: int
+    rows: int
+    header: tuple[str, ...]
+    digest: bytes
+
+
+MARK_DIGEST_BYTES = 64
+
+
+def _complete_records_end(data: bytes) -> int:
+    """Offset just past the last complete CSV record in ``data``.
+
+    A newline inside a quoted field (multi-line issue text) or the end of
+    a row still being appended does not end a record.
+    """
+
+    end = data.rfind(b"\n") + 1
+    quotes = data.count(b'"', 0, end)
+    while end and quotes % 2:
+        previous = data.rfind(b"\n", 0, end - 1) + 1
+        quotes -= data.count(b'"', previous, end)
+        end = previous
+    return end
+
+
+def _read_marked_csv(
+    file_path: Path,
+    columns: Optional[list[str]],
+    start: Optional[date],
+    end: Optional[date],
+    marks: dict[str, FileMark],
+    where: Optional[RecordFilter] = None,
+    progress: Optional[ReadProgress] = None,
+) -> pd.DataFrame:
+    """``read_cards_csv`` that also records a :class:`FileMark` in ``marks``.
+
+    The bytes are read once, so the mark matches exactly what was parsed
+    even while another dashboard appends.
+    """
+
+    with open(file_path, "rb") as handle:
+        stat = os.fstat(handle.fileno())
+        data = handle.read()
+    offset = _complete_records_end(data)
+    first_line = data[: data.find(b"\n") + 1].decode("utf-8-sig")
+    header = next(csv.reader(io.StringIO(first_line, newline="")), [])
+    usecols, read_columns = _read_columns(header, columns, start, end, where)
+    if offset:
+        df, parsed = _parse_card_rows(
+            io.BytesIO(data[:offset]),
+            usecols,
+            read_columns,
+            start,
+            end,
+            where,
+            progress and (lambda done: progress(done, offset)),
+            dtype={column: "string" for column in (read_columns or header)},
+            encoding="utf-8-sig",
+        )
+    else:
+        df, parsed = pd.DataFrame(columns=usecols, dtype="string"), 0
+    marks[str(file_path)] = FileMark(
+        path=str(file_path),
+        device=stat.st_dev,
+        inode=stat.st_ino,
+        offset=offset,
+        rows=parsed,
+        header=tuple(header),
+        digest=data[max(0, offset - MARK_DIGEST_BYTES) : offset],
+    )
+    return df
+
+
+def read_cards_csv(
+    file_path: Path | str,
+    columns: Optional[list[str]] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    marks: Optional[dict[str, FileMark]] = None,
+    where: Optional[RecordFilter] = None,
+    progress: Optional[ReadProgress] = None,
+) -> pd.DataFrame:
+    """Read one card CSV as strings, keeping only rows in the date range
+    that match ``where``.
+
+    With ``marks`` the read is recorded for :func:`read_appended_csv`.
+    ``progress`` reports the bytes parsed after every ``CSV_CHUNK_ROWS``.
+    """
+
+    if marks is not None:
+        return _read_marked_csv(
+            Path(file_path), columns, start, end, marks, where, progress
+        )
+
+    available_columns = read_csv_header(Path(file_path)) or []
+    usecols, read_columns = _read_columns(available_columns, columns, start, end, where)
+    options = dict(
+        dtype={column: "string" for column in (read_columns or available_columns)},
+        encoding="utf-8-sig",
+    )
+    if progress is None:
+        df, _ = _parse_card_rows(
+            file_path,
+            usecols,
+            read_columns,
+            start,
+            end,
+            where,
+            memory_map=True,
+            **options,
+        )
+        return df
+    with open(file_path, "rb") as handle:
+        total = os.fstat(handle.fileno()).st_size
+        df, _ = _parse_card_rows(
+            handle,
+            usecols,
+            read_columns,
+            start,
+            end,
+            where,
+            lambda done: progress(done, total),
+            **options,
+        )
+    return df
+
+
+def read_appended_csv(
+    mark: FileMark,
+    columns: Optional[list[str]] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    where: Optional[RecordFilter] = None,
+) -> Optional[tuple[pd.DataFrame, FileMark]]:
+    """Rows appended to ``mark.path`` since it was read, and the new mark.
+
+    Returns None when the file was replaced, truncated or rewritten; the
+    caller then has to reload it in full.
+    """
+
+    if not mark.offset:
+        return None
+    try:
+        handle = open(mark.path, "rb")
+    except FileNotFoundError:
+        return None
+    with handle:
+        stat = os.fstat(handle.fileno())
+        if (stat.st_dev, stat.st_ino) != (mark.device, mark.inode):
+            return None
+        if stat.st_size < mark.offset:
+            return None
+        handle.seek(mark.offset - len(mark.digest))
+        if handle.read(len(mark.digest)) != mark.digest:
+            return None
+        data = handle.read()
+
+    end_of_lines = _complete_records_end(data)
+    if not end_of_lines:
+        return pd.DataFrame(columns=columns or list(mark.header), dtype="string"), mark
+    header = list(mark.header)
+    usecols, read_columns = _read_columns(header, columns, start, end, where)
+    df, parsed = _parse_card_rows(
+        io.BytesIO(data[:end_of_lines]),
+        usecols,
+        read_columns,
+        start,
+        end,
+        where,
+        header=None,
+        names=header,
+        dtype="string",
+        encoding="utf-8",
+    )
+    new_mark = replace(
+        mark,
+        offset=mark.offset + end_of_lines,
+        rows=mark.rows + parsed,
+        digest=(mark.digest + data[:end_of_lines])[-MARK_DIGEST_BYTES:],
+    )
+    return df, new_mark
+
+
+def load_records(
+    columns: Optional[list[str]] = None,
+    config: Optional[AppDataConfig] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    where: Optional[RecordFilter] = None,
+) -> pd.DataFrame:
+    """Load saved rows as strings, restricted to the ``columns`` that exist.
+
+    ``start``/``end`` limit the result to an inclusive ``tanggal`` range;
+    the partitioned backend only opens the months that overlap it. Rows
+    not matching ``where`` are dropped by the backend while reading.
+    """
+
+    backend = _storage_backend(config)
+    if backend == "sqlite":
+        from src.services.record_store import get_record_store
+
+        wanted = list(columns or DATABASE_COLUMNS)
+        return get_record_store().read_frame(
+            [column for column in wanted if column in DATABASE_COLUMNS],
+            start,
+            end,
+            where,
+        )
+    if backend == "partitioned":
+        from src.services.record_partitions import read_partitions
+
+        return read_partitions(columns, start, end, where=where)
+
+    return read_cards_csv(get_database_file_path(), columns, start, end, where=where)
+
+
+def with_sort_columns(columns: Optional[list[str]]) -> Optional[list[str]]:
+    """``columns`` plus the history sort columns (None stays None: all)."""
+
+    if columns is None:
+        return None
+    return [*columns, *(col for col in HISTORY_SORT_COLUMNS if col not in columns)]
+
+
+def sort_newest_first(df: pd.DataFrame) -> pd.DataFrame:
+    """Order rows like the history view: tanggal, shift, then save order, desc."""
+
+    keys = [col for col in HISTORY_SORT_COLUMNS if col in df.columns]
+    # Reversed first so the stable sort puts later saves of a tie first
+    df = df.iloc[::-1]
+    if keys:
+        df = df.sort_values(keys, ascending=False, kind="stable")
+    return df.reset_index(drop=True)
+
+
+def iter_frame_pages(
+    df: pd.DataFrame,
+    columns: Optional[list[str]] = None,
+    page_rows: int = HISTORY_PAGE_ROWS,
+) -> Iterator[pd.DataFrame]:
+    if columns:
+        df = df.reindex(columns=[col for col in columns if col in df.columns])
+    for offset in range(0, len(df), page_rows):
+        yield df.iloc[offset : offset + page_rows]
+
+
+def iter_record_pages(
+    columns: Optional[list[str]] = None,
+    config: Optional[AppDataConfig] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    page_rows: int = HISTORY_PAGE_ROWS,
+    marks: Optional[dict[str, FileMark]] = None,
+    where: Optional[RecordFilter] = None,
+    progress: Optional[ReadProgress] = None,
+) -> Iterator[pd.DataFrame]:
+    """Yield saved rows newest first (see :func:`sort_newest_first`) in pages.
+
+    SQLite streams one indexed query and the partitioned backend reads one
+    month at a time, so the first page costs the same however large the
+    history is; the single CSV file still has to be read and sorted once.
+    CSV files read for the pages are recorded in ``marks`` (see
+    :func:`read_appended_records`); ``progress`` follows the bytes parsed
+    from them (SQLite does not report progress).
+    """
+
+    backend = _storage_backend(config)
+    if backend == "sqlite":
+        from src.services.record_store import get_record_store
+
+        wanted = list(columns or DATABASE_COLUMNS)
+        yield from get_record_store().iter_pages(
+            [column for column in wanted if column in DATABASE_COLUMNS],
+            start,
+            end,
+            page_rows,
+            where,
+        )
+        return
+    if backend == "partitioned":
+        from src.services.record_partitions import iter_partition_pages
+
+        yield from iter_partition_pages(
+            columns, start, end, page_rows, marks=marks, where=where, progress=progress
+        )
+        return
+
+    df = read_cards_csv(
+        get_database_file_path(),
+        with_sort_columns(columns),
+        start,
+        end,
+        marks,
+        where,
+        progress,
+    )
+    yield from iter_frame_pages(sort_newest_first(df), columns, page_rows)
+
+
+def read_appended_records(
+    marks: dict[str, FileMark],
+    columns: Optional[list[str]] = None,
+    config: Optional[AppDataConfig] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    where: Optional[RecordFilter] = None,
+) -> Optional[tuple[pd.DataFrame, dict[str, FileMark]]]:
+    """Rows saved since ``marks`` were recorded by :func:`iter_record_pages`.
+
+    Only the bytes appended after each mark are parsed; rows come back in
+    file order together with the updated marks. Returns None when that is
+    not enough to bring the history up to date: a file was rewritten (a
+    card was edited), truncated or replaced, or the backend is SQLite.
+    """
+
+    backend = _storage_backend(config)
+    if backend == "sqlite":
+        return None
+    if backend == "partitioned":
+        from src.services.record_partitions import read_appended_partitions
+
+        return read_appended_partitions(
+            marks, with_sort_columns(columns), start, end, where=where
+        )
+
+    mark = marks.get(str(get_database_file_path()))
+    if mark is None:
+        return None
+    appended = read_appended_csv(mark, with_sort_columns(columns), start, end, where)
+    if appended is None:
+        return None
+    df, new_mark = appended
+    return df, {**marks, mark.path: new_mark}
+
+
+def count_records(
+    config: Optional[AppDataConfig] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    where: Optional[RecordFilter] = None,
+) -> int:
+    """Number of saved rows matching the filters (for progress reporting)."""
+
+    backend = _storage_backend(config)
+    if backend == "sqlite":
+        from src.services.record_store import get_record_store
+
+        return get_record_store().count(start, end, where)
+    if backend == "partitioned":
+        from src.services.record_partitions import count_partitions
+
+        return count_partitions(start, end, where=where)
+    return len(
+        read_cards_csv(get_database_file_path(), ["tanggal"], start, end, where=where)
+    )
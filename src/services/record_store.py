@@ -0,0 +1,333 @@
+"""SQLite storage backend for issue-card records.
+
+``database.csv`` on a shared drive has to be rewritten or re-read in full by
+every operator. This store keeps the same rows (see ``DATABASE_COLUMNS``) in
+an SQLite database in WAL mode, so one writer and any number of readers do
+not block each other, with indexes for the common history lookups.
+
+Existing CSV history can be migrated with::
+
+    python -m src.services.record_store --migrate [path/to/database.csv]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+from contextlib import closing
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping, Optional, Sequence
+
+import pandas as pd
+
+from src.services.record_service import RecordFilter, latest_card_versions
+from src.utils.csvhandle import (
+    DATABASE_COLUMNS,
+    get_database_file_path,
+    get_sqlite_database_path,
+)
+
+TABLE_NAME = "cards"
+_KEY_COLUMNS = ("card_id", "detail_idx", "action_idx")
+BUSY_TIMEOUT_MS = 10_000
+MIGRATION_CHUNK_ROWS = 5_000
+
+_COLUMN_DEFS = ", ".join(
+    f"\"{column}\" TEXT NOT NULL DEFAULT ''" for column in DATABASE_COLUMNS
+)
+_CREATE_TABLE = (
+    f"CREATE TABLE IF NOT EXISTS {TABLE_NAME}"
+    f" (id INTEGER PRIMARY KEY AUTOINCREMENT, {_COLUMN_DEFS})"
+)
+_INDEXES = (
+    # Upsert key; rows saved before positions were recorded have empty
+    # indexes and are left out of the uniqueness constraint
+    f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{TABLE_NAME}_card_position"
+    f" ON {TABLE_NAME} (card_id, detail_idx, action_idx) WHERE detail_idx <> ''",
+    f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_lu_tanggal_shift"
+    f" ON {TABLE_NAME} (lu, tanggal, shift)",
+    f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_tanggal_shift"
+    f" ON {TABLE_NAME} (tanggal, shift)",
+    f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_user_tanggal"
+    f" ON {TABLE_NAME} (user, tanggal)",
+    f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_card_id ON {TABLE_NAME} (card_id)",
+    f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_saved_at ON {TABLE_NAME} (saved_at)",
+)
+# CSV files already imported by ``migrate_csv``
+_CREATE_MIGRATIONS = (
+    "CREATE TABLE IF NOT EXISTS migrations"
+    " (source TEXT PRIMARY KEY, rows INTEGER NOT NULL,"
+    " migrated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+)
+
+
+def _quote(column: str) -> str:
+    if column not in DATABASE_COLUMNS:
+        raise ValueError(f"Unknown record column '{column}'")
+    return f'"{column}"'
+
+
+class SQLiteRecordStore:
+    """Issue-card rows in an indexed SQLite database (WAL journal)."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(_CREATE_TABLE)
+            conn.execute(_CREATE_MIGRATIONS)
+            existing = {
+                row[1] for row in conn.execute(f"PRAGMA table_info({TABLE_NAME})")
+            }
+            for column in DATABASE_COLUMNS:
+                if column not in existing:
+                    conn.execute(
+                        f"ALTER TABLE {TABLE_NAME} ADD COLUMN {_quote(column)}"
+                        " TEXT NOT NULL DEFAULT ''"
+                    )
+            for statement in _INDEXES:
+                conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection per call keeps the store usable from worker threads
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        return conn
+
+    @staticmethod
+    def _values(rows: Iterable[Mapping[str, object]]) -> Iterable[tuple[str, ...]]:
+        for row in rows:
+            yield tuple(
+                "" if row.get(column) is None else str(row.get(column))
+                for column in DATABASE_COLUMNS
+            )
+
+    def insert_rows(self, rows: Iterable[Mapping[str, object]]) -> int:
+        """Insert ``build_record_rows`` output in a single transaction.
+
+        A row whose card position is already stored replaces it.
+        """
+
+        with closing(self._connect()) as conn, conn:
+            return self._insert(conn, rows)
+
+    def _insert(
+        self, conn: sqlite3.Connection, rows: Iterable[Mapping[str, object]]
+    ) -> int:
+        columns = ", ".join(_quote(column) for column in DATABASE_COLUMNS)
+        placeholders = ", ".join("?" for _ in DATABASE_COLUMNS)
+        cursor = conn.executemany(
+            f"INSERT OR REPLACE INTO {TABLE_NAME} ({columns}) VALUES ({placeholders})",
+            self._values(rows),
+        )
+        return cursor.rowcount
+
+    def upsert_rows(self, rows: Iterable[Mapping[str, object]]) -> pd.DataFrame:
+        """Save rows keyed by card_id and position; return the replaced rows.
+
+        Positions that still exist are updated in place (same row id), rows
+        of a re-saved card that are no longer present are deleted. All of it
+        happens in one transaction.
+        """
+
+        values = list(self._values(latest_card_versions(list(rows))))
+        if not values:
+            return pd.DataFrame(columns=DATABASE_COLUMNS)
+        card_index = DATABASE_COLUMNS.index("card_id")
+        card_ids = sorted({value[card_index] for value in values})
+
+        columns = ", ".join(_quote(column) for column in DATABASE_COLUMNS)
+        placeholders = ", ".join("?" for _ in DATABASE_COLUMNS)
+        updates = ", ".join(
+            f"{_quote(column)} = excluded.{_quote(column)}"
+            for column in DATABASE_COLUMNS
+            if column not in _KEY_COLUMNS
+        )
+        id_list = ", ".join("?" for _ in card_ids)
+
+        with closing(self._connect()) as conn, conn:
+            replaced = pd.read_sql_query(
+                f"SELECT id, {columns} FROM {TABLE_NAME}"
+                f" WHERE card_id IN ({id_list}) ORDER BY id",
+                conn,
+                params=card_ids,
+            )
+            new_keys = {
+                tuple(value[DATABASE_COLUMNS.index(key)] for key in _KEY_COLUMNS)
+                for value in values
+            }
+            stale_ids = [
+                int(row_id)
+                for row_id, *key in replaced[["id", *_KEY_COLUMNS]].itertuples(
+                    index=False, name=None
+                )
+                if tuple(key) not in new_keys
+            ]
+            conn.executemany(
+                f"DELETE FROM {TABLE_NAME} WHERE id = ?",
+                [(row_id,) for row_id in stale_ids],
+            )
+            conn.executemany(
+                f"INSERT INTO {TABLE_NAME} ({columns}) VALUES ({placeholders})"
+                f" ON CONFLICT (card_id, detail_idx, action_idx)"
+                f" WHERE detail_idx <> '' DO UPDATE SET {updates}",
+                values,
+            )
+        return replaced.drop(columns="id")
+
+    @staticmethod
+    def _where(
+        start: Optional[date],
+        end: Optional[date],
+        where: Optional[RecordFilter] = None,
+    ) -> tuple[str, list[str]]:
+        clauses: list[str] = []
+        params: list[str] = []
+        if start is not None:
+            clauses.append("tanggal >= ?")
+            params.append(start.isoformat())
+        if end is not None:
+            clauses.append("tanggal <= ?")
+            params.append(end.isoformat())
+        if clauses:
+            clauses.append("tanggal <> ''")
+        for column, values in (where.equals() if where else {}).items():
+            clauses.append(f"{_quote(column)} IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+        return (f" WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def read_frame(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        where: Optional[RecordFilter] = None,
+    ) -> pd.DataFrame:
+        """Return the stored rows (insertion order) as a string DataFrame.
+
+        ``start``/``end`` restrict ``tanggal`` to an inclusive range, which
+        is answered from the ``(tanggal, shift)`` index; ``where`` adds
+        ``IN`` conditions (LU and user filters have their own indexes).
+        """
+
+        selected = list(columns or DATABASE_COLUMNS)
+        clause, params = self._where(start, end, where)
+        query = (
+            f"SELECT {', '.join(_quote(column) for column in selected)}"
+            f" FROM {TABLE_NAME}{clause} ORDER BY id"
+        )
+        with closing(self._connect()) as conn:
+            df = pd.read_sql_query(query, conn, params=params)
+        return df.astype("string")
+
+    def iter_pages(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        page_rows: int = 500,
+        where: Optional[RecordFilter] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Yield rows newest first (tanggal, shift, id descending) in pages.
+
+        One query walks the ``(tanggal, shift)`` index backwards and rows are
+        fetched as pages are consumed, so nothing beyond the pages already
+        taken is read. Consume the iterator in the thread that started it.
+        """
+
+        selected = list(columns or DATABASE_COLUMNS)
+        clause, params = self._where(start, end, where)
+        query = (
+            f"SELECT {', '.join(_quote(column) for column in selected)}"
+            f" FROM {TABLE_NAME}{clause} ORDER BY tanggal DESC, shift DESC, id DESC"
+        )
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(query, params)
+            while rows := cursor.fetchmany(page_rows):
+                yield pd.DataFrame.from_records(rows, columns=selected).astype("string")
+
+    def count(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        where: Optional[RecordFilter] = None,
+    ) -> int:
+        clause, params = self._where(start, end, where)
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                f"SELECT COUNT(*) FROM {TABLE_NAME}{clause}", params
+            ).fetchone()[0]
+
+    def migrate_csv(
+        self, csv_path: Path | str, chunksize: int = MIGRATION_CHUNK_ROWS
+    ) -> int:
+        """Stream an existing ``database.csv`` into the store chunk by chunk.
+
+        The import is one transaction and is recorded in the ``migrations``
+        table; a CSV that was already imported is skipped and 0 is returned.
+        Rows saved before card positions were recorded are not covered by
+        the upsert key, so importing them twice would duplicate them.
+        """
+
+        source = str(Path(csv_path).resolve())
+        with closing(self._connect()) as conn, conn:
+            if conn.execute(
+                "SELECT 1 FROM migrations WHERE source = ?", (source,)
+            ).fetchone():
+                return 0
+            total = 0
+            for chunk in pd.read_csv(
+                csv_path,
+                dtype=str,
+                keep_default_na=False,
+                encoding="utf-8-sig",
+                chunksize=chunksize,
+            ):
+                total += self._insert(conn, chunk.to_dict("records"))
+            conn.execute(
+                "INSERT INTO migrations (source, rows) VALUES (?, ?)", (source, total)
+            )
+            return total
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Issue-card SQLite store")
+    parser.add_argument(
+        "--migrate",
+        nargs="?",
+        const="",
+        metavar="CSV",
+        help="import a database.csv (default: data/database.csv)",
+    )
+    parser.add_argument("--db", help="SQLite file (default: data/database.sqlite3)")
+    args = parser.parse_args(argv)
+
+    store = SQLiteRecordStore(args.db or get_sqlite_database_path())
+    if args.migrate is not None:
+        csv_path = args.migrate or get_database_file_path()
+        migrated = store.migrate_csv(csv_path)
+        if migrated:
+            print(f"Migrated {migrated} rows from {csv_path} into {store.path}")
+        else:
+            print(f"{csv_path} was already migrated into {store.path}")
+    print(f"{store.path}: {store.count()} rows")
+
+
+_store: Optional[SQLiteRecordStore] = None
+
+
+def get_record_store() -> SQLiteRecordStore:
+    """Return the shared store at ``data/database.sqlite3``."""
+
+    global _store
+    path = Path(get_sqlite_database_path())
+    if _store is None or _store.path != path:
+        _store = SQLiteRecordStore(path)
+    return _store
+
+
+if __name__ == "__main__":
+    main()
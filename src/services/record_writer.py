@@ -0,0 +1,158 @@
+"""Write-behind queue for issue-card saves.
+
+``DashboardView.save_data`` hands ``build_record_rows`` batches to a single
+background I/O worker and gets a ``concurrent.futures.Future`` back, so the
+UI is free immediately and can still await the durable acknowledgement.
+The worker drains every batch that queued up while it was busy and writes
+them in one flush per storage target; the CSV backend takes the
+cross-process file lock for that flush (see ``append_cards_to_csv``). A
+card saved again before the flush is only written in its latest version.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from src.services.record_service import save_record_rows
+from src.utils.app_config import AppDataConfig
+
+DEFAULT_CLOSE_TIMEOUT = 30.0
+
+
+@dataclass
+class _Batch:
+    rows: list[dict[str, str]]
+    config: Optional[AppDataConfig]
+    ack: Future = field(default_factory=Future)
+
+    @property
+    def target(self) -> str:
+        return self.config.storage_backend if self.config else "csv"
+
+
+_STOP = object()
+
+
+class RecordWriter:
+    """Single-threaded writer that coalesces queued record batches."""
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="record-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self, rows: list[dict[str, str]], config: Optional[AppDataConfig] = None
+    ) -> Future:
+        """Queue ``rows``; the future resolves to the destination path."""
+
+        batch = _Batch(list(rows), config)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("RecordWriter is closed")
+            self._queue.put(batch)
+        return batch.ack
+
+    def _drain(self, first: _Batch) -> tuple[list[_Batch], bool]:
+        batches = [first]
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return batches, False
+            if item is _STOP:
+                return batches, True
+            batches.append(item)
+
+    @staticmethod
+    def _coalesce(group: list[_Batch]) -> list[dict[str, str]]:
+        """Rows of ``group`` where a later batch replaces a card's earlier rows."""
+
+        later_cards: set[str] = set()
+        kept: list[list[dict[str, str]]] = []
+        for batch in reversed(group):
+            kept.append(
+                [row for row in batch.rows if row.get("card_id", "") not in later_cards]
+            )
+            later_cards.update(row.get("card_id", "") for row in batch.rows)
+        return [row for rows in reversed(kept) for row in rows]
+
+    def _flush(self, batches: list[_Batch]) -> None:
+        groups: dict[str, list[_Batch]] = {}
+        for batch in batches:
+            # Batches cancelled by their submitter before the flush are dropped
+            if batch.ack.set_running_or_notify_cancel():
+                groups.setdefault(batch.target, []).append(batch)
+
+        for group in groups.values():
+            rows = self._coalesce(group)
+            try:
+                destination: Path = save_record_rows(rows, group[0].config)
+            except Exception as exc:  # noqa: BLE001 - reported via futures
+                logging.error(
+                    "RecordWriter: failed to write %d rows: %s", len(rows), exc
+                )
+                for batch in group:
+                    batch.ack.set_exception(exc)
+                continue
+            logging.debug(
+                "RecordWriter: wrote %d rows from %d batches", len(rows), len(group)
+            )
+            for batch in group:
+                batch.ack.set_result(destination)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batches, stop = self._drain(item)
+            self._flush(batches)
+            if stop:
+                return
+
+    def close(self, timeout: Optional[float] = DEFAULT_CLOSE_TIMEOUT) -> None:
+        """Flush everything still queued and stop the worker."""
+
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logging.warning("RecordWriter: pending saves did not finish in time")
+
+
+_writer: Optional[RecordWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_record_writer() -> RecordWriter:
+    """Return the process-wide record writer, starting it on first use."""
+
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = RecordWriter()
+        return _writer
+
+
+def shutdown_record_writer(timeout: Optional[float] = DEFAULT_CLOSE_TIMEOUT) -> None:
+    """Flush pending saves and stop the writer (call on application shutdown)."""
+
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.close(timeout)
@@ -0,0 +1,310 @@
+"""Persistent on-disk cache for raw SPA responses.
+
+Operators often re-query the same LU/date/shift and every request can take
+up to 30 s. Responses are stored under ``cache/spa/`` keyed by the full
+``get_url_period_loss_tree`` URL:
+
+* Entries for a period that is still running expire after a short TTL;
+  periods that have already closed do not change any more and get a very
+  long TTL.
+* Expired entries that carried ``ETag``/``Last-Modified`` are revalidated
+  with a conditional request; a ``304`` reuses the stored body.
+* The total size is bounded; least recently used entries are evicted first.
+  The size is tracked in memory, so the metadata files are only scanned
+  when a store pushes the total over the limit.
+
+The methods do blocking file I/O; coroutines call them through
+``asyncio.to_thread`` so the Tk event loop is not held up by the disk.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Mapping, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from src.utils.app_config import AppDataConfig
+from src.utils.helpers import get_script_folder, is_period_closed
+
+CACHE_DIRNAME = "cache"
+CACHE_SUBDIR = "spa"
+DEFAULT_OPEN_TTL = 120  # seconds, period still running
+DEFAULT_CLOSED_TTL = 30 * 24 * 3600  # seconds, period already closed
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+@dataclass
+class CacheEntry:
+    """Metadata stored next to a cached response body."""
+
+    url: str
+    key: str
+    size: int
+    fetched_at: float
+    expires_at: float
+    accessed_at: float
+    encoding: str = "utf-8"
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) < self.expires_at
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+class CacheWriter:
+    """Collects a response body into a temp file before it is committed."""
+
+    def __init__(self, cache: "SPAResponseCache", url: str):
+        self._cache = cache
+        self.url = url
+        fd, name = tempfile.mkstemp(dir=cache.directory, suffix=".part")
+        self._path = Path(name)
+        self._handle = os.fdopen(fd, "wb")
+        self.size = 0
+
+    def write(self, chunk: bytes) -> None:
+        self._handle.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self, headers: Mapping[str, str], encoding: str) -> CacheEntry:
+        self._handle.close()
+        return self._cache._commit(self.url, self._path, self.size, headers, encoding)
+
+    def discard(self) -> None:
+        self._handle.close()
+        self._path.unlink(missing_ok=True)
+
+
+class SPAResponseCache:
+    """Size-bounded, TTL-aware cache of SPA response bodies on disk."""
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        open_ttl: float = DEFAULT_OPEN_TTL,
+        closed_ttl: float = DEFAULT_CLOSED_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.open_ttl = open_ttl
+        self.closed_ttl = closed_ttl
+        self.max_bytes = max_bytes
+        # Approximate size of all bodies; None until the first store scans it
+        self._total_bytes: Optional[int] = None
+        self._size_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _body_path(self, key: str) -> Path:
+        return self.directory / f"{key}.html"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def ttl_for(self, url: str) -> float:
+        """Short TTL for the running shift, long TTL for closed periods."""
+
+        query = parse_qs(urlsplit(url).query)
+        date_value = (query.get("db_SegmentDateMax") or [""])[0]
+        shift = (query.get("db_ShiftEnd") or [""])[0]
+        if date_value and is_period_closed(date_value, shift):
+            return self.closed_ttl
+        return self.open_ttl
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Return the entry for ``url`` (fresh or stale), if one exists."""
+
+        key = self.make_key(url)
+        try:
+            meta = json.loads(self._meta_path(key).read_text(encoding="utf-8"))
+            entry = CacheEntry(**meta)
+        except (OSError, ValueError, TypeError):
+            return None
+        if entry.url != url or not self._body_path(key).exists():
+            return None
+        return entry
+
+    def read_body(self, entry: CacheEntry) -> bytes:
+        body = self._body_path(entry.key).read_bytes()
+        entry.accessed_at = time.time()
+        self._write_meta(entry)
+        return body
+
+    def read_text(self, entry: CacheEntry) -> str:
+        """Decode a cached body the same way httpx decodes ``response.text``."""
+
+        return self.read_body(entry).decode(entry.encoding, errors="replace")
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CacheEntry]) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def begin(self, url: str) -> CacheWriter:
+        """Start writing a new body for ``url`` chunk by chunk."""
+
+        return CacheWriter(self, url)
+
+    def store(
+        self, url: str, body: bytes, headers: Mapping[str, str], encoding: str
+    ) -> CacheEntry:
+        writer = self.begin(url)
+        writer.write(body)
+        return writer.commit(headers, encoding)
+
+    def mark_revalidated(
+        self, entry: CacheEntry, headers: Mapping[str, str]
+    ) -> CacheEntry:
+        """Extend an entry after the server answered ``304 Not Modified``."""
+
+        now = time.time()
+        entry.fetched_at = now
+        entry.accessed_at = now
+        entry.expires_at = now + self.ttl_for(entry.url)
+        entry.etag = headers.get("ETag") or entry.etag
+        entry.last_modified = headers.get("Last-Modified") or entry.last_modified
+        self._write_meta(entry)
+        return entry
+
+    def _commit(
+        self,
+        url: str,
+        temp_path: Path,
+        size: int,
+        headers: Mapping[str, str],
+        encoding: str,
+    ) -> CacheEntry:
+        now = time.time()
+        key = self.make_key(url)
+        entry = CacheEntry(
+            url=url,
+            key=key,
+            size=size,
+            fetched_at=now,
+            expires_at=now + self.ttl_for(url),
+            accessed_at=now,
+            encoding=encoding,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+        )
+        body_path = self._body_path(key)
+        try:
+            replaced = body_path.stat().st_size
+        except OSError:
+            replaced = 0
+        os.replace(temp_path, body_path)
+        self._write_meta(entry)
+        if self._grow(size - replaced):
+            self.evict()
+        return entry
+
+    def _grow(self, delta: int) -> bool:
+        """Account for a stored body; True when the cache is over its limit."""
+
+        with self._size_lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(entry.size for entry in self._entries())
+            else:
+                self._total_bytes += delta
+            return self._total_bytes > self.max_bytes
+
+    def _write_meta(self, entry: CacheEntry) -> None:
+        # A unique temp name per write: several fetches may update the cache
+        # from worker threads at the same time
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=self.directory,
+            suffix=".json.part",
+            delete=False,
+        ) as handle:
+            handle.write(json.dumps(asdict(entry)))
+        try:
+            os.replace(handle.name, self._meta_path(entry.key))
+        except OSError:
+            Path(handle.name).unlink(missing_ok=True)
+            raise
+
+    def _entries(self) -> list[CacheEntry]:
+        entries = []
+        for meta_path in self.directory.glob("*.json"):
+            try:
+                entries.append(
+                    CacheEntry(**json.loads(meta_path.read_text(encoding="utf-8")))
+                )
+            except (OSError, ValueError, TypeError):
+                meta_path.unlink(missing_ok=True)
+        return entries
+
+    def remove(self, key: str) -> None:
+        self._body_path(key).unlink(missing_ok=True)
+        self._meta_path(key).unlink(missing_ok=True)
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the cache fits ``max_bytes``."""
+
+        entries = sorted(self._entries(), key=lambda entry: entry.accessed_at)
+        total = sum(entry.size for entry in entries)
+        removed = 0
+        while entries and total > self.max_bytes:
+            entry = entries.pop(0)
+            self.remove(entry.key)
+            total -= entry.size
+            removed += 1
+        with self._size_lock:
+            self._total_bytes = total
+        if removed:
+            logging.debug("SPAResponseCache: evicted %d entries", removed)
+        return removed
+
+    def clear(self) -> None:
+        for entry in self._entries():
+            self.remove(entry.key)
+        with self._size_lock:
+            self._total_bytes = 0
+
+
+_cache: Optional[SPAResponseCache] = None
+
+
+def get_response_cache(
+    config: Optional[AppDataConfig] = None,
+) -> Optional[SPAResponseCache]:
+    """Return the shared response cache, or None when caching is disabled."""
+
+    global _cache
+    if config is not None and not config.cache_enabled:
+        return None
+
+    open_ttl = config.cache_ttl_open if config else DEFAULT_OPEN_TTL
+    closed_ttl = config.cache_ttl_closed if config else DEFAULT_CLOSED_TTL
+    max_bytes = config.cache_max_mb * 1024 * 1024 if config else DEFAULT_MAX_BYTES
+    if _cache is None:
+        directory = Path(get_script_folder()) / CACHE_DIRNAME / CACHE_SUBDIR
+        _cache = SPAResponseCache(directory)
+    _cache.open_ttl = open_ttl
+    _cache.closed_ttl = closed_ttl
+    _cache.max_bytes = max_bytes
+    return _cache
@@ -0,0 +1,114 @@
+"""In-memory LRU cache of parsed ``DataSPA`` results.
+
+Even with the raw HTML cached on disk, switching back to a selection that was
+already viewed would still pay for parsing, section splitting and pydantic
+validation. This cache keeps the validated ``DataSPA`` objects of the most
+recent selections so they can be repainted immediately. The keys do not
+name the SPA server, so the cache is emptied whenever the configured URL or
+environment changes.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from src.services.spa_service import DataSPA
+from src.utils.app_config import AppDataConfig
+from src.utils.helpers import is_period_closed
+
+DEFAULT_MAX_ENTRIES = 32
+DEFAULT_OPEN_TTL = 120  # seconds, period still running
+
+# (link_up, functional_location, date, shift)
+DataSPAKey = tuple[str, str, str, str]
+# (environment, url) the cached results were fetched from
+SourceKey = tuple[str, str]
+
+
+@dataclass
+class _Slot:
+    value: DataSPA
+    expires_at: Optional[float]
+
+
+class DataSPACache:
+    """Bounded LRU of validated ``DataSPA`` objects with hit/miss counters.
+
+    Results for periods that are still running expire after ``open_ttl``
+    seconds; closed periods stay until they are evicted by newer entries.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        open_ttl: float = DEFAULT_OPEN_TTL,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.open_ttl = open_ttl
+        self.hits = 0
+        self.misses = 0
+        self._slots: OrderedDict[DataSPAKey, _Slot] = OrderedDict()
+        self._source: Optional[SourceKey] = None
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def get(self, key: DataSPAKey) -> Optional[DataSPA]:
+        slot = self._slots.get(key)
+        if slot is not None and (
+            slot.expires_at is None or time.monotonic() < slot.expires_at
+        ):
+            self._slots.move_to_end(key)
+            self.hits += 1
+            return slot.value
+        if slot is not None:
+            del self._slots[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: DataSPAKey, value: DataSPA) -> None:
+        _, _, date_value, shift = key
+        expires_at = (
+            None
+            if is_period_closed(date_value, shift)
+            else time.monotonic() + self.open_ttl
+        )
+        self._slots[key] = _Slot(value, expires_at)
+        self._slots.move_to_end(key)
+        while len(self._slots) > self.max_entries:
+            self._slots.popitem(last=False)
+
+    def invalidate(self, key: DataSPAKey) -> None:
+        self._slots.pop(key, None)
+
+    def clear(self) -> None:
+        self._slots.clear()
+
+    def use_source(self, config: AppDataConfig) -> None:
+        """Forget every result when ``config`` points at another SPA server."""
+
+        source = (config.environment, config.url)
+        if source != self._source:
+            self._slots.clear()
+            self._source = source
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._slots)}
+
+
+_cache: Optional[DataSPACache] = None
+
+
+def get_data_spa_cache(config: Optional[AppDataConfig] = None) -> DataSPACache:
+    """Return the process-wide ``DataSPA`` cache, valid for ``config``."""
+
+    global _cache
+    if _cache is None:
+        _cache = DataSPACache()
+    if config is not None:
+        _cache.open_ttl = config.cache_ttl_open
+        _cache.use_source(config)
+    return _cache
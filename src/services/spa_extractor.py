@@ -0,0 +1,259 @@
+"""Targeted extraction of the SPA loss-tree table.
+
+``pd.read_html`` builds a DataFrame for every ``<table>`` on the SPA page
+(well over a hundred, mostly one-cell layout tables) only for
+``select_relevant_table`` to keep a single one. This module locates the
+loss-tree table by its structure and converts only that table into a grid.
+
+The grid intentionally mirrors what ``pd.read_html`` produces for the same
+table (nested rows, colspan/rowspan expansion, whitespace handling and
+numeric inference), because ``SPADataProcessor`` addresses cells by position.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, Optional
+
+import pandas as pd
+from lxml import etree, html as lxml_html
+from pandas.io.parsers import TextParser
+
+LOSS_TREE_MIN_ROWS = 20
+LOSS_TREE_HEADER_CLASS = "doctableheader"
+LOSS_TREE_HEADER_LABELS = ("Time range", "Stops", "Downtime")
+SECTION_MARKER = "i"
+
+# Same whitespace collapsing pandas applies to cell text
+_RE_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+# Equivalent of ``HtmlElement.text_content()`` that also works on the plain
+# elements produced by the streaming pull parser
+_text_content = etree.XPath("string()")
+
+
+def _clean_text(text: str) -> str:
+    return _RE_WHITESPACE.sub(" ", text.strip())
+
+
+def _row_cells(tr: etree._Element) -> list[etree._Element]:
+    return [child for child in tr if child.tag in ("td", "th")]
+
+
+def _table_rows(table: etree._Element) -> list[etree._Element]:
+    """Return rows in the order ``pd.read_html`` (lxml flavor) reads them."""
+
+    header = table.xpath(".//thead/tr")
+    body = table.xpath(".//tbody//tr") + table.xpath("./tr")
+    footer = table.xpath(".//tfoot//tr")
+    return header + body + footer
+
+
+def is_loss_tree_header(tr: etree._Element) -> bool:
+    """Structural fingerprint of the loss-tree header row.
+
+    The header row is made of ``doctableheader`` cells that include the
+    "Time range"/"Stops"/"Downtime" labels and ends with the ``i`` column
+    that ``split_table_into_dict`` uses as section marker.
+    """
+
+    labels = [
+        _clean_text(_text_content(td))
+        for td in _row_cells(tr)
+        if LOSS_TREE_HEADER_CLASS in (td.get("class") or "")
+    ]
+    if not labels or labels[-1] != SECTION_MARKER:
+        return False
+    return all(label in labels for label in LOSS_TREE_HEADER_LABELS)
+
+
+def _row_count_exceeds(table: etree._Element, limit: int) -> bool:
+    for count, _ in enumerate(table.iter("tr"), start=1):
+        if count > limit:
+            return True
+    return False
+
+
+def _is_nested(table: etree._Element) -> bool:
+    return any(ancestor.tag == "table" for ancestor in table.iterancestors())
+
+
+def find_loss_tree_table(
+    tables: Iterable[etree._Element],
+) -> Optional[etree._Element]:
+    """Pick the loss-tree table out of candidate ``<table>`` elements.
+
+    Nested (layout) tables and tables without the fingerprinted header are
+    skipped. When no table carries the fingerprint, fall back to the legacy
+    rule used by ``select_relevant_table``: the first table with more than
+    ``LOSS_TREE_MIN_ROWS`` rows.
+    """
+
+    fallback: Optional[etree._Element] = None
+    for table in tables:
+        if _is_nested(table):
+            continue
+        if not _row_count_exceeds(table, LOSS_TREE_MIN_ROWS):
+            continue
+        first_row = next(table.iter("tr"), None)
+        if first_row is not None and is_loss_tree_header(first_row):
+            return table
+        if fallback is None:
+            fallback = table
+    return fallback
+
+
+class LossTreeStreamExtractor:
+    """Incrementally locate the loss-tree table while bytes are still arriving.
+
+    Raw response bytes are fed to an lxml pull parser; every completed
+    top-level ``<table>`` is checked against the fingerprint as soon as its
+    end tag is parsed, and tables that do not match are cleared so the
+    document never has to be held in memory in full. :meth:`close` returns
+    the matched table serialized as a compact HTML fragment that
+    :func:`extract_loss_tree` (or a worker process) can turn into a frame.
+    """
+
+    def __init__(self, encoding: Optional[str] = None):
+        self._parser = etree.HTMLPullParser(
+            events=("end",),
+            tag="table",
+            encoding=encoding,
+            remove_comments=True,
+            remove_pis=True,
+        )
+        self._match: Optional[etree._Element] = None
+        self._fallback: Optional[etree._Element] = None
+
+    @property
+    def done(self) -> bool:
+        """True once the fingerprinted table has been fully parsed."""
+
+        return self._match is not None
+
+    def feed(self, chunk: bytes) -> bool:
+        """Parse ``chunk`` and return :attr:`done`."""
+
+        if self.done:
+            return True
+        self._parser.feed(chunk)
+        self._consume_events()
+        return self.done
+
+    def close(self) -> Optional[bytes]:
+        """Finish parsing and return the loss-tree table fragment, if any."""
+
+        if not self.done:
+            self._parser.close()
+            self._consume_events()
+        table = self._match if self._match is not None else self._fallback
+        if table is None:
+            return None
+        return etree.tostring(table, method="html")
+
+    def _consume_events(self) -> None:
+        for _, table in self._parser.read_events():
+            if self.done or _is_nested(table):
+                continue
+            if _row_count_exceeds(table, LOSS_TREE_MIN_ROWS):
+                first_row = next(table.iter("tr"), None)
+                if first_row is not None and is_loss_tree_header(first_row):
+                    self._match = table
+                    continue
+                if self._fallback is None:
+                    self._fallback = table
+                    continue
+            # Not needed any more: drop its subtree to keep memory flat
+            table.clear(keep_tail=True)
+
+
+def _prune_hidden(table: etree._Element) -> None:
+    # Match pd.read_html(displayed_only=True) and never let <style>/<script>
+    # contents leak into cell text.
+    etree.strip_elements(table, "style", "script", with_tail=False)
+    for element in list(table.iter()):
+        style = element.get("style")
+        if style and "display:none" in style.replace(" ", ""):
+            element.drop_tree()
+    for br in table.iter("br"):
+        br.tail = "\n" + (br.tail or "")
+
+
+def extract_table_rows(table: etree._Element) -> list[list[str]]:
+    """Turn ``table`` into a list of text rows with spans expanded."""
+
+    _prune_hidden(table)
+
+    all_texts: list[list[str]] = []
+    remainder: list[tuple[int, str, int]] = []  # (index, text, rows left)
+
+    for tr in _table_rows(table):
+        texts: list[str] = []
+        next_remainder: list[tuple[int, str, int]] = []
+        index = 0
+        for td in _row_cells(tr):
+            while remainder and remainder[0][0] <= index:
+                prev_i, prev_text, prev_rowspan = remainder.pop(0)
+                texts.append(prev_text)
+                if prev_rowspan > 1:
+                    next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+                index += 1
+
+            text = _clean_text(_text_content(td))
+            rowspan = int(td.get("rowspan") or 1)
+            colspan = int(td.get("colspan") or 1)
+            for _ in range(colspan):
+                texts.append(text)
+                if rowspan > 1:
+                    next_remainder.append((index, text, rowspan - 1))
+                index += 1
+
+        for prev_i, prev_text, prev_rowspan in remainder:
+            texts.append(prev_text)
+            if prev_rowspan > 1:
+                next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+
+        all_texts.append(texts)
+        remainder = next_remainder
+
+    while remainder:
+        next_remainder = []
+        texts = []
+        for prev_i, prev_text, prev_rowspan in remainder:
+            texts.append(prev_text)
+            if prev_rowspan > 1:
+                next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+        all_texts.append(texts)
+        remainder = next_remainder
+
+    return all_texts
+
+
+def rows_to_frame(rows: list[list[str]]) -> pd.DataFrame:
+    """Build a DataFrame from text rows with ``pd.read_html``'s type inference."""
+
+    if not rows:
+        return pd.DataFrame()
+    width = max(len(row) for row in rows)
+    padded = [row + [""] * (width - len(row)) for row in rows]
+    with TextParser(
+        padded, header=None, thousands=",", decimal=".", parse_dates=False
+    ) as parser:
+        return parser.read()
+
+
+def extract_loss_tree(html: str | bytes) -> pd.DataFrame:
+    """Return the loss-tree table of an SPA page, or an empty DataFrame."""
+
+    parser = lxml_html.HTMLParser(remove_comments=True, remove_pis=True)
+    root = lxml_html.fromstring(html, parser=parser)
+    table = find_loss_tree_table(root.iter("table"))
+    if table is None:
+        return pd.DataFrame()
+    return rows_to_frame(extract_table_rows(table))
+
+
+def extract_loss_tree_tables(html: str | bytes) -> list[pd.DataFrame]:
+    """List-returning wrapper matching ``fetch_and_process_spa_data``."""
+
+    frame = extract_loss_tree(html)
+    return [] if frame.empty else [frame]
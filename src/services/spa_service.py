@@ -1,16 +1,26 @@
-from pathlib import Path
 import pandas as pd
 import httpx
 import numpy as np
-from typing import Optional, List
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, List
 import asyncio
 import logging
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter, ValidationError
 
 from src.utils.auth import build_ntlm_auth
 from src.utils.constants import HEADERS
 from src.utils.app_config import AppDataConfig
-from src.utils.helpers import get_script_folder
+from src.services.http_client import resolve_verify
+from src.services.parse_executor import (
+    ParseExecutor,
+    get_parse_executor,
+    get_stream_parse_executor,
+)
+from src.services.response_cache import CacheEntry, SPAResponseCache
+from src.services.spa_extractor import (
+    LossTreeStreamExtractor,
+    extract_loss_tree_tables,
+)
 
 
 def get_url_period_loss_tree(
@@ -49,6 +59,46 @@ class LinePerformanceDetail(BaseModel):
     Detail: str = Field(..., description="Detailed description")
     Stops: Optional[str] = Field(None, description="Number of stops")
     Downtime: Optional[str] = Field(None, description="Downtime duration")
+    StopCount: Optional[int] = Field(None, description="Number of stops, parsed")
+    DowntimeSeconds: Optional[float] = Field(
+        None, description="Downtime duration in seconds, parsed"
+    )
+
+
+_LINE_PERFORMANCE_ADAPTER = TypeAdapter(List[LinePerformanceDetail])
+_CLOCK_PATTERN = r"\d+:\d{1,2}(?::\d{1,2})?"
+
+
+def _optional_str(values: pd.Series) -> pd.Series:
+    """``str`` of each value, ``None`` where the value is missing."""
+    return values.astype(object).astype(str).where(values.notna(), None)
+
+
+def parse_stop_counts(values: pd.Series) -> pd.Series:
+    """Parse stop counts into nullable integers (``<NA>`` when not numeric)."""
+    return pd.to_numeric(values, errors="coerce").round().astype("Int64")
+
+
+def parse_downtime_seconds(values: pd.Series) -> pd.Series:
+    """Parse downtime values into seconds (``NaN`` when not parseable).
+
+    SPA reports downtime in minutes ("1.7"); clock values ("HH:MM" or
+    "HH:MM:SS") are accepted as well.
+    """
+    text = values.astype(object).where(values.notna(), "").astype(str).str.strip()
+    seconds = pd.to_numeric(text, errors="coerce").astype("float64") * 60
+
+    clock = text.str.fullmatch(_CLOCK_PATTERN)
+    if clock.any():
+        parts = (
+            text[clock]
+            .str.split(":", expand=True)
+            .apply(pd.to_numeric)
+            .reindex(columns=[0, 1, 2], fill_value=0)
+            .fillna(0)
+        )
+        seconds[clock] = parts[0] * 3600 + parts[1] * 60 + parts[2]
+    return seconds
 
 
 class DataLossesSummary(BaseModel):
@@ -65,6 +115,75 @@ class DataSPA(BaseModel):
     data_losses: DataLossesSummary
     stops_reason: List[LinePerformanceDetail]
 
+    # Column arrays aligned with ``stops_reason``; filled during extraction and
+    # rebuilt from the models on demand otherwise
+    _stop_counts: Optional[np.ndarray] = PrivateAttr(None)
+    _downtime_seconds: Optional[np.ndarray] = PrivateAttr(None)
+
+    @property
+    def stop_counts(self) -> np.ndarray:
+        """Stop count per reason as ``int64`` (0 when not numeric)."""
+        if self._stop_counts is None:
+            self._stop_counts = np.array(
+                [detail.StopCount or 0 for detail in self.stops_reason],
+                dtype=np.int64,
+            )
+        return self._stop_counts
+
+    @property
+    def downtime_seconds(self) -> np.ndarray:
+        """Downtime per reason in seconds as ``float64`` (NaN when missing)."""
+        if self._downtime_seconds is None:
+            self._downtime_seconds = np.array(
+                [
+                    np.nan if detail.DowntimeSeconds is None else detail.DowntimeSeconds
+                    for detail in self.stops_reason
+                ],
+                dtype=np.float64,
+            )
+        return self._downtime_seconds
+
+    def __eq__(self, other: object) -> bool:
+        # The arrays are derived from ``stops_reason``; compare fields only
+        if not isinstance(other, DataSPA):
+            return NotImplemented
+        return (
+            self.data_losses == other.data_losses
+            and self.stops_reason == other.stops_reason
+        )
+
+    def set_reason_arrays(
+        self, stop_counts: np.ndarray, downtime_seconds: np.ndarray
+    ) -> None:
+        if len(stop_counts) != len(self.stops_reason) or len(downtime_seconds) != len(
+            self.stops_reason
+        ):
+            raise ValueError("reason arrays must align with stops_reason")
+        self._stop_counts = stop_counts
+        self._downtime_seconds = downtime_seconds
+
+    def sorted_reasons(
+        self, by: str = "downtime", descending: bool = True
+    ) -> List[LinePerformanceDetail]:
+        """Return ``stops_reason`` ordered by ``"downtime"`` or ``"stops"``.
+
+        Ties keep their original order and missing downtimes go last.
+        """
+        if by == "downtime":
+            values = self.downtime_seconds
+        elif by == "stops":
+            values = self.stop_counts.astype(np.float64)
+        else:
+            raise ValueError(f"Unknown sort key '{by}'")
+        order = np.argsort(-values if descending else values, kind="stable")
+        return [self.stops_reason[index] for index in order]
+
+    def total_stops(self) -> int:
+        return int(self.stop_counts.sum())
+
+    def total_downtime_seconds(self) -> float:
+        return float(np.nansum(self.downtime_seconds))
+
 
 class MaxRetriesExceededError(RuntimeError):
     """Raised when SPA data retrieval fails after configured retries.
@@ -92,12 +211,30 @@ class SPADataProcessor:
         *,
         max_retries: int = 5,
         backoff_factor: float = 1.0,
+        client: Optional[httpx.AsyncClient] = None,
+        parse_executor: Optional[ParseExecutor] = None,
+        stream_parse: Optional[bool] = None,
+        response_cache: Optional[SPAResponseCache] = None,
     ):
         self.url = url
         self.config = config
+        # Optional pooled client (see src.services.http_client); when omitted a
+        # one-shot client is created per fetch.
+        self.client = client
+        self.parse_executor = parse_executor or get_parse_executor(config)
+        # Parse the body incrementally while it downloads (config default)
+        self.stream_parse: bool = (
+            stream_parse
+            if stream_parse is not None
+            else bool(config and config.stream_parse)
+        )
+        # Optional on-disk cache of raw responses (see response_cache.py)
+        self.response_cache = response_cache
         self.list_of_dfs: list[pd.DataFrame] = []
         self.selected_table: pd.DataFrame = pd.DataFrame()
         self.spa_dict: dict[str, pd.DataFrame] = {}
+        # (stop counts, downtime seconds) of the last extracted reasons
+        self.reason_arrays: Optional[tuple[np.ndarray, np.ndarray]] = None
         # Retry configuration (exposed as constructor params)
         self.max_retries: int = max_retries
         # backoff_factor in seconds, delay = backoff_factor * (2 ** (attempt-1))
@@ -106,11 +243,16 @@ class SPADataProcessor:
     async def start(self) -> None:
         """Initialize the processor by fetching and processing data.
 
-        This method will retry fetching when either an exception occurs
-        during fetch or when no relevant table is found (i.e. selected
-        table is empty). Retries use exponential backoff up to
+        A fresh entry in the response cache is used without touching the
+        network. Otherwise this method will retry fetching when either an
+        exception occurs during fetch or when no relevant table is found
+        (i.e. selected table is empty). Retries use exponential backoff up to
         `self.max_retries` attempts.
         """
+        # A fresh cached response needs no network I/O at all
+        if await self._load_from_cache():
+            return
+
         attempt = 0
         last_exception: Optional[Exception] = None
 
@@ -158,28 +300,92 @@ class SPADataProcessor:
         # Exhausted retries: raise a custom error the UI can display
         raise MaxRetriesExceededError(self.url, self.max_retries, last_exception)
 
+    @asynccontextmanager
+    async def _client_session(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the pooled client, or a one-shot client when none was given."""
+        if self.client is not None:
+            # Shared keep-alive pool: reuses TCP/TLS and NTLM-authenticated
+            # connections across fetches and retries.
+            yield self.client
+            return
+
+        async with httpx.AsyncClient(
+            auth=build_ntlm_auth(self.config) if self.config else None,
+            headers=HEADERS,
+            timeout=30,
+            verify=resolve_verify(self.config),
+        ) as client:
+            yield client
+
+    async def _load_from_cache(self) -> bool:
+        """Populate the processor from a fresh cache entry, if there is one."""
+        if self.response_cache is None:
+            return False
+        entry = await asyncio.to_thread(self.response_cache.lookup, self.url)
+        if entry is None or not entry.is_fresh():
+            return False
+
+        try:
+            self.list_of_dfs = await self._parse_cached(entry)
+            self.selected_table = self.select_relevant_table(self.list_of_dfs)
+            if self.selected_table.empty:
+                raise ValueError("cached response has no relevant table")
+            self.spa_dict = self.split_table_into_dict()
+        except Exception as exc:  # noqa: BLE001 - corrupt entry, refetch instead
+            logging.warning("SPADataProcessor: ignoring cached response: %s", exc)
+            await asyncio.to_thread(self.response_cache.remove, entry.key)
+            return False
+
+        logging.debug("SPADataProcessor: served %s from cache", self.url)
+        return True
+
+    async def _parse_cached(self, entry: CacheEntry) -> list[pd.DataFrame]:
+        text = await asyncio.to_thread(self.response_cache.read_text, entry)
+        return await self.parse_executor.run(extract_loss_tree_tables, text)
+
+    async def _revalidated(
+        self, entry: CacheEntry, response: httpx.Response
+    ) -> list[pd.DataFrame]:
+        """Reuse the cached body after a ``304 Not Modified``."""
+        logging.debug("SPADataProcessor: cached response for %s revalidated", entry.url)
+        await asyncio.to_thread(
+            self.response_cache.mark_revalidated, entry, response.headers
+        )
+        return await self._parse_cached(entry)
+
     async def fetch_and_process_spa_data(self, url: str) -> list[pd.DataFrame]:
         """Fetch SPA data from URL and return list of DataFrames."""
-        auth = build_ntlm_auth(self.config) if self.config else None
-
+        # A stale entry with validators turns the request into a conditional one
+        cached = (
+            await asyncio.to_thread(self.response_cache.lookup, url)
+            if self.response_cache
+            else None
+        )
+        headers = SPAResponseCache.conditional_headers(cached)
         try:
-            # Determine TLS verification behaviour based on config
-            verify: bool | str = True
-            if self.config is not None:
-                if not self.config.verify_ssl:
-                    verify = False
-                elif self.config.ca_bundle:
-                    # Resolve path compatible with PyInstaller/runtime
-                    verify = Path(get_script_folder()) / self.config.ca_bundle
-
-            async with httpx.AsyncClient(
-                auth=auth, headers=HEADERS, timeout=30, verify=verify
-            ) as client:
-                response = await client.get(url, follow_redirects=True)
+            async with self._client_session() as client:
+                if self.stream_parse:
+                    return await self._stream_loss_tree(client, url, cached, headers)
+
+                response = await client.get(url, headers=headers, follow_redirects=True)
+                if response.status_code == 304 and cached is not None:
+                    return await self._revalidated(cached, response)
                 response.raise_for_status()
-                from io import StringIO
 
-                list_of_dfs = pd.read_html(StringIO(response.text), encoding="utf-8")
+            # HTML parsing is CPU bound; keep it off the asyncio/Tk loop and
+            # only build the loss-tree table instead of every table on the page
+            list_of_dfs = await self.parse_executor.run(
+                extract_loss_tree_tables, response.text
+            )
+            # Only cache pages that actually contain the loss tree
+            if list_of_dfs and self.response_cache is not None:
+                await asyncio.to_thread(
+                    self.response_cache.store,
+                    url,
+                    response.content,
+                    response.headers,
+                    response.encoding or "utf-8",
+                )
             return list_of_dfs
 
         except httpx.HTTPError as exc:
@@ -195,6 +401,68 @@ class SPADataProcessor:
                 "VPN/proxy settings, and the configured base URL in config.ini."
             ) from exc
 
+    async def _stream_loss_tree(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        cached: Optional[CacheEntry] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> list[pd.DataFrame]:
+        """Locate the loss-tree table while the response body is streaming.
+
+        Raw bytes go straight into an incremental lxml parser, so the body is
+        never decoded into one big string. The parser runs on the
+        single-thread stream executor, off the event loop. Once the table is found the rest of
+        the body is only drained (not parsed) so the connection can go back to
+        the keep-alive pool. The raw bytes are also spooled into the response
+        cache and committed only when the loss tree was found.
+        """
+        async with client.stream(
+            "GET", url, headers=headers, follow_redirects=True
+        ) as response:
+            if response.status_code == 304 and cached is not None:
+                not_modified = response
+            else:
+                not_modified = None
+                response.raise_for_status()
+                encoding = response.charset_encoding or "utf-8"
+                parser_thread = get_stream_parse_executor()
+                extractor = await parser_thread.run(
+                    LossTreeStreamExtractor, encoding=encoding
+                )
+                writer = (
+                    await asyncio.to_thread(self.response_cache.begin, url)
+                    if self.response_cache is not None
+                    else None
+                )
+                try:
+                    async for chunk in response.aiter_bytes():
+                        if writer is not None:
+                            await asyncio.to_thread(writer.write, chunk)
+                        if not extractor.done:
+                            await parser_thread.run(extractor.feed, chunk)
+                    fragment = await parser_thread.run(extractor.close)
+                except BaseException:
+                    # Synchronous, so the temp file also goes on cancellation
+                    if writer is not None:
+                        writer.discard()
+                    raise
+
+        if not_modified is not None:
+            return await self._revalidated(cached, not_modified)
+
+        list_of_dfs = (
+            await self.parse_executor.run(extract_loss_tree_tables, fragment)
+            if fragment is not None
+            else []
+        )
+        if writer is not None:
+            if list_of_dfs:
+                await asyncio.to_thread(writer.commit, response.headers, encoding)
+            else:
+                await asyncio.to_thread(writer.discard)
+        return list_of_dfs
+
     def select_relevant_table(self, list_of_dfs: list[pd.DataFrame]) -> pd.DataFrame:
         """Select the relevant table from list of DataFrames."""
         self.selected_table = next(
@@ -228,6 +496,7 @@ class SPADataProcessor:
 
     async def get_line_performance_details(self) -> List[LinePerformanceDetail]:
         """Extract and validate line performance details."""
+        self.reason_arrays = None
         try:
             # Process the "line_performance_details" dataframe
             line_performance_details = self.spa_dict.get(
@@ -272,22 +541,43 @@ class SPADataProcessor:
                 "Downtime",
             ]
 
-            # Convert DataFrame to list of LinePerformanceDetail
-            details = []
-            for _, row in line_performance_details.iterrows():
-                try:
-                    detail = LinePerformanceDetail(
-                        Line=str(row["Line"]),
-                        Detail=str(row["Detail"]),
-                        Stops=str(row["Stops"]) if pd.notna(row["Stops"]) else None,
-                        Downtime=str(row["Downtime"])
-                        if pd.notna(row["Downtime"])
-                        else None,
-                    )
-                    details.append(detail)
-                except ValidationError:
-                    # Skip invalid rows
-                    continue
+            # Stringify column-wise (object dtype keeps ``str`` of each original
+            # value), parse the numeric forms once and validate the whole batch
+            # in one pydantic call
+            stop_counts = parse_stop_counts(line_performance_details["Stops"])
+            downtime_seconds = parse_downtime_seconds(
+                line_performance_details["Downtime"]
+            )
+            records = pd.DataFrame(
+                {
+                    "Line": line_performance_details["Line"].astype(object).astype(str),
+                    "Detail": line_performance_details["Detail"]
+                    .astype(object)
+                    .astype(str),
+                    "Stops": _optional_str(line_performance_details["Stops"]),
+                    "Downtime": _optional_str(line_performance_details["Downtime"]),
+                    "StopCount": stop_counts.astype(object).where(
+                        stop_counts.notna(), None
+                    ),
+                    "DowntimeSeconds": downtime_seconds.astype(object).where(
+                        downtime_seconds.notna(), None
+                    ),
+                }
+            ).to_dict("records")
+            try:
+                details = _LINE_PERFORMANCE_ADAPTER.validate_python(records)
+                self.reason_arrays = (
+                    stop_counts.fillna(0).to_numpy(dtype=np.int64),
+                    downtime_seconds.to_numpy(dtype=np.float64),
+                )
+            except ValidationError:
+                # Fall back to per-row validation and skip invalid rows
+                details = []
+                for record in records:
+                    try:
+                        details.append(LinePerformanceDetail(**record))
+                    except ValidationError:
+                        continue
 
             return details
         except Exception as e:
@@ -319,7 +609,10 @@ class SPADataProcessor:
         """Get the complete SPA data as a structured model."""
         data_losses = await self.get_data_losses_summary()
         stops_reason = await self.get_line_performance_details()
-        return DataSPA(data_losses=data_losses, stops_reason=stops_reason)
+        data_spa = DataSPA(data_losses=data_losses, stops_reason=stops_reason)
+        if self.reason_arrays is not None:
+            data_spa.set_reason_arrays(*self.reason_arrays)
+        return data_spa
 
 
 def main():
@@ -0,0 +1,224 @@
+"""Type-ahead suggestions for issue, detail and action texts.
+
+Operators type the same stop reasons and corrective actions every shift.
+``SuggestionIndex`` keeps, per LU and per field, the distinct texts saved
+before in a sorted list of normalized keys: the texts starting with a
+prefix are one ``bisect`` range, ranked by how many cards used them. It is
+built once at startup by ``load_card_indexes_in_background`` and updated
+by ``save_record_rows`` on every save; a re-saved card replaces its earlier
+contribution instead of counting twice.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import re
+import threading
+from collections import Counter
+from typing import Iterable, Mapping
+
+import pandas as pd
+
+SUGGESTION_FIELDS = ("issue", "detail", "action")
+DEFAULT_LIMIT = 8
+MIN_PREFIX_CHARS = 1
+# Key of the index over every LU, used to fill up short per-LU lists
+ALL_LUS = ""
+
+# Columns ``load`` needs from ``load_records``
+LOAD_COLUMNS = ["card_id", "detail_idx", "lu", *SUGGESTION_FIELDS]
+_SPACES = re.compile(r"\s+")
+
+# (lu, field, key) -> number of uses, as contributed by one card
+Contribution = Counter
+
+
+def normalize(text: str) -> str:
+    """Lookup key of a text: case-folded, inner whitespace collapsed."""
+
+    return _SPACES.sub(" ", text).strip().casefold()
+
+
+class PrefixIndex:
+    """Distinct texts of one field, sorted for prefix range lookups."""
+
+    def __init__(self) -> None:
+        self._keys: list[str] = []
+        self._counts: dict[str, int] = {}
+        self._texts: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: str, text: str, count: int = 1) -> None:
+        if key not in self._counts:
+            bisect.insort(self._keys, key)
+            self._counts[key] = 0
+        self._counts[key] += count
+        if count > 0:
+            # The latest spelling of a text is the one suggested
+            self._texts[key] = text
+
+    def bulk_load(self, counts: Mapping[str, int], texts: Mapping[str, str]) -> None:
+        """Replace the content; much faster than ``add`` per key."""
+
+        self._keys = sorted(counts)
+        self._counts = dict(counts)
+        self._texts = dict(texts)
+
+    def lookup(self, prefix: str, limit: int = DEFAULT_LIMIT) -> list[tuple[str, int]]:
+        """Most used ``(text, count)`` pairs whose key starts with ``prefix``."""
+
+        low = bisect.bisect_left(self._keys, prefix)
+        high = bisect.bisect_left(self._keys, prefix + "\U0010ffff", low)
+        counts = self._counts
+        best = heapq.nlargest(
+            limit,
+            (key for key in self._keys[low:high] if counts[key] > 0),
+            key=counts.__getitem__,
+        )
+        return [(self._texts[key], counts[key]) for key in best]
+
+
+class SuggestionIndex:
+    """Prefix indexes per ``(lu, field)``; safe to use from several threads."""
+
+    def __init__(self) -> None:
+        self._indexes: dict[tuple[str, str], PrefixIndex] = {}
+        self._cards: dict[str, Contribution] = {}
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._pending: list[list[Mapping[str, object]]] = []
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded.is_set()
+
+    @staticmethod
+    def _contributions(
+        rows: Iterable[Mapping[str, object]],
+    ) -> dict[str, tuple[Contribution, dict[tuple[str, str, str], str]]]:
+        """Per card: how often it uses each text, and the text's spelling.
+
+        The issue counts once per card and a detail once per detail, even
+        though the saved rows repeat them for every action.
+        """
+
+        cards: dict[str, tuple[Contribution, dict, set]] = {}
+        for row in rows:
+            card_id = str(row.get("card_id") or "")
+            lu = str(row.get("lu") or "")
+            uses, texts, seen = cards.setdefault(card_id, (Counter(), {}, set()))
+            for field in SUGGESTION_FIELDS:
+                text = str(row.get(field) or "").strip()
+                key = normalize(text)
+                if not key:
+                    continue
+                if field == "issue":
+                    once = ("issue", key)
+                elif field == "detail":
+                    once = ("detail", str(row.get("detail_idx") or ""), key)
+                else:
+                    once = None
+                if once is not None:
+                    if once in seen:
+                        continue
+                    seen.add(once)
+                for scope in {lu, ALL_LUS}:
+                    uses[(scope, field, key)] += 1
+                    texts[(scope, field, key)] = text
+        return {card: (uses, texts) for card, (uses, texts, _) in cards.items()}
+
+    def _index(self, lu: str, field: str) -> PrefixIndex:
+        index = self._indexes.get((lu, field))
+        if index is None:
+            index = self._indexes[(lu, field)] = PrefixIndex()
+        return index
+
+    def _apply(self, rows: Iterable[Mapping[str, object]]) -> None:
+        for card_id, (uses, texts) in self._contributions(rows).items():
+            previous = self._cards.get(card_id)
+            if previous:
+                for (lu, field, key), count in previous.items():
+                    self._index(lu, field).add(key, "", -count)
+            for (lu, field, key), count in uses.items():
+                self._index(lu, field).add(key, texts[(lu, field, key)], count)
+            if card_id:
+                self._cards[card_id] = uses
+
+    def load(self, df: pd.DataFrame) -> None:
+        """Build every index from saved rows (``load_records`` output).
+
+        Saves that arrive while the rows are being read are applied on top,
+        unless the read already contained their card.
+        """
+
+        contributions = self._contributions(df.to_dict("records"))
+        totals: dict[tuple[str, str], Counter] = {}
+        texts: dict[tuple[str, str], dict[str, str]] = {}
+        for uses, spellings in contributions.values():
+            for (lu, field, key), count in uses.items():
+                totals.setdefault((lu, field), Counter())[key] += count
+                texts.setdefault((lu, field), {})[key] = spellings[(lu, field, key)]
+
+        with self._lock:
+            self._indexes = {}
+            for scope, counts in totals.items():
+                self._index(*scope).bulk_load(counts, texts[scope])
+            self._cards = {
+                card_id: uses for card_id, (uses, _) in contributions.items() if card_id
+            }
+            for rows in self._pending:
+                self._apply(
+                    row for row in rows if str(row.get("card_id")) not in contributions
+                )
+            self._pending = []
+            self._loaded.set()
+
+    def add_rows(self, rows: Iterable[Mapping[str, object]]) -> None:
+        """Count the rows of saved cards, replacing earlier saves of them."""
+
+        rows = list(rows)
+        with self._lock:
+            if not self._loaded.is_set():
+                self._pending.append(rows)
+                return
+            self._apply(rows)
+
+    def suggest(
+        self,
+        field: str,
+        prefix: str,
+        lu: str = ALL_LUS,
+        limit: int = DEFAULT_LIMIT,
+    ) -> list[str]:
+        """Texts of ``field`` starting with ``prefix``, most used first.
+
+        Texts used on ``lu`` come first; other LUs fill up the list.
+        """
+
+        key = normalize(prefix)
+        if len(key) < MIN_PREFIX_CHARS:
+            return []
+        with self._lock:
+            scopes = [lu, ALL_LUS] if lu != ALL_LUS else [ALL_LUS]
+            suggestions: list[str] = []
+            for scope in scopes:
+                index = self._indexes.get((scope, field))
+                if index is None:
+                    continue
+                for text, _ in index.lookup(key, limit):
+                    if text not in suggestions:
+                        suggestions.append(text)
+                if len(suggestions) >= limit:
+                    break
+        # The text typed so far is not worth suggesting
+        return [text for text in suggestions if normalize(text) != key][:limit]
+
+
+_index = SuggestionIndex()
+
+
+def get_suggestion_index() -> SuggestionIndex:
+    return _index
@@ -4,14 +4,19 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Tuple
+from typing import Callable, Iterable, Tuple
+import hashlib
+import logging
 import os
+import threading
 
 from configparser import ConfigParser
 
 from src.utils.helpers import get_script_folder, resource_path
 
 CONFIG_FILENAME = "config.ini"
+# How often the config file is checked for changes when watching it
+CONFIG_POLL_SECONDS = 2.0
 
 
 @dataclass(frozen=True)
@@ -25,6 +30,16 @@ class AppDataConfig:
     url: str
     verify_ssl: bool = True
     ca_bundle: str | None = None
+    parse_executor: str = "thread"
+    parse_workers: int = 2
+    stream_parse: bool = False
+    cache_enabled: bool = True
+    cache_ttl_open: int = 120
+    cache_ttl_closed: int = 2592000
+    cache_max_mb: int = 50
+    storage_backend: str = "csv"
+    keep_revisions: bool = False
+    watch_config: bool = False
 
     @classmethod
     def from_parser(
@@ -48,6 +63,20 @@ class AppDataConfig:
         url = get(section_name, "url", fallback="")
         verify_ssl = parser.getboolean(section_name, "verify_ssl", fallback=True)
         ca_bundle = get(section_name, "ca_bundle", fallback=None) or None
+        parse_executor = get(section_name, "parse_executor", fallback="thread")
+        parse_workers = parser.getint(section_name, "parse_workers", fallback=2)
+        stream_parse = parser.getboolean(section_name, "stream_parse", fallback=False)
+        cache_enabled = parser.getboolean(section_name, "cache_enabled", fallback=True)
+        cache_ttl_open = parser.getint(section_name, "cache_ttl_open", fallback=120)
+        cache_ttl_closed = parser.getint(
+            section_name, "cache_ttl_closed", fallback=2592000
+        )
+        cache_max_mb = parser.getint(section_name, "cache_max_mb", fallback=50)
+        storage_backend = get(section_name, "storage_backend", fallback="csv")
+        keep_revisions = parser.getboolean(
+            section_name, "keep_revisions", fallback=False
+        )
+        watch_config = parser.getboolean(section_name, "watch_config", fallback=False)
 
         link_up = cls._normalize_links(link_up_raw)
 
@@ -59,6 +88,16 @@ class AppDataConfig:
             url=url.strip(),
             verify_ssl=verify_ssl,
             ca_bundle=ca_bundle,
+            parse_executor=parse_executor.strip().lower() or "thread",
+            parse_workers=parse_workers,
+            stream_parse=stream_parse,
+            cache_enabled=cache_enabled,
+            cache_ttl_open=cache_ttl_open,
+            cache_ttl_closed=cache_ttl_closed,
+            cache_max_mb=cache_max_mb,
+            storage_backend=storage_backend.strip().lower() or "csv",
+            keep_revisions=keep_revisions,
+            watch_config=watch_config,
         )
 
     @staticmethod
@@ -66,7 +105,7 @@ class AppDataConfig:
         parts: Iterable[str] = (part.strip() for part in value.split(","))
         return tuple(part for part in parts if part)
 
-    def as_dict(self) -> dict[str, str | Tuple[str, ...]]:
+    def as_dict(self) -> dict[str, str | int | bool | Tuple[str, ...]]:
         """Expose configuration as a dictionary."""
 
         return {
@@ -77,6 +116,16 @@ class AppDataConfig:
             "url": self.url,
             "verify_ssl": self.verify_ssl,
             "ca_bundle": self.ca_bundle,
+            "parse_executor": self.parse_executor,
+            "parse_workers": self.parse_workers,
+            "stream_parse": self.stream_parse,
+            "cache_enabled": self.cache_enabled,
+            "cache_ttl_open": self.cache_ttl_open,
+            "cache_ttl_closed": self.cache_ttl_closed,
+            "cache_max_mb": self.cache_max_mb,
+            "storage_backend": self.storage_backend,
+            "keep_revisions": self.keep_revisions,
+            "watch_config": self.watch_config,
         }
 
 
@@ -102,6 +151,32 @@ def create_config(path: Path | None = None) -> Path:
         # to a PEM file containing your certificate(s).
         "verify_ssl": "False",
         "ca_bundle": "config/ca-bundle.pem",
+        # HTML parsing runs off the UI loop: "thread" or "process" pool with
+        # a bounded number of workers (1-4).
+        "parse_executor": "thread",
+        "parse_workers": "2",
+        # Parse SPA pages incrementally while they download
+        "stream_parse": "False",
+        # On-disk SPA response cache (cache/spa). TTLs are in seconds: short
+        # for the running shift, long for shifts that are already closed.
+        "cache_enabled": "True",
+        "cache_ttl_open": "120",
+        "cache_ttl_closed": "2592000",
+        "cache_max_mb": "50",
+        # Where saved issue cards go: "csv" (data/database.csv), "sqlite"
+        # (data/database.sqlite3, migrate with
+        # `python -m src.services.record_store --migrate`) or "partitioned"
+        # (monthly CSVs in data/partitions, migrate with
+        # `python -m src.services.record_partitions --migrate`). With the CSV
+        # backends, re-saving a card rewrites its whole file; use "sqlite"
+        # when cards are edited and saved again often
+        "storage_backend": "csv",
+        # Re-saving a card replaces its rows; log the replaced version to
+        # data/revisions.jsonl for audit
+        "keep_revisions": "False",
+        # Also poll this file in the background, so open windows pick up
+        # edits before the next fetch reads the configuration
+        "watch_config": "False",
     }
 
     target_path = path or get_config_path()
@@ -112,13 +187,82 @@ def create_config(path: Path | None = None) -> Path:
     return target_path
 
 
+# Written next to a generated bundle: SHA-256 of the certificates it holds
+CA_DIGEST_SUFFIX = ".sha256"
+CA_SOURCE_FILES = (
+    "PMI Sub CA v3.crt",
+    "PMI AWS CA v3.crt",
+    "ots.spappa.aws.private-pmideep.biz.crt",
+)
+
+
+def _ca_source_paths() -> list[Path]:
+    assets_path = Path(resource_path("assets"))
+    return [assets_path / name for name in CA_SOURCE_FILES]
+
+
+def _ca_digest_path(bundle_path: Path) -> Path:
+    return bundle_path.with_name(bundle_path.name + CA_DIGEST_SUFFIX)
+
+
+def ca_sources_digest() -> str | None:
+    """SHA-256 over the source certificates, or None if one is missing."""
+
+    digest = hashlib.sha256()
+    for source in _ca_source_paths():
+        try:
+            digest.update(source.read_bytes())
+        except OSError:
+            return None
+    return digest.hexdigest()
+
+
+def _ca_sources_text() -> str | None:
+    """The bundle ``generate_ca_bundle`` would write, or None if a source is
+    missing."""
+
+    try:
+        return "".join(
+            source.read_text(encoding="utf-8") for source in _ca_source_paths()
+        )
+    except OSError:
+        return None
+
+
+def ca_bundle_outdated(bundle_path: Path) -> bool:
+    """True when the bundle is missing or its source certificates changed.
+
+    The certificates' content is compared, not their mtime: a one-file
+    build extracts ``assets/`` anew, with fresh mtimes, on every start.
+    Bundles written before the digest file existed have none; one whose
+    content equals the certificates is adopted by writing the digest, any
+    other bundle was made by hand and is left alone.
+    """
+
+    if not bundle_path.exists():
+        return True
+    current = ca_sources_digest()
+    digest_path = _ca_digest_path(bundle_path)
+    try:
+        stored = digest_path.read_text(encoding="utf-8").strip()
+    except OSError:
+        try:
+            generated = bundle_path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return False
+        if current is not None and generated == _ca_sources_text():
+            try:
+                digest_path.write_text(current, encoding="utf-8")
+            except OSError:
+                pass  # read-only folder; compared by content again next time
+        return False
+    return current is not None and current != stored
+
+
 def generate_ca_bundle(bundle_path: Path) -> None:
     """Generate the CA bundle file from certificate assets."""
 
-    assets_path = Path(resource_path("assets"))
-    sub_ca_path = assets_path / "PMI Sub CA v3.crt"
-    aws_ca_path = assets_path / "PMI AWS CA v3.crt"
-    spa_ca_path = assets_path / "ots.spappa.aws.private-pmideep.biz.crt"
+    sub_ca_path, aws_ca_path, spa_ca_path = _ca_source_paths()
 
     if not sub_ca_path.exists() or not aws_ca_path.exists() or not spa_ca_path.exists():
         return  # Skip if certificate files are missing
@@ -128,12 +272,16 @@ def generate_ca_bundle(bundle_path: Path) -> None:
         bundle_file.write(sub_ca_path.read_text(encoding="utf-8"))
         bundle_file.write(aws_ca_path.read_text(encoding="utf-8"))
         bundle_file.write(spa_ca_path.read_text(encoding="utf-8"))
+    _ca_digest_path(bundle_path).write_text(ca_sources_digest() or "", encoding="utf-8")
+
 
+def read_config(section: str | None = None, path: Path | None = None) -> AppDataConfig:
+    """Load the application configuration data as an ``AppDataConfig``.
 
-def read_config(section: str | None = None) -> AppDataConfig:
-    """Load the application configuration data as an ``AppDataConfig``."""
+    This always reads the file; use ``get_config`` for the cached value.
+    """
 
-    config_path = get_config_path()
+    config_path = path or get_config_path()
     parser = ConfigParser()
 
     if not config_path.exists():
@@ -142,35 +290,187 @@ def read_config(section: str | None = None) -> AppDataConfig:
     parser.read(config_path, encoding="utf-8")
     cfg = AppDataConfig.from_parser(parser, section=section)
 
-    # Generate CA bundle if configured and missing
+    # Generate the CA bundle if configured and missing or outdated
     if cfg.ca_bundle:
-        ca_path = Path(cfg.ca_bundle)
-
-        # If the configured path is absolute, use it directly.
-        if ca_path.is_absolute():
-            bundle_path = ca_path
-        else:
-            # For relative paths, place the bundle next to the script/exe.
-            # `get_script_folder()` already handles PyInstaller frozen apps.
-            bundle_path = Path(get_script_folder()) / ca_path
-
-            # If creating directories next to the executable fails (e.g.
-            # because the exe lives in a protected location), fall back to
-            # a per-user APPDATA location so we can still generate the
-            # bundle and have a writable path.
-            try:
-                bundle_path.parent.mkdir(parents=True, exist_ok=True)
-            except Exception:
-                appdata_dir = Path(os.getenv("APPDATA") or Path.home())
-                bundle_path = appdata_dir / "SPA-Dashboard" / ca_path
-                bundle_path.parent.mkdir(parents=True, exist_ok=True)
-
-        if not bundle_path.exists():
+        bundle_path = resolve_ca_bundle_path(cfg.ca_bundle)
+        if ca_bundle_outdated(bundle_path):
             generate_ca_bundle(bundle_path)
 
     return cfg
 
 
+def resolve_ca_bundle_path(ca_bundle: str) -> Path:
+    """Return where the configured ``ca_bundle`` lives (or is generated)."""
+
+    ca_path = Path(ca_bundle)
+
+    # If the configured path is absolute, use it directly.
+    if ca_path.is_absolute():
+        return ca_path
+
+    # For relative paths, place the bundle next to the script/exe.
+    # `get_script_folder()` already handles PyInstaller frozen apps.
+    bundle_path = Path(get_script_folder()) / ca_path
+
+    # If creating directories next to the executable fails (e.g.
+    # because the exe lives in a protected location), fall back to
+    # a per-user APPDATA location so we can still generate the
+    # bundle and have a writable path.
+    try:
+        bundle_path.parent.mkdir(parents=True, exist_ok=True)
+    except Exception:
+        appdata_dir = Path(os.getenv("APPDATA") or Path.home())
+        bundle_path = appdata_dir / "SPA-Dashboard" / ca_path
+        bundle_path.parent.mkdir(parents=True, exist_ok=True)
+    return bundle_path
+
+
+ConfigListener = Callable[[AppDataConfig], None]
+
+
+def _file_stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ConfigService:
+    """Process-wide cache of the parsed configuration.
+
+    The file is parsed once per section; later ``get`` calls only ``stat``
+    it and return the cached ``AppDataConfig`` unless its modification time
+    or size changed. ``reload_if_changed`` (called by ``get`` and, with
+    ``watch``, periodically from a thread) re-reads the file on such a
+    change and passes the new default-section config to every subscriber.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self._path = path
+        self._configs: dict[str | None, AppDataConfig] = {}
+        self._stamp: tuple[int, int] | None = None
+        self._listeners: list[ConfigListener] = []
+        self._lock = threading.Lock()
+        self._watcher: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @property
+    def path(self) -> Path:
+        return self._path or get_config_path()
+
+    def get(self, section: str | None = None) -> AppDataConfig:
+        if self._configs:
+            try:
+                self.reload_if_changed()
+            except Exception:  # noqa: BLE001 - keep the last good config
+                logging.exception("ConfigService: reload failed")
+        config = self._configs.get(section)
+        if config is not None:
+            return config
+        with self._lock:
+            config = self._configs.get(section)
+            if config is None:
+                if not self._configs:
+                    # Stamp before reading: an edit during the read reloads
+                    self._stamp = _file_stamp(self.path)
+                config = self._configs[section] = read_config(section, self.path)
+            return config
+
+    def invalidate(self) -> None:
+        """Forget the cached values; the next ``get`` reads the file again."""
+
+        with self._lock:
+            self._configs = {}
+
+    def subscribe(self, listener: ConfigListener) -> Callable[[], None]:
+        """Call ``listener`` with the new config after every reload.
+
+        Listeners run on the thread that noticed the change: the caller of
+        ``get`` or the watcher thread.
+        Returns a function that removes the listener again.
+        """
+
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def reload_if_changed(self) -> bool:
+        """Re-read the file if it changed since it was read; True if it did."""
+
+        stamp = _file_stamp(self.path)
+        with self._lock:
+            if not self._configs or stamp == self._stamp:
+                return False
+            previous = self._configs.get(None)
+            self._stamp = stamp
+            self._configs = {
+                section: read_config(section, self.path) for section in self._configs
+            }
+            current = self._configs.get(None) or read_config(None, self.path)
+            listeners = list(self._listeners)
+        if current == previous:
+            return True
+        for listener in listeners:
+            try:
+                listener(current)
+            except Exception:  # noqa: BLE001 - one listener must not stop others
+                logging.exception("ConfigService: listener failed")
+        return True
+
+    def watch(self, interval: float = CONFIG_POLL_SECONDS) -> None:
+        """Check the file for changes every ``interval`` seconds in a thread."""
+
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop.clear()
+
+        def poll() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.reload_if_changed()
+                except Exception:  # noqa: BLE001 - keep the last good config
+                    logging.exception("ConfigService: reload failed")
+
+        self._watcher = threading.Thread(
+            target=poll, name="config-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+        self._watcher = None
+
+
+_config_service: ConfigService | None = None
+_config_service_lock = threading.Lock()
+
+
+def get_config_service() -> ConfigService:
+    """Return the process-wide :class:`ConfigService`."""
+
+    global _config_service
+    if _config_service is None:
+        with _config_service_lock:
+            if _config_service is None:
+                _config_service = ConfigService()
+    return _config_service
+
+
+def get_config(section: str | None = None) -> AppDataConfig:
+    """Return the cached configuration, re-read when the file changed."""
+
+    return get_config_service().get(section)
+
+
 def get_base_url(section: str | None = None) -> str:
     """Return the configured base URL (convenience wrapper).
 
@@ -178,5 +478,5 @@ def get_base_url(section: str | None = None) -> str:
     single place and always receive a non-null string.
     """
 
-    cfg = read_config(section=section)
+    cfg = get_config(section=section)
     return cfg.url or ""
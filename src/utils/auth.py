@@ -13,12 +13,13 @@ ENV_USERNAME_KEY = "SPA_USERNAME"
 ENV_PASSWORD_KEY = "SPA_PASSWORD"
 
 
-def build_ntlm_auth(config: Optional[AppDataConfig] = None):
-    """Create an NTLM authentication handler from env vars or an AppDataConfig.
+def resolve_credentials(
+    config: Optional[AppDataConfig] = None,
+) -> Optional[tuple[str, str]]:
+    """Return the ``(username, password)`` pair used for SPA requests.
 
     Environment variables take precedence over values provided by ``config``.
-    Returns ``None`` when no credentials are available so callers can fall back
-    to unauthenticated requests (e.g. development HTML snapshots).
+    Returns ``None`` when no complete credential pair is available.
     """
 
     username = os.getenv(ENV_USERNAME_KEY)
@@ -29,6 +30,21 @@ def build_ntlm_auth(config: Optional[AppDataConfig] = None):
         password = password or config.password
 
     if username and password:
-        return HttpNtlmAuth(username, password)
+        return username, password
 
     return None
+
+
+def build_ntlm_auth(config: Optional[AppDataConfig] = None):
+    """Create an NTLM authentication handler from env vars or an AppDataConfig.
+
+    Environment variables take precedence over values provided by ``config``.
+    Returns ``None`` when no credentials are available so callers can fall back
+    to unauthenticated requests (e.g. development HTML snapshots).
+    """
+
+    credentials = resolve_credentials(config)
+    if credentials is None:
+        return None
+
+    return HttpNtlmAuth(*credentials)
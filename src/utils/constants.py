@@ -1,3 +1,11 @@
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/111.0.0.0 Safari/537.36"
 }
+
+# KPI rows of the loss-tree summary, in display order
+SUMMARY_METRICS = ("STOP", "PR", "MTBF", "UPDT", "PDT", "NATR")
+
+# Production day starts at 06:00; shifts are 8 hours each
+DAY_START_HOUR = 6
+SHIFT_HOURS = 8
+SHIFT_START_HOURS = {"1": 6, "2": 14, "3": 22}
@@ -15,6 +15,20 @@ data = [
     ("NATR", "4.0%", "4.0%", "4.0%"),
 ]
 
+DATABASE_COLUMNS = [
+    "card_id",
+    "detail_idx",
+    "action_idx",
+    "lu",
+    "tanggal",
+    "shift",
+    "issue",
+    "detail",
+    "action",
+    "user",
+    "saved_at",
+]
+
 
 def get_targets_file_path(lu, func_location: str = None):
     script_folder = Path(get_script_folder())
@@ -35,6 +49,19 @@ def load_targets_df(filename=None):
     return pd.read_csv(filename)
 
 
+def get_shift_targets(targets_df: pd.DataFrame, shift_column: str) -> dict[str, str]:
+    """Map each metric to its display target for ``shift_column``."""
+
+    if targets_df.empty or shift_column not in targets_df.columns:
+        return {}
+    return {
+        metric: "" if pd.isna(value) else str(value).strip("%")
+        for metric, value in zip(
+            targets_df[targets_df.columns[0]], targets_df[shift_column]
+        )
+    }
+
+
 def get_database_file_path() -> str:
     script_folder = Path(get_script_folder())
     data_folder = script_folder / "data"
@@ -42,23 +69,59 @@ def get_database_file_path() -> str:
 
     filename = data_folder / "database.csv"
     if not filename.exists():
-        pd.DataFrame(
-            columns=[
-                "card_id",
-                "lu",
-                "tanggal",
-                "shift",
-                "issue",
-                "detail",
-                "action",
-                "user",
-                "saved_at",
-            ]
-        ).to_csv(filename, index=False)
+        # BOM so Excel detects UTF-8; appends never write it again
+        pd.DataFrame(columns=DATABASE_COLUMNS).to_csv(
+            filename, index=False, encoding="utf-8-sig"
+        )
 
     return str(filename)
 
 
+def get_sqlite_database_path() -> str:
+    """Path of the SQLite issue-card store (``storage_backend = sqlite``)."""
+    script_folder = Path(get_script_folder())
+    data_folder = script_folder / "data"
+    data_folder.mkdir(parents=True, exist_ok=True)
+
+    return str(data_folder / "database.sqlite3")
+
+
+def get_revisions_file_path() -> str:
+    """Path of the JSON-lines log of replaced issue-card versions."""
+    script_folder = Path(get_script_folder())
+    data_folder = script_folder / "data"
+    data_folder.mkdir(parents=True, exist_ok=True)
+
+    return str(data_folder / "revisions.jsonl")
+
+
+def get_search_index_path() -> str:
+    """Path of the full-text search index over saved issue cards."""
+    script_folder = Path(get_script_folder())
+    data_folder = script_folder / "data"
+    data_folder.mkdir(parents=True, exist_ok=True)
+
+    return str(data_folder / "search.sqlite3")
+
+
+def get_partitions_folder() -> str:
+    """Folder of the month-partitioned card CSVs (``storage_backend = partitioned``)."""
+    script_folder = Path(get_script_folder())
+    partitions_folder = script_folder / "data" / "partitions"
+    partitions_folder.mkdir(parents=True, exist_ok=True)
+
+    return str(partitions_folder)
+
+
+def get_archive_folder() -> str:
+    """Folder of the Parquet archive of closed months (cards and SPA snapshots)."""
+    script_folder = Path(get_script_folder())
+    archive_folder = script_folder / "data" / "archive"
+    archive_folder.mkdir(parents=True, exist_ok=True)
+
+    return str(archive_folder)
+
+
 def get_users_file_path() -> str:
     """Get or create the users CSV file path."""
     script_folder = Path(get_script_folder())
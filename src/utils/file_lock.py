@@ -0,0 +1,80 @@
+"""Cross-process advisory file locks (``msvcrt`` on Windows, ``fcntl`` elsewhere)."""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from types import TracebackType
+from typing import Optional, Type
+
+if os.name == "nt":  # pragma: no cover - exercised on Windows only
+    import msvcrt
+else:
+    import fcntl
+
+DEFAULT_LOCK_TIMEOUT = 30.0
+_POLL_INTERVAL = 0.05
+
+
+class FileLockTimeout(TimeoutError):
+    """Raised when another process holds the lock for too long."""
+
+
+class FileLock:
+    """Exclusive lock on ``<path>.lock``, shared by every process using it.
+
+    The lock is advisory: it only serializes writers that also take it,
+    which is every writer of the issue-card database in this application.
+    """
+
+    def __init__(self, path: Path | str, timeout: float = DEFAULT_LOCK_TIMEOUT):
+        self.lock_path = Path(f"{path}.lock")
+        self.timeout = timeout
+        self._fd: Optional[int] = None
+
+    def _try_lock(self, fd: int) -> bool:
+        try:
+            if os.name == "nt":  # pragma: no cover
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+        return True
+
+    def acquire(self) -> None:
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + self.timeout
+        while not self._try_lock(fd):
+            if time.monotonic() >= deadline:
+                os.close(fd)
+                raise FileLockTimeout(f"Timed out waiting for lock {self.lock_path}")
+            time.sleep(_POLL_INTERVAL)
+        self._fd = fd
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            if os.name == "nt":  # pragma: no cover
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.release()
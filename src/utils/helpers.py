@@ -1,6 +1,9 @@
 import sys
+from datetime import datetime, timedelta
 from pathlib import Path
 
+from src.utils.constants import DAY_START_HOUR, SHIFT_HOURS, SHIFT_START_HOURS
+
 
 def resource_path(relative_path: str) -> str:
     """
@@ -39,3 +42,48 @@ def get_script_folder() -> str:
             return str(Path(sys.executable).parent)
 
     return str(Path(sys.modules["__main__"].__file__).resolve().parent)
+
+
+def get_period_end(date_value: str, shift: str = "") -> datetime | None:
+    """
+    Get the end of an SPA reporting period.
+
+    Args:
+        date_value (str): Production date in ``YYYY-MM-DD`` format.
+        shift (str): Shift number ("1", "2", "3") or empty for the whole day.
+
+    Returns:
+        datetime | None: When the period closes, or None if it cannot be parsed.
+    """
+    try:
+        day = datetime.strptime(date_value.strip(), "%Y-%m-%d")
+    except (AttributeError, ValueError):
+        return None
+
+    shift = (shift or "").strip()
+    if not shift:
+        return day + timedelta(days=1, hours=DAY_START_HOUR)
+    start_hour = SHIFT_START_HOURS.get(shift)
+    if start_hour is None:
+        return None
+    return day + timedelta(hours=start_hour + SHIFT_HOURS)
+
+
+def is_period_closed(
+    date_value: str, shift: str = "", now: datetime | None = None
+) -> bool:
+    """
+    Check whether an SPA reporting period has already ended.
+
+    Args:
+        date_value (str): Production date in ``YYYY-MM-DD`` format.
+        shift (str): Shift number ("1", "2", "3") or empty for the whole day.
+        now (datetime | None): Reference time, defaults to the current time.
+
+    Returns:
+        bool: True when the period is over, False if it is running or unknown.
+    """
+    period_end = get_period_end(date_value, shift)
+    if period_end is None:
+        return False
+    return (now or datetime.now()) >= period_end
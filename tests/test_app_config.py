@@ -0,0 +1,131 @@
+import os
+
+from src.utils import app_config
+from src.utils.app_config import (
+    ConfigService,
+    ca_bundle_outdated,
+    generate_ca_bundle,
+)
+
+
+def _write(path, url, link_up="LU18,LU21"):
+    path.write_text(
+        f"[DEFAULT]\nenvironment = test\nurl = {url}\nlink_up = {link_up}\n",
+        encoding="utf-8",
+    )
+
+
+def _touch_later(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_config_is_cached_until_the_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / "config.ini"
+    _write(path, "https://spa.example/")
+    reads = []
+    read_config = app_config.read_config
+    monkeypatch.setattr(
+        app_config,
+        "read_config",
+        lambda *args: reads.append(args) or read_config(*args),
+    )
+
+    service = ConfigService(path)
+    first = service.get()
+    assert service.get() is first
+    assert first.url == "https://spa.example/"
+    assert first.link_up == ("LU18", "LU21")
+    assert len(reads) == 1
+
+    # The next get notices the edit without a watcher
+    received = []
+    service.subscribe(received.append)
+    _write(path, "https://other.example/")
+    _touch_later(path)
+    assert service.get().url == "https://other.example/"
+    assert [config.url for config in received] == ["https://other.example/"]
+    assert service.get() is service.get()
+    assert len(reads) == 2
+
+
+def test_reload_if_changed_notifies_subscribers(tmp_path):
+    path = tmp_path / "config.ini"
+    _write(path, "https://spa.example/")
+    service = ConfigService(path)
+    service.get()
+    received = []
+    unsubscribe = service.subscribe(received.append)
+
+    assert not service.reload_if_changed()
+
+    _write(path, "https://other.example/")
+    _touch_later(path)
+    assert service.reload_if_changed()
+    assert service.get().url == "https://other.example/"
+    assert [config.url for config in received] == ["https://other.example/"]
+
+    unsubscribe()
+    _write(path, "https://third.example/")
+    _touch_later(path)
+    assert service.reload_if_changed()
+    assert len(received) == 1
+
+
+def test_invalidate_reads_the_file_again(tmp_path):
+    path = tmp_path / "config.ini"
+    _write(path, "https://spa.example/")
+    service = ConfigService(path)
+    service.get()
+
+    _write(path, "https://other.example/", link_up="LU26")
+    service.invalidate()
+
+    assert service.get().link_up == ("LU26",)
+
+
+def test_ca_bundle_is_regenerated_only_when_a_source_changed(tmp_path, monkeypatch):
+    sources = [tmp_path / f"{name}.crt" for name in ("sub", "aws", "spa")]
+    for source in sources:
+        source.write_text(f"cert {source.stem}\n", encoding="utf-8")
+    monkeypatch.setattr(app_config, "_ca_source_paths", lambda: sources)
+    bundle = tmp_path / "ca-bundle.pem"
+
+    assert ca_bundle_outdated(bundle)
+    generate_ca_bundle(bundle)
+    assert bundle.read_text(encoding="utf-8") == "cert sub\ncert aws\ncert spa\n"
+    assert not ca_bundle_outdated(bundle)
+
+    # Re-extracted assets get new mtimes but the same content
+    for source in sources:
+        _touch_later(source)
+    assert not ca_bundle_outdated(bundle)
+
+    sources[1].write_text("cert aws renewed\n", encoding="utf-8")
+    assert ca_bundle_outdated(bundle)
+
+
+def test_ca_bundle_not_generated_here_is_left_alone(tmp_path, monkeypatch):
+    source = tmp_path / "a.crt"
+    source.write_text("cert", encoding="utf-8")
+    monkeypatch.setattr(app_config, "_ca_source_paths", lambda: [source])
+    bundle = tmp_path / "own-bundle.pem"
+    bundle.write_text("my own CA", encoding="utf-8")
+
+    assert not ca_bundle_outdated(bundle)
+
+
+def test_bundle_generated_before_digests_is_adopted(tmp_path, monkeypatch):
+    sources = [tmp_path / f"{name}.crt" for name in ("sub", "aws")]
+    for source in sources:
+        source.write_text(f"cert {source.stem}\n", encoding="utf-8")
+    monkeypatch.setattr(app_config, "_ca_source_paths", lambda: sources)
+    bundle = tmp_path / "ca-bundle.pem"
+    # What generate_ca_bundle wrote before it stored a digest
+    bundle.write_text("cert sub\ncert aws\n", encoding="utf-8")
+
+    assert not ca_bundle_outdated(bundle)
+    assert (tmp_path / "ca-bundle.pem.sha256").exists()
+
+    sources[0].write_text("cert sub renewed\n", encoding="utf-8")
+    assert ca_bundle_outdated(bundle)
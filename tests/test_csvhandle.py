@@ -0,0 +1,14 @@
+import pandas as pd
+
+from src.utils.csvhandle import get_shift_targets
+
+
+def test_shift_targets_are_read_per_shift_column():
+    targets_df = pd.DataFrame(
+        [("STOP", "3", "4", None), ("PR", "65.0%", "69.2%", "77.5%")],
+        columns=["Metrics", "Shift 1", "Shift 2", "Shift 3"],
+    )
+
+    assert get_shift_targets(targets_df, "Shift 2") == {"STOP": "4", "PR": "69.2"}
+    assert get_shift_targets(targets_df, "Shift 3") == {"STOP": "", "PR": "77.5"}
+    assert get_shift_targets(targets_df, "Shift 4") == {}
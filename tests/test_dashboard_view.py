@@ -0,0 +1,25 @@
+import asyncio
+import threading
+
+from src.dashboard_view import threadsafe_listener
+
+
+def test_config_listener_applies_on_the_loop_thread():
+    loop = asyncio.new_event_loop()
+    applied = []
+    done = loop.create_future()
+
+    def apply(config):
+        applied.append((config, threading.get_ident()))
+        done.set_result(None)
+
+    listener = threadsafe_listener(loop, apply)
+    watcher = threading.Thread(target=listener, args=("config",))
+    try:
+        watcher.start()
+        loop.run_until_complete(asyncio.wait_for(done, 5))
+    finally:
+        watcher.join()
+        loop.close()
+
+    assert applied == [("config", threading.get_ident())]
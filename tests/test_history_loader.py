@@ -0,0 +1,67 @@
+import asyncio
+import threading
+
+import pandas as pd
+
+from src.services.history_loader import HistoryLoader, merge_positions
+
+
+def _pages(threads, closed):
+    try:
+        for index in range(3):
+            threads.append(threading.get_ident())
+            yield pd.DataFrame(
+                {"issue": [f"jam {index}", "lain"], "lu": ["LU21", "LU18"]}
+            )
+    finally:
+        threads.append(threading.get_ident())
+        closed.set()
+
+
+def test_loader_reads_on_one_worker_thread_and_filters():
+    threads, closed = [], threading.Event()
+
+    async def run():
+        loader = HistoryLoader(_pages(threads, closed), ["lu", "issue"], query="JAM")
+        chunks = []
+        while (chunk := await loader.next_chunk()) is not None:
+            chunks.append(chunk)
+        loader.close()
+        return chunks
+
+    chunks = asyncio.run(run())
+
+    assert [chunk.rows for chunk in chunks] == [
+        [("LU21", "jam 0")],
+        [("LU21", "jam 1")],
+        [("LU21", "jam 2")],
+    ]
+    assert sum(chunk.read for chunk in chunks) == 6
+    assert closed.wait(1)
+    assert len(set(threads)) == 1
+    assert threads[0] != threading.get_ident()
+
+
+def test_close_stops_an_unfinished_load():
+    threads, closed = [], threading.Event()
+
+    async def run():
+        loader = HistoryLoader(_pages(threads, closed), ["lu", "issue"])
+        first = await loader.next_chunk()
+        loader.close()
+        return first, await loader.next_chunk()
+
+    first, after_close = asyncio.run(run())
+
+    assert len(first.rows) == 2
+    assert after_close is None
+    assert closed.wait(1)
+
+
+def test_merge_positions_puts_new_rows_before_ties():
+    existing = [("2025-11-18", "Shift 2"), ("2025-11-18", "Shift 1"), ("2025-11-17",)]
+    new = [("2025-11-19",), ("2025-11-18", "Shift 1"), ("2025-11-01",)]
+
+    positions = merge_positions(existing, new, key=lambda row: row)
+
+    assert positions == [0, 2, 5]
@@ -0,0 +1,35 @@
+from src.components.history_window import HistoryTail, read_history_tail
+from src.services import record_service
+from src.services.record_service import (
+    RecordFilter,
+    build_record_rows,
+    iter_record_pages,
+    upsert_cards_to_csv,
+)
+
+
+def _card(card_id, lu, issue="Gripper jam"):
+    return build_record_rows(
+        [{"id": card_id, "issue": issue, "details": []}],
+        lu=lu,
+        tanggal="2025-11-18",
+        shift="Shift 1",
+    )
+
+
+def test_refresh_keeps_the_active_filter_and_search(tmp_path, monkeypatch):
+    path = tmp_path / "database.csv"
+    monkeypatch.setattr(record_service, "get_database_file_path", lambda: str(path))
+    upsert_cards_to_csv(_card("a", "LU21"))
+    where = RecordFilter(lu=("LU21",))
+    marks = {}
+    list(iter_record_pages(["card_id"], marks=marks, where=where))
+    tail = HistoryTail(marks, None, None, "gripper", where)
+
+    upsert_cards_to_csv(
+        _card("b", "LU18") + _card("c", "LU21") + _card("d", "LU21", issue="Sealer")
+    )
+    df, marks = read_history_tail(tail)
+
+    assert df[["lu", "issue"]].values.tolist() == [["LU21", "Gripper jam"]]
+    assert read_history_tail(HistoryTail(marks, None, None, "", where))[0].empty
@@ -0,0 +1,118 @@
+import asyncio
+from pathlib import Path
+
+import certifi
+
+from src.services.http_client import (
+    SPAClientManager,
+    clear_ssl_contexts,
+    get_ssl_context,
+    resolve_verify,
+)
+from src.utils.app_config import AppDataConfig
+
+
+def _config(**overrides) -> AppDataConfig:
+    values = dict(
+        environment="production",
+        username="user",
+        password="pass",
+        link_up=("LU18",),
+        url="https://spa.example/db.aspx?",
+        verify_ssl=False,
+    )
+    values.update(overrides)
+    return AppDataConfig(**values)
+
+
+def test_client_is_reused_per_base_url_and_credentials():
+    async def run():
+        manager = SPAClientManager()
+        config = _config()
+        first = manager.get_client("https://spa.example/db.aspx?a=1", config)
+        second = manager.get_client("https://SPA.example/db.aspx?b=2", config)
+        other_host = manager.get_client("http://127.0.0.1:5501/x.html", config)
+        assert first is second
+        assert other_host is not first
+        await manager.aclose()
+        assert first.is_closed and other_host.is_closed
+
+    asyncio.run(run())
+
+
+def test_client_recreated_when_config_changes():
+    async def run():
+        manager = SPAClientManager()
+        first = manager.get_client("https://spa.example/", _config())
+        second = manager.get_client("https://spa.example/", _config(password="new"))
+        assert first is not second
+        await asyncio.sleep(0)  # let the background close run
+        assert first.is_closed
+        assert not second.is_closed
+        await manager.aclose()
+
+    asyncio.run(run())
+
+
+def test_invalidate_replaces_every_client_on_next_use():
+    async def run():
+        manager = SPAClientManager()
+        first = manager.get_client("https://spa.example/", _config())
+        other_host = manager.get_client("http://127.0.0.1:5501/", _config())
+
+        manager.invalidate(_config(url="https://new.example/"))
+        second = manager.get_client("https://spa.example/", _config())
+        assert second is not first
+        await asyncio.sleep(0)  # let the background close run
+        assert first.is_closed and other_host.is_closed
+        await manager.aclose()
+
+    asyncio.run(run())
+
+
+def test_ssl_context_is_built_once_per_bundle():
+    clear_ssl_contexts()
+    bundle = certifi.where()  # any PEM bundle, as an absolute path
+
+    context = resolve_verify(_config(verify_ssl=True, ca_bundle=bundle))
+    assert context is get_ssl_context(bundle)
+    assert resolve_verify(None) is get_ssl_context()
+    assert resolve_verify(None) is not context
+    assert resolve_verify(_config(verify_ssl=False)) is False
+
+    clear_ssl_contexts()
+    assert get_ssl_context(bundle) is not context
+    clear_ssl_contexts()
+
+
+def test_ssl_context_is_rebuilt_when_the_bundle_file_changes(tmp_path):
+    clear_ssl_contexts()
+    bundle = tmp_path / "ca-bundle.pem"
+    pem = Path(certifi.where()).read_bytes()
+    bundle.write_bytes(pem)
+
+    context = get_ssl_context(str(bundle))
+    assert get_ssl_context(str(bundle)) is context
+
+    # Regenerated in place, e.g. after a certificate in assets/ was renewed
+    bundle.write_bytes(pem + b"\n")
+    renewed = get_ssl_context(str(bundle))
+    assert renewed is not context
+    assert get_ssl_context(str(bundle)) is renewed
+    clear_ssl_contexts()
+
+
+def test_clients_share_the_ssl_context():
+    async def run():
+        manager = SPAClientManager()
+        config = _config(verify_ssl=True, ca_bundle=certifi.where())
+        first = manager.get_client("https://spa.example/", config)
+        other_host = manager.get_client("https://other.example/", config)
+        assert first is manager.get_client("https://spa.example/", config)
+        assert other_host is not first
+
+        manager.invalidate()
+        assert manager.get_client("https://spa.example/", config) is not first
+        await manager.aclose()
+
+    asyncio.run(run())
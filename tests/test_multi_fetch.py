@@ -0,0 +1,85 @@
+import asyncio
+
+from src.services import multi_fetch
+from src.services.multi_fetch import SPARequest, fetch_many, gather_bounded
+from src.services.result_cache import DataSPACache
+from src.services.spa_service import DataLossesSummary, DataSPA
+
+
+def _data_spa(stop: str) -> DataSPA:
+    return DataSPA(
+        data_losses=DataLossesSummary(
+            RANGE="", STOP=stop, PR="", MTBF="", UPDT="", PDT="", NATR=""
+        ),
+        stops_reason=[],
+    )
+
+
+def test_gather_bounded_limits_concurrency_and_keeps_partial_results():
+    running = 0
+    peak = 0
+
+    def make_job(delay, fail=False):
+        async def job():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            try:
+                await asyncio.sleep(delay)
+                if fail:
+                    raise RuntimeError("boom")
+                return delay
+            finally:
+                running -= 1
+
+        return job
+
+    jobs = {
+        "a": make_job(0.01),
+        "b": make_job(0.01, fail=True),
+        "c": make_job(1.0),
+        "d": make_job(0.01),
+    }
+    finished = []
+    results = asyncio.run(
+        gather_bounded(
+            jobs,
+            max_concurrency=2,
+            timeout=0.1,
+            on_done=lambda key, value, error: finished.append(key),
+        )
+    )
+
+    assert peak == 2
+    assert results["a"] == (0.01, None)
+    assert results["d"] == (0.01, None)
+    assert isinstance(results["b"][1], RuntimeError)
+    assert isinstance(results["c"][1], asyncio.TimeoutError)
+    assert sorted(finished) == ["a", "b", "c", "d"]
+
+
+def test_fetch_many_uses_result_cache(monkeypatch):
+    cache = DataSPACache()
+    cache.put(("1", "PACK", "2020-01-01", "1"), _data_spa("5"))
+    fetched = []
+
+    async def fake_fetch(url, config=None, *, max_retries=5):
+        fetched.append(url)
+        return _data_spa("7")
+
+    monkeypatch.setattr(multi_fetch, "get_data_spa_cache", lambda config=None: cache)
+    monkeypatch.setattr(multi_fetch, "fetch_data_spa", fake_fetch)
+
+    outcomes = asyncio.run(
+        fetch_many(
+            {
+                "LU1": SPARequest("u1", ("1", "PACK", "2020-01-01", "1")),
+                "LU2": SPARequest("u2", ("2", "PACK", "2020-01-01", "1")),
+            }
+        )
+    )
+
+    assert fetched == ["u2"]
+    assert outcomes["LU1"].data.data_losses.STOP == "5"
+    assert outcomes["LU2"].data.data_losses.STOP == "7"
+    assert cache.get(("2", "PACK", "2020-01-01", "1")) is not None
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.services import parse_executor
+from src.services.parse_executor import (
+    MAX_PARSE_WORKERS,
+    ParseExecutor,
+    get_parse_executor,
+    parse_html_tables,
+)
+from src.services.spa_extractor import extract_loss_tree_tables
+from src.utils.app_config import AppDataConfig
+
+FIXTURE = Path(__file__).resolve().parent.parent / "assets" / "response3.html"
+TABLE_HTML = "<table><tr><th>a</th><th>b</th></tr><tr><td>1</td><td>x</td></tr></table>"
+
+
+@pytest.mark.parametrize(
+    "workers, expected", [(0, 1), (-3, 1), (1, 1), (3, 3), (4, 4), (99, 4)]
+)
+def test_worker_count_is_clamped(workers, expected):
+    assert ParseExecutor("thread", workers).workers == expected
+
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError, match="fiber"):
+        ParseExecutor("fiber")
+
+
+def test_shared_executor_falls_back_to_threads_for_unknown_kind(monkeypatch):
+    monkeypatch.setattr(parse_executor, "_executor", None)
+    config = AppDataConfig(
+        environment="development",
+        username="",
+        password="",
+        link_up=(),
+        url="",
+        parse_executor="fiber",
+        parse_workers=10,
+    )
+
+    executor = get_parse_executor(config)
+    try:
+        assert (executor.kind, executor.workers) == ("thread", MAX_PARSE_WORKERS)
+        assert get_parse_executor(config) is executor
+    finally:
+        parse_executor.shutdown_parse_executor()
+
+
+def test_parse_runs_off_the_loop_with_the_inline_result():
+    html = FIXTURE.read_text(encoding="utf-8")
+    executor = ParseExecutor("thread", 1)
+
+    def parse(text):
+        return threading.get_ident(), extract_loss_tree_tables(text)
+
+    async def run():
+        return threading.get_ident(), await executor.run(parse, html)
+
+    try:
+        loop_thread, (parse_thread, tables) = asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+    assert parse_thread != loop_thread
+    (expected,) = extract_loss_tree_tables(html)
+    (frame,) = tables
+    assert frame.equals(expected)
+
+
+@pytest.mark.parametrize("kind", ["thread", "process"])
+def test_html_tables_parse_like_inline(kind):
+    executor = ParseExecutor(kind, 1)
+    try:
+        tables = asyncio.run(executor.run(parse_html_tables, TABLE_HTML))
+    finally:
+        executor.shutdown()
+
+    (expected,) = parse_html_tables(TABLE_HTML)
+    (frame,) = tables
+    assert frame.equals(expected)
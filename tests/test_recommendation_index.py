@@ -0,0 +1,80 @@
+import pandas as pd
+
+from src.services.recommendation_index import RecommendationIndex
+from src.services.record_service import build_record_rows
+
+
+def _rows(card_id, details, issue="Gripper jam", lu="LU21"):
+    cards = [
+        {
+            "id": card_id,
+            "issue": issue,
+            "details": [
+                {"detail": detail, "actions": list(actions)}
+                for detail, actions in details
+            ],
+        }
+    ]
+    return build_record_rows(
+        cards, username="ops", lu=lu, tanggal="2025-11-18", shift="Shift 1"
+    )
+
+
+def _loaded(*row_lists):
+    index = RecommendationIndex()
+    index.load(pd.DataFrame([row for rows in row_lists for row in rows]))
+    return index
+
+
+def test_recommends_most_frequent_details_with_their_actions():
+    index = _loaded(
+        _rows("c1", [("Sensor dirty", ["clean sensor", "reset"])]),
+        _rows("c2", [("Sensor dirty", ["clean sensor"]), ("Belt slack", ["tension"])]),
+        _rows("c3", [("Belt slack", ["tension"])]),
+        _rows("c4", [("Sensor dirty", ["replace sensor"])]),
+        _rows("c5", [("Pin broken", ["replace pin"])]),
+    )
+
+    assert index.recommend("  gripper JAM", lu="LU21") == [
+        {
+            "detail": "Sensor dirty",
+            "actions": ["clean sensor", "reset", "replace sensor"],
+        },
+        {"detail": "Belt slack", "actions": ["tension"]},
+    ]
+    assert index.recommend("Unknown stop") == []
+
+
+def test_lu_history_comes_first_and_other_lus_fill_in():
+    index = _loaded(
+        _rows("c1", [("Sensor dirty", ["clean"])], lu="LU18"),
+        _rows("c2", [("Belt slack", ["tension"])], lu="LU21"),
+    )
+
+    assert index.recommend("Gripper jam", lu="LU21")[0]["detail"] == "Belt slack"
+    assert index.recommend("Gripper jam", lu="LU18")[0]["detail"] == "Sensor dirty"
+    assert len(index.recommend("Gripper jam", lu="LU99")) == 2
+
+
+def test_saves_update_counts_and_replace_resaved_cards():
+    index = _loaded(_rows("c1", [("Sensor dirty", ["clean"])]))
+
+    index.add_rows(_rows("c1", [("Belt slack", ["tension"])]))
+    assert index.recommend("Gripper jam") == [
+        {"detail": "Belt slack", "actions": ["tension"]}
+    ]
+
+    index.add_rows(_rows("c2", [("Sensor dirty", ["clean"])]))
+    index.add_rows(_rows("c3", [("Sensor dirty", ["clean"])]))
+    assert index.recommend("Gripper jam")[0]["detail"] == "Sensor dirty"
+
+
+def test_saves_before_the_load_are_kept():
+    index = RecommendationIndex()
+    index.add_rows(_rows("c1", [("Sensor dirty", ["clean"])]))
+    assert index.recommend("Gripper jam") == []
+
+    index.load(pd.DataFrame(columns=["card_id", "lu", "issue", "detail", "action"]))
+
+    assert index.loaded
+    assert index.recommend("Gripper jam")[0]["detail"] == "Sensor dirty"
@@ -0,0 +1,104 @@
+from datetime import date
+
+import pytest
+
+from src.services import record_archive
+from src.services.record_partitions import read_partitions, save_partitioned
+from src.services.record_service import build_record_rows
+from src.services.spa_service import DataLossesSummary, DataSPA, LinePerformanceDetail
+
+
+def _rows(card_id, tanggal, lu="LU21", action="a"):
+    cards = [
+        {
+            "id": card_id,
+            "issue": "Issue",
+            "details": [{"detail": "d", "actions": [action]}],
+        }
+    ]
+    return build_record_rows(
+        cards, username="ops", lu=lu, tanggal=tanggal, shift="Shift 1"
+    )
+
+
+def test_partitions_ignore_archive_without_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(record_archive, "archive_available", lambda: False)
+    save_partitioned(_rows("c1", "2025-11-18"), folder=tmp_path)
+
+    assert read_partitions(["card_id"], folder=tmp_path)["card_id"].tolist() == ["c1"]
+
+
+def test_compaction_moves_old_months_and_reads_push_down(tmp_path):
+    pytest.importorskip("pyarrow")
+    partitions, archive = tmp_path / "partitions", tmp_path / "archive"
+    partitions.mkdir()
+    archive.mkdir()
+    save_partitioned(_rows("a", "2025-08-05"), folder=partitions)
+    save_partitioned(_rows("b", "2025-08-06", lu="LU18"), folder=partitions)
+    save_partitioned(_rows("c", "2025-10-02"), folder=partitions)
+
+    compacted = record_archive.compact_partitions(
+        keep_months=2,
+        today=date(2025, 10, 15),
+        partitions_folder=partitions,
+        archive_folder=archive,
+    )
+
+    assert compacted == ["2025-08"]
+    assert not (partitions / "cards-2025-08.csv").exists()
+    df = record_archive.read_archived_cards(
+        ["card_id", "lu"], start=date(2025, 8, 1), lu="LU21", folder=archive
+    )
+    assert df.to_dict("records") == [{"card_id": "a", "lu": "LU21"}]
+
+    # A late re-save of an archived card wins over the archived version
+    save_partitioned(_rows("a", "2025-08-05", action="late"), folder=partitions)
+    df = read_partitions(
+        ["card_id", "action"], folder=partitions, archive_folder=archive
+    )
+    assert sorted(map(tuple, df.itertuples(index=False))) == [
+        ("a", "late"),
+        ("b", "a"),
+        ("c", "a"),
+    ]
+
+
+def test_spa_snapshot_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    losses = DataLossesSummary(
+        RANGE="r", STOP="3", PR="90", MTBF="1", UPDT="2", PDT="3", NATR="4"
+    )
+    data = DataSPA(
+        data_losses=losses,
+        stops_reason=[
+            LinePerformanceDetail(
+                Line="L",
+                Detail="Jam",
+                Stops="3",
+                Downtime="1.5",
+                StopCount=3,
+                DowntimeSeconds=90.0,
+            ),
+            LinePerformanceDetail(Line="L", Detail="Other"),
+        ],
+    )
+    key = ("21", "PACK", "2025-08-05", "1")
+
+    record_archive.archive_spa_snapshot(key, data, folder=tmp_path)
+    record_archive.archive_spa_snapshot(key, data, folder=tmp_path)
+    empty_key = ("21", "PACK", "2025-08-05", "2")
+    record_archive.archive_spa_snapshot(
+        empty_key, DataSPA(data_losses=losses, stops_reason=[]), folder=tmp_path
+    )
+
+    assert record_archive.load_spa_snapshot(key, folder=tmp_path) == data
+    assert (
+        record_archive.load_spa_snapshot(empty_key, folder=tmp_path).stops_reason == []
+    )
+    trend = record_archive.read_spa_archive(
+        ["tanggal", "Detail", "StopCount"],
+        start=date(2025, 8, 1),
+        shift="1",
+        folder=tmp_path,
+    )
+    assert trend["Detail"].tolist() == ["Jam", "Other"]
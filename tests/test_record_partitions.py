@@ -0,0 +1,214 @@
+from datetime import date
+
+import pandas as pd
+
+from src.services import record_partitions
+from src.services.record_partitions import (
+    count_partitions,
+    iter_partition_pages,
+    migrate_csv,
+    partition_files,
+    partition_key,
+    read_appended_partitions,
+    read_partitions,
+    save_partitioned,
+)
+from src.services.record_service import RecordFilter, build_record_rows
+
+
+def _rows(card_id, tanggal):
+    cards = [
+        {"id": card_id, "issue": "Issue", "details": [{"detail": "d", "actions": []}]}
+    ]
+    return build_record_rows(
+        cards, username="ops", lu="LU21", tanggal=tanggal, shift="Shift 1"
+    )
+
+
+def test_partition_key():
+    assert partition_key("2025-11-18") == "2025-11"
+    assert partition_key("") == "undated"
+    assert partition_key("18/11/2025") == "undated"
+
+
+def test_range_reads_only_overlapping_months(tmp_path, monkeypatch):
+    for index, tanggal in enumerate(["2025-09-30", "2025-10-02", "2025-11-18", ""]):
+        save_partitioned(_rows(f"c{index}", tanggal), folder=tmp_path)
+
+    assert [path.name for path in partition_files(folder=tmp_path)] == [
+        "cards-2025-09.csv",
+        "cards-2025-10.csv",
+        "cards-2025-11.csv",
+        "cards-undated.csv",
+    ]
+
+    opened = []
+    read_cards_csv = record_partitions.read_cards_csv
+    monkeypatch.setattr(
+        record_partitions,
+        "read_cards_csv",
+        lambda path, *args: opened.append(path.name) or read_cards_csv(path, *args),
+    )
+    df = read_partitions(
+        ["card_id", "lu"],
+        date(2025, 10, 1),
+        date(2025, 10, 31),
+        folder=tmp_path,
+        archive_folder=tmp_path / "archive",
+    )
+
+    assert opened == ["cards-2025-10.csv"]
+    assert df.to_dict("records") == [{"card_id": "c1", "lu": "LU21"}]
+    assert (
+        len(
+            read_partitions(
+                ["card_id"], folder=tmp_path, archive_folder=tmp_path / "archive"
+            )
+        )
+        == 4
+    )
+
+
+def test_resave_replaces_inside_partition(tmp_path):
+    save_partitioned(_rows("c1", "2025-11-18"), folder=tmp_path)
+    save_partitioned(_rows("c1", "2025-11-18"), folder=tmp_path)
+
+    df = read_partitions(
+        ["card_id"], folder=tmp_path, archive_folder=tmp_path / "archive"
+    )
+    assert df["card_id"].tolist() == ["c1"]
+
+
+def test_resave_with_a_date_in_another_month_moves_the_card(tmp_path):
+    save_partitioned(
+        _rows("c1", "2025-10-31") + _rows("c2", "2025-10-30"), folder=tmp_path
+    )
+
+    # The operator corrects the date of an already saved card
+    save_partitioned(_rows("c1", "2025-11-01"), folder=tmp_path)
+
+    df = read_partitions(
+        ["card_id", "tanggal"], folder=tmp_path, archive_folder=tmp_path / "archive"
+    )
+    assert sorted(df.values.tolist()) == [
+        ["c1", "2025-11-01"],
+        ["c2", "2025-10-30"],
+    ]
+
+
+def test_migrate_splits_existing_csv(tmp_path):
+    csv_path = tmp_path / "database.csv"
+    rows = _rows("a", "2025-10-01") + _rows("b", "2025-11-01") + _rows("c", "")
+    pd.DataFrame(rows).to_csv(csv_path, index=False, encoding="utf-8-sig")
+    folder = tmp_path / "partitions"
+    folder.mkdir()
+
+    assert migrate_csv(csv_path, folder, chunksize=2) == 3
+    df = read_partitions(
+        ["card_id"],
+        end=date(2025, 10, 31),
+        folder=folder,
+        archive_folder=tmp_path / "archive",
+    )
+    assert df["card_id"].tolist() == ["a"]
+
+    # A second run does not append the history again
+    assert migrate_csv(csv_path, folder) == 0
+    assert (
+        len(
+            read_partitions(
+                ["card_id"], folder=folder, archive_folder=tmp_path / "archive"
+            )
+        )
+        == 3
+    )
+
+
+def test_pages_read_newest_month_first(tmp_path, monkeypatch):
+    for index, tanggal in enumerate(["2025-09-30", "2025-11-18", "2025-10-02"]):
+        save_partitioned(_rows(f"c{index}", tanggal), folder=tmp_path)
+
+    opened = []
+    read_month = record_partitions.read_month
+    monkeypatch.setattr(
+        record_partitions,
+        "read_month",
+        lambda key, *args: opened.append(key) or read_month(key, *args),
+    )
+    pages = iter_partition_pages(
+        ["card_id"], folder=tmp_path, archive_folder=tmp_path / "archive"
+    )
+
+    assert next(pages)["card_id"].tolist() == ["c1"]
+    assert opened == ["2025-11"]
+    assert [page["card_id"].tolist() for page in pages] == [["c2"], ["c0"]]
+
+
+def test_appended_partitions_read_new_tails_and_new_months(tmp_path):
+    save_partitioned(_rows("a", "2025-10-02"), folder=tmp_path)
+    marks = {}
+    list(
+        iter_partition_pages(
+            ["card_id"],
+            folder=tmp_path,
+            archive_folder=tmp_path / "archive",
+            marks=marks,
+        )
+    )
+
+    save_partitioned(_rows("b", "2025-10-03"), folder=tmp_path)
+    save_partitioned(_rows("c", "2025-11-01"), folder=tmp_path)
+    df, marks = read_appended_partitions(
+        marks, ["card_id"], folder=tmp_path, archive_folder=tmp_path / "archive"
+    )
+
+    assert sorted(df["card_id"]) == ["b", "c"]
+    assert len(marks) == 2
+    assert read_appended_partitions(
+        marks, ["card_id"], folder=tmp_path, archive_folder=tmp_path / "archive"
+    )[0].empty
+
+    (tmp_path / "cards-2025-11.csv").unlink()
+    assert (
+        read_appended_partitions(
+            marks, ["card_id"], folder=tmp_path, archive_folder=tmp_path / "archive"
+        )
+        is None
+    )
+
+
+def test_partition_reads_apply_filters(tmp_path):
+    save_partitioned(_rows("a", "2025-10-02"), folder=tmp_path)
+    rows = [dict(row, lu="LU18") for row in _rows("b", "2025-10-03")]
+    save_partitioned(rows, folder=tmp_path)
+
+    where = RecordFilter(lu=("LU18",))
+    df = read_partitions(
+        ["card_id"], folder=tmp_path, archive_folder=tmp_path / "archive", where=where
+    )
+    assert df["card_id"].tolist() == ["b"]
+    assert (
+        count_partitions(
+            folder=tmp_path, archive_folder=tmp_path / "archive", where=where
+        )
+        == 1
+    )
+
+
+def test_partition_pages_report_progress_over_the_whole_range(tmp_path):
+    for index, tanggal in enumerate(["2025-10-02", "2025-11-18"]):
+        save_partitioned(_rows(f"c{index}", tanggal), folder=tmp_path)
+    sizes = [path.stat().st_size for path in partition_files(folder=tmp_path)]
+
+    reports = []
+    pages = iter_partition_pages(
+        ["card_id"],
+        folder=tmp_path,
+        archive_folder=tmp_path / "archive",
+        marks={},
+        progress=lambda *report: reports.append(report),
+    )
+    list(pages)
+
+    # Newest month first, then the older one on top of it
+    assert reports == [(sizes[1], sum(sizes)), (sum(sizes), sum(sizes))]
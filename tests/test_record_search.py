@@ -0,0 +1,90 @@
+from datetime import date
+
+import pytest
+
+from src.services import record_service
+from src.services.record_search import (
+    SearchIndex,
+    fts_query,
+    get_search_index,
+    rebuild_search_index,
+    search_available,
+)
+from src.services.record_service import (
+    RecordFilter,
+    build_record_rows,
+    save_record_rows,
+)
+from src.utils.app_config import AppDataConfig
+
+pytestmark = pytest.mark.skipif(not search_available(), reason="no SQLite FTS5")
+
+
+def _rows(card_id, issue, action="reset", tanggal="2025-11-18", lu="LU21"):
+    cards = [
+        {
+            "id": card_id,
+            "issue": issue,
+            "details": [{"detail": "d", "actions": [action]}],
+        }
+    ]
+    return build_record_rows(
+        cards, username="ops", lu=lu, tanggal=tanggal, shift="Shift 1"
+    )
+
+
+def test_fts_query_quotes_words_as_prefixes():
+    assert fts_query("Gripper JAM") == '"gripper"* "jam"*'
+    assert fts_query('jam OR "x') == '"jam"* "or"* "x"*'
+    assert fts_query(" - ") is None
+
+
+def test_index_replaces_rows_of_resaved_cards(tmp_path):
+    index = SearchIndex(tmp_path / "search.sqlite3")
+    index.index_rows(_rows("c1", "Gripper jam"))
+    index.index_rows(_rows("c1", "Sealer too hot"))
+
+    columns = ["card_id", "issue"]
+    assert index.search("gripper", columns).empty
+    assert index.search("seal", columns)["card_id"].tolist() == ["c1"]
+    assert index.count() == 1
+
+
+def test_search_ranks_recent_and_better_matches_first(tmp_path):
+    index = SearchIndex(tmp_path / "search.sqlite3")
+    index.index_rows(_rows("old", "Gripper jam", tanggal="2023-11-18"))
+    index.index_rows(_rows("new", "Gripper jam", tanggal="2025-11-17"))
+    index.index_rows(_rows("weak", "Conveyor", action="clear gripper jam"))
+    index.index_rows(_rows("other", "Gripper jam", tanggal="2025-11-17", lu="LU18"))
+
+    today = date(2025, 11, 18)
+    ranked = index.search("gripper jam", ["card_id"], today=today)["card_id"]
+    assert ranked.tolist()[:2] == ["other", "new"]
+    assert ranked.tolist().index("new") < ranked.tolist().index("old")
+
+    filtered = index.search(
+        "gripper",
+        ["card_id"],
+        start=date(2025, 1, 1),
+        where=RecordFilter(lu=("LU21",)),
+        today=today,
+    )
+    assert filtered["card_id"].tolist() == ["new", "weak"]
+
+
+def test_saving_updates_the_index_beside_the_store(tmp_path, monkeypatch):
+    csv_path = tmp_path / "database.csv"
+    monkeypatch.setattr(record_service, "get_database_file_path", lambda: str(csv_path))
+    config = AppDataConfig(
+        environment="development", username="", password="", link_up=(), url=""
+    )
+
+    save_record_rows(_rows("c1", "Gripper jam"), config)
+
+    index = get_search_index(tmp_path / "search.sqlite3")
+    assert index.search("grip", ["card_id"])["card_id"].tolist() == ["c1"]
+    assert not index.is_built()
+
+    rebuild_search_index(config, tmp_path / "search.sqlite3")
+    assert index.is_built()
+    assert index.count() == 1
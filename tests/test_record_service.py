@@ -0,0 +1,259 @@
+import json
+
+import pandas as pd
+import pytest
+
+from src.services import recommendation_index, record_service, suggestion_index
+from src.services.record_service import (
+    RecordFilter,
+    append_cards_to_csv,
+    build_record_rows,
+    count_records,
+    iter_record_pages,
+    load_card_indexes_in_background,
+    read_appended_records,
+    upsert_cards_to_csv,
+)
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    path = tmp_path / "database.csv"
+    monkeypatch.setattr(record_service, "get_database_file_path", lambda: str(path))
+    return path
+
+
+def _rows(issue="Issue", actions=("a1", "a2")):
+    cards = [
+        {
+            "id": "c1",
+            "issue": issue,
+            "details": [{"detail": "d1", "actions": list(actions)}],
+        }
+    ]
+    return build_record_rows(
+        cards, username="ops", lu="LU21", tanggal="2025-11-18", shift="Shift 1"
+    )
+
+
+def test_append_writes_bom_and_header_only_once(database):
+    append_cards_to_csv(_rows())
+    append_cards_to_csv(_rows(issue="Kedua, dengan koma"))
+
+    raw = database.read_bytes()
+    assert raw.startswith(b"\xef\xbb\xbf")
+    assert raw.count(b"\xef\xbb\xbf") == 1
+    assert raw.count(b"card_id") == 1
+
+    df = pd.read_csv(database, dtype=str, encoding="utf-8-sig")
+    assert len(df) == 4
+    assert df["issue"].tolist()[-1] == "Kedua, dengan koma"
+
+
+def test_append_keeps_existing_bytes_and_column_order(database):
+    database.write_text(
+        "saved_at,card_id,detail_idx,action_idx,lu,tanggal,shift,issue,detail,action,user"
+        "\nx,old,,,LU1,,,,,,",
+        encoding="utf-8",
+    )
+    before = database.read_bytes()
+
+    append_cards_to_csv(_rows(actions=("only",)))
+
+    after = database.read_bytes()
+    assert after.startswith(before)
+    df = pd.read_csv(database, dtype=str, keep_default_na=False)
+    assert df["card_id"].tolist() == ["old", "c1"]
+    assert df.loc[1, "action"] == "only"
+    assert not df.loc[1, "saved_at"].startswith("c1")
+
+
+def test_append_rewrites_when_header_lacks_a_column(database):
+    database.write_text("card_id,lu\nold,LU1\n", encoding="utf-8")
+
+    append_cards_to_csv(_rows(actions=("only",)))
+
+    df = pd.read_csv(database, dtype=str, encoding="utf-8-sig")
+    assert df["card_id"].tolist() == ["old", "c1"]
+    assert "saved_at" in df.columns
+
+
+def test_upsert_replaces_card_in_place_and_drops_stale_rows(database):
+    append_cards_to_csv(_rows(actions=("a1", "a2")))
+    other = build_record_rows(
+        [{"id": "c2", "issue": "Lain", "details": [{"detail": "d", "actions": []}]}],
+        username="ops",
+        lu="LU21",
+        tanggal="2025-11-18",
+        shift="Shift 1",
+    )
+    upsert_cards_to_csv(other)
+
+    upsert_cards_to_csv(_rows(issue="Edit", actions=("b1",)))
+
+    df = pd.read_csv(database, dtype=str, encoding="utf-8-sig", keep_default_na=False)
+    assert df["card_id"].tolist() == ["c1", "c2"]
+    assert df.loc[0, "issue"] == "Edit"
+    assert df.loc[0, "action"] == "b1"
+    assert (df.loc[0, "detail_idx"], df.loc[0, "action_idx"]) == ("0", "0")
+
+
+def test_upsert_keeps_only_the_last_version_saved_in_one_batch(database):
+    upsert_cards_to_csv(_rows(issue="v1") + _rows(issue="v2"))
+
+    df = pd.read_csv(database, dtype=str, encoding="utf-8-sig", keep_default_na=False)
+    assert df["issue"].tolist() == ["v2", "v2"]
+    assert df["action"].tolist() == ["a1", "a2"]
+
+    # A later, shorter version in the same batch drops the stale positions
+    upsert_cards_to_csv(_rows(issue="v3") + _rows(issue="v4", actions=("b1",)))
+
+    df = pd.read_csv(database, dtype=str, encoding="utf-8-sig", keep_default_na=False)
+    assert df[["issue", "action"]].values.tolist() == [["v4", "b1"]]
+
+
+def test_upsert_logs_replaced_version_when_requested(database, tmp_path, monkeypatch):
+    revisions = tmp_path / "revisions.jsonl"
+    monkeypatch.setattr(
+        record_service, "get_revisions_file_path", lambda: str(revisions)
+    )
+    upsert_cards_to_csv(_rows(), keep_revisions=True)
+    assert not revisions.exists()
+
+    upsert_cards_to_csv(_rows(issue="Edit"), keep_revisions=True)
+
+    (entry,) = [json.loads(line) for line in revisions.read_text().splitlines()]
+    assert entry["card_id"] == "c1"
+    assert [row["action"] for row in entry["rows"]] == ["a1", "a2"]
+    assert {row["issue"] for row in entry["rows"]} == {"Issue"}
+
+
+def test_record_pages_are_newest_first(database):
+    for card_id, tanggal, shift in [
+        ("old", "2025-11-17", "Shift 3"),
+        ("a", "2025-11-18", "Shift 1"),
+        ("b", "2025-11-18", "Shift 2"),
+        ("c", "2025-11-18", "Shift 1"),
+    ]:
+        rows = build_record_rows(
+            [{"id": card_id, "issue": "i", "details": []}],
+            tanggal=tanggal,
+            shift=shift,
+        )
+        append_cards_to_csv(rows)
+
+    pages = list(iter_record_pages(["card_id"], page_rows=3))
+
+    assert [len(page) for page in pages] == [3, 1]
+    assert list(pages[0].columns) == ["card_id"]
+    assert pd.concat(pages)["card_id"].tolist() == ["b", "c", "a", "old"]
+
+
+def _card(card_id, tanggal="2025-11-18"):
+    return build_record_rows(
+        [{"id": card_id, "issue": "i", "details": []}],
+        tanggal=tanggal,
+        shift="Shift 1",
+    )
+
+
+def test_appended_records_parse_only_the_new_tail(database):
+    upsert_cards_to_csv(_card("a"))
+    marks = {}
+    list(iter_record_pages(["card_id"], marks=marks))
+    (mark,) = marks.values()
+
+    upsert_cards_to_csv(_card("b") + _card("c", tanggal="2025-01-01"))
+    df, marks = read_appended_records(marks, ["card_id"])
+
+    assert df["card_id"].tolist() == ["b", "c"]
+    assert marks[mark.path].offset == database.stat().st_size
+    assert marks[mark.path].rows == 3
+    assert read_appended_records(marks, ["card_id"])[0].empty
+
+    # A partial line still being written is left for the next refresh
+    with open(database, "ab") as handle:
+        handle.write(b'd,"multi\nline')
+    assert read_appended_records(marks, ["card_id"])[0].empty
+
+
+def test_appended_records_need_reload_after_rewrite(database):
+    upsert_cards_to_csv(_card("a") + _card("b"))
+    marks = {}
+    list(iter_record_pages(["card_id"], marks=marks))
+
+    # Editing a card rewrites the file
+    upsert_cards_to_csv(_card("a", tanggal="2025-11-19"))
+    assert read_appended_records(marks, ["card_id"]) is None
+
+    marks = {}
+    list(iter_record_pages(["card_id"], marks=marks))
+    database.write_bytes(database.read_bytes()[:-10])
+    assert read_appended_records(marks, ["card_id"]) is None
+
+
+def test_filters_reject_csv_rows_chunk_by_chunk(database, monkeypatch):
+    monkeypatch.setattr(record_service, "CSV_CHUNK_ROWS", 2)
+    for index, (lu, shift) in enumerate(
+        [("LU21", "Shift 1"), ("LU18", "Shift 1"), ("LU21", "Shift 2")] * 2
+    ):
+        rows = build_record_rows(
+            [{"id": f"c{index}", "issue": "i", "details": []}],
+            username="ops" if index < 3 else "qa",
+            lu=lu,
+            tanggal="2025-11-18",
+            shift=shift,
+        )
+        append_cards_to_csv(rows)
+
+    where = RecordFilter(lu=("LU21",), shift=("Shift 1",))
+    pages = list(iter_record_pages(["card_id"], where=where))
+    assert list(pages[0].columns) == ["card_id"]
+    assert pd.concat(pages)["card_id"].tolist() == ["c3", "c0"]
+    assert count_records(where=RecordFilter(user=("qa",))) == 3
+    assert count_records(where=RecordFilter(lu=("LU99",))) == 0
+
+
+def test_history_pages_report_parse_progress(database, monkeypatch):
+    monkeypatch.setattr(record_service, "CSV_CHUNK_ROWS", 2)
+    for index in range(5):
+        append_cards_to_csv(_card(f"c{index}"))
+
+    reports = []
+    pages = iter_record_pages(
+        ["card_id"], marks={}, progress=lambda *report: reports.append(report)
+    )
+    assert reports == []  # nothing is read before the first page is wanted
+    next(pages)
+
+    size = database.stat().st_size
+    assert len(reports) == 3
+    assert all(total == size for _, total in reports)
+    assert [done for done, _ in reports] == sorted(done for done, _ in reports)
+    assert reports[-1][0] == size
+
+
+def test_card_indexes_are_loaded_from_one_read(database, monkeypatch):
+    append_cards_to_csv(_rows(issue="Gripper jam"))
+    monkeypatch.setattr(suggestion_index, "_index", suggestion_index.SuggestionIndex())
+    monkeypatch.setattr(
+        recommendation_index, "_index", recommendation_index.RecommendationIndex()
+    )
+    reads = []
+    load_records = record_service.load_records
+    monkeypatch.setattr(
+        record_service,
+        "load_records",
+        lambda columns, config: reads.append(columns) or load_records(columns, config),
+    )
+
+    load_card_indexes_in_background().join(timeout=5)
+
+    assert len(reads) == 1
+    assert suggestion_index.get_suggestion_index().suggest("issue", "grip") == [
+        "Gripper jam"
+    ]
+    recommended = recommendation_index.get_recommendation_index().recommend(
+        "Gripper jam", lu="LU21"
+    )
+    assert recommended[0]["detail"] == "d1"
@@ -0,0 +1,175 @@
+import sqlite3
+from dataclasses import replace
+from datetime import date
+
+import pandas as pd
+
+from src.services import record_service, record_store
+from src.services.record_service import (
+    RecordFilter,
+    build_record_rows,
+    load_records,
+    save_record_rows,
+)
+from src.services.record_store import SQLiteRecordStore
+from src.utils.app_config import AppDataConfig
+
+CONFIG = AppDataConfig(
+    environment="development",
+    username="",
+    password="",
+    link_up=("LU21",),
+    url="",
+    storage_backend="sqlite",
+)
+
+
+def _rows(card_id="c1", actions=("a1", "a2")):
+    cards = [
+        {
+            "id": card_id,
+            "issue": "Issue",
+            "details": [{"detail": "d1", "actions": list(actions)}],
+        }
+    ]
+    return build_record_rows(
+        cards, username="ops", lu="LU21", tanggal="2025-11-18", shift="Shift 1"
+    )
+
+
+def test_store_uses_wal_and_indexes(tmp_path):
+    store = SQLiteRecordStore(tmp_path / "cards.sqlite3")
+
+    assert store.insert_rows(_rows()) == 2
+
+    with sqlite3.connect(store.path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(cards)")}
+    assert {
+        "idx_cards_lu_tanggal_shift",
+        "idx_cards_card_id",
+        "idx_cards_saved_at",
+    } <= indexes
+
+    df = store.read_frame(["lu", "action"])
+    assert df.to_dict("records") == [
+        {"lu": "LU21", "action": "a1"},
+        {"lu": "LU21", "action": "a2"},
+    ]
+
+
+def test_migrate_csv_streams_chunks(tmp_path):
+    csv_path = tmp_path / "database.csv"
+    rows = [row for index in range(7) for row in _rows(card_id=f"c{index}")]
+    pd.DataFrame(rows).to_csv(csv_path, index=False, encoding="utf-8-sig")
+
+    store = SQLiteRecordStore(tmp_path / "cards.sqlite3")
+    assert store.migrate_csv(csv_path, chunksize=3) == 14
+    assert store.read_frame(["card_id"])["card_id"].tolist() == [
+        row["card_id"] for row in rows
+    ]
+
+
+def test_migrate_csv_twice_imports_legacy_rows_once(tmp_path):
+    csv_path = tmp_path / "database.csv"
+    rows = _rows() + _rows(card_id="c2")
+    for row in rows:
+        # Saved before card positions were recorded
+        row["detail_idx"] = row["action_idx"] = ""
+    pd.DataFrame(rows).to_csv(csv_path, index=False, encoding="utf-8-sig")
+
+    store = SQLiteRecordStore(tmp_path / "cards.sqlite3")
+    assert store.migrate_csv(csv_path) == 4
+    assert store.migrate_csv(csv_path) == 0
+    assert SQLiteRecordStore(store.path).migrate_csv(csv_path, chunksize=1) == 0
+
+    assert store.count() == 4
+
+
+def test_backend_is_selected_from_config(tmp_path, monkeypatch):
+    sqlite_path = tmp_path / "database.sqlite3"
+    csv_path = tmp_path / "database.csv"
+    monkeypatch.setattr(
+        record_store, "get_sqlite_database_path", lambda: str(sqlite_path)
+    )
+    monkeypatch.setattr(record_service, "get_database_file_path", lambda: str(csv_path))
+
+    assert save_record_rows(_rows(), CONFIG) == sqlite_path
+    assert not csv_path.exists()
+    assert load_records(["lu", "issue"], CONFIG)["issue"].tolist() == ["Issue"] * 2
+
+    csv_config = replace(CONFIG, storage_backend="csv")
+    assert save_record_rows(_rows(actions=("x",)), csv_config) == csv_path
+    assert load_records(["action", "missing"], csv_config)["action"].tolist() == ["x"]
+
+
+def test_upsert_updates_positions_in_place(tmp_path):
+    store = SQLiteRecordStore(tmp_path / "cards.sqlite3")
+    store.insert_rows(_rows(card_id="c1", actions=("a1", "a2")))
+    store.insert_rows(_rows(card_id="c2"))
+
+    replaced = store.upsert_rows(_rows(card_id="c1", actions=("b1",)))
+
+    assert replaced["action"].tolist() == ["a1", "a2"]
+    df = store.read_frame(["card_id", "action"])
+    assert df.to_dict("records") == [
+        {"card_id": "c1", "action": "b1"},
+        {"card_id": "c2", "action": "a1"},
+        {"card_id": "c2", "action": "a2"},
+    ]
+    assert store.upsert_rows(_rows(card_id="c3")).empty
+
+
+def test_upsert_keeps_only_the_last_version_saved_in_one_batch(tmp_path):
+    store = SQLiteRecordStore(tmp_path / "cards.sqlite3")
+
+    store.upsert_rows(_rows(actions=("a1", "a2")) + _rows(actions=("b1",)))
+
+    assert store.read_frame(["card_id", "action"]).to_dict("records") == [
+        {"card_id": "c1", "action": "b1"}
+    ]
+
+
+def test_read_frame_filters_tanggal_range(tmp_path):
+    store = SQLiteRecordStore(tmp_path / "cards.sqlite3")
+    store.insert_rows(_rows(card_id="c1"))
+    later = [dict(row, card_id="c2", tanggal="2025-12-01") for row in _rows()]
+    store.insert_rows(later)
+
+    df = store.read_frame(["card_id"], start=date(2025, 11, 20))
+    assert set(df["card_id"]) == {"c2"}
+    df = store.read_frame(["card_id"], end=date(2025, 11, 30))
+    assert set(df["card_id"]) == {"c1"}
+
+
+def test_iter_pages_matches_csv_order(tmp_path):
+    store = SQLiteRecordStore(tmp_path / "cards.sqlite3")
+    for card_id, shift in [("a", "Shift 1"), ("b", "Shift 2"), ("c", "Shift 1")]:
+        store.insert_rows([dict(row, shift=shift) for row in _rows(card_id=card_id)])
+
+    pages = list(store.iter_pages(["card_id", "action"], page_rows=4))
+
+    assert [len(page) for page in pages] == [4, 2]
+    assert pd.concat(pages)["card_id"].tolist() == ["b", "b", "c", "c", "a", "a"]
+
+
+def test_count_uses_date_range(tmp_path):
+    store = SQLiteRecordStore(tmp_path / "cards.sqlite3")
+    store.insert_rows(_rows(card_id="c1"))
+
+    assert store.count() == 2
+    assert store.count(start=date(2025, 11, 19)) == 0
+
+
+def test_filters_are_pushed_into_the_query(tmp_path):
+    store = SQLiteRecordStore(tmp_path / "cards.sqlite3")
+    store.insert_rows(_rows(card_id="c1"))
+    store.insert_rows([dict(row, card_id="c2", lu="LU18") for row in _rows()])
+    store.insert_rows([dict(row, card_id="c3", user="qa") for row in _rows()])
+
+    where = RecordFilter(lu=("LU21", "LU18"), user=("ops",))
+    df = store.read_frame(["card_id"], where=where)
+    assert sorted(set(df["card_id"])) == ["c1", "c2"]
+    assert store.count(where=RecordFilter(lu=("LU18",))) == 2
+    pages = list(store.iter_pages(["card_id"], where=RecordFilter(user=("qa",))))
+    assert pd.concat(pages)["card_id"].tolist() == ["c3", "c3"]
@@ -0,0 +1,112 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from src.services import record_service, record_writer
+from src.services.record_writer import RecordWriter
+from src.utils.file_lock import FileLock, FileLockTimeout
+
+
+def _row(card_id):
+    return {"card_id": card_id, "lu": "LU21", "issue": "Issue"}
+
+
+def test_writer_coalesces_queued_batches(monkeypatch, tmp_path):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fake_save(rows, config=None):
+        calls.append([row["card_id"] for row in rows])
+        if len(calls) == 1:
+            started.set()
+            release.wait(5)
+        return tmp_path / "database.csv"
+
+    monkeypatch.setattr(record_writer, "save_record_rows", fake_save)
+    writer = RecordWriter()
+    try:
+        first = writer.submit([_row("a")])
+        # Queued while the first flush is still running
+        assert started.wait(5)
+        later = [writer.submit([_row(card_id)]) for card_id in ("b", "c", "d")]
+        release.set()
+
+        assert first.result(5) == tmp_path / "database.csv"
+        assert all(ack.result(5) == tmp_path / "database.csv" for ack in later)
+        assert calls == [["a"], ["b", "c", "d"]]
+    finally:
+        writer.close()
+
+
+def test_writer_keeps_the_latest_save_of_a_card_queued_twice(monkeypatch, tmp_path):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fake_save(rows, config=None):
+        calls.append([(row["card_id"], row["issue"]) for row in rows])
+        if len(calls) == 1:
+            started.set()
+            release.wait(5)
+        return tmp_path / "database.csv"
+
+    monkeypatch.setattr(record_writer, "save_record_rows", fake_save)
+    writer = RecordWriter()
+    try:
+        writer.submit([_row("a")])
+        assert started.wait(5)
+        # A double click on Save queues the same card twice
+        first = writer.submit([dict(_row("c"), issue="v1"), _row("b")])
+        second = writer.submit([dict(_row("c"), issue="v2")])
+        release.set()
+
+        assert first.result(5) == second.result(5) == tmp_path / "database.csv"
+        assert calls[1] == [("b", "Issue"), ("c", "v2")]
+    finally:
+        writer.close()
+
+
+def test_writer_reports_failures_and_flushes_on_close(monkeypatch):
+    def failing_save(rows, config=None):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(record_writer, "save_record_rows", failing_save)
+    writer = RecordWriter()
+    ack = writer.submit([_row("a")])
+    writer.close()
+
+    with pytest.raises(OSError, match="disk full"):
+        ack.result(0)
+    with pytest.raises(RuntimeError):
+        writer.submit([_row("b")])
+
+
+def test_file_lock_is_exclusive(tmp_path):
+    target = tmp_path / "database.csv"
+    with FileLock(target):
+        with pytest.raises(FileLockTimeout):
+            FileLock(target, timeout=0.1).acquire()
+    with FileLock(target, timeout=0.1):
+        pass
+
+
+def test_concurrent_appends_keep_every_row(tmp_path, monkeypatch):
+    path = tmp_path / "database.csv"
+    monkeypatch.setattr(record_service, "get_database_file_path", lambda: str(path))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(
+            pool.map(
+                lambda index: record_service.append_cards_to_csv(
+                    [_row(f"c{index}-{n}") for n in range(5)]
+                ),
+                range(40),
+            )
+        )
+
+    df = pd.read_csv(path, dtype=str, encoding="utf-8-sig")
+    assert len(df) == 200
+    assert df["card_id"].nunique() == 200
@@ -0,0 +1,135 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+
+from src.services.parse_executor import ParseExecutor
+from src.services.response_cache import SPAResponseCache
+from src.services.spa_service import SPADataProcessor
+
+FIXTURE = Path(__file__).resolve().parent.parent / "assets" / "response.html"
+CLOSED_URL = "https://spa.test/db.aspx?db_SegmentDateMax=2020-01-01&db_ShiftEnd=1&x=1"
+OPEN_URL = "https://spa.test/db.aspx?db_SegmentDateMax=2999-01-01&db_ShiftEnd=2"
+
+
+def test_ttl_depends_on_whether_period_is_closed(tmp_path):
+    cache = SPAResponseCache(tmp_path, open_ttl=60, closed_ttl=3600)
+
+    assert cache.ttl_for(CLOSED_URL) == 3600
+    assert cache.ttl_for(OPEN_URL) == 60
+    assert cache.ttl_for("http://127.0.0.1:5501/assets/response1.html") == 60
+
+
+def test_store_lookup_and_size_eviction(tmp_path):
+    cache = SPAResponseCache(tmp_path, max_bytes=250)
+    cache.store("https://a/1", b"x" * 100, {"ETag": '"v1"'}, "utf-8")
+    cache.store("https://a/2", b"y" * 100, {}, "utf-8")
+    cache.read_body(cache.lookup("https://a/1"))  # mark /1 as recently used
+    cache.store("https://a/3", b"z" * 100, {}, "utf-8")
+
+    assert cache.lookup("https://a/2") is None
+    first = cache.lookup("https://a/1")
+    assert first.etag == '"v1"'
+    assert cache.conditional_headers(first) == {"If-None-Match": '"v1"'}
+    assert cache.read_text(cache.lookup("https://a/3")) == "z" * 100
+
+
+def test_metadata_is_scanned_only_when_over_the_limit(tmp_path, monkeypatch):
+    cache = SPAResponseCache(tmp_path, max_bytes=250)
+    scans = []
+    entries = cache._entries
+    monkeypatch.setattr(cache, "_entries", lambda: scans.append(1) or entries())
+
+    cache.store("https://a/1", b"x" * 100, {}, "utf-8")
+    cache.store("https://a/2", b"y" * 100, {}, "utf-8")
+    cache.store("https://a/2", b"y" * 120, {}, "utf-8")  # replaces, +20 bytes
+    assert len(scans) == 1  # the first store counts what is already there
+
+    cache.store("https://a/3", b"z" * 100, {}, "utf-8")
+    assert len(scans) == 2
+    assert cache.lookup("https://a/1") is None
+    assert cache.lookup("https://a/3") is not None
+
+
+def test_concurrent_metadata_writes_use_their_own_temp_file(tmp_path):
+    cache = SPAResponseCache(tmp_path)
+    cache.store("https://a/1", b"x", {}, "utf-8")
+    entry = cache.lookup("https://a/1")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: cache.read_body(entry), range(200)))
+
+    assert cache.lookup("https://a/1") is not None
+    assert not list(tmp_path.glob("*.part"))
+
+
+def _processor(handler, cache, stream_parse=False):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client, SPADataProcessor(
+        CLOSED_URL,
+        client=client,
+        backoff_factor=0,
+        parse_executor=ParseExecutor("thread", 1),
+        stream_parse=stream_parse,
+        response_cache=cache,
+    )
+
+
+def test_fresh_entry_skips_network_and_stale_entry_revalidates(tmp_path):
+    body = FIXTURE.read_bytes()
+    cache = SPAResponseCache(tmp_path)
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"abc"':
+            return httpx.Response(304, headers={"ETag": '"abc"'})
+        return httpx.Response(200, content=body, headers={"ETag": '"abc"'})
+
+    async def fetch(stream_parse=False):
+        client, processor = _processor(handler, cache, stream_parse)
+        async with client:
+            await processor.start()
+            return await processor.get_data_spa()
+
+    first = asyncio.run(fetch())
+    assert len(requests) == 1
+
+    second = asyncio.run(fetch())
+    assert len(requests) == 1  # served from cache
+    assert second == first
+
+    entry = cache.lookup(CLOSED_URL)
+    entry.expires_at = time.time() - 1
+    cache._write_meta(entry)
+
+    for stream_parse in (False, True):
+        revalidated = asyncio.run(fetch(stream_parse))
+        assert requests[-1].headers["If-None-Match"] == '"abc"'
+        assert revalidated == first
+        entry = cache.lookup(CLOSED_URL)
+        assert entry.is_fresh()
+        entry.expires_at = time.time() - 1
+        cache._write_meta(entry)
+
+
+def test_pages_without_loss_tree_are_not_cached(tmp_path):
+    cache = SPAResponseCache(tmp_path)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b"<html><body>Login</body></html>")
+
+    async def run():
+        client, processor = _processor(handler, cache, stream_parse=True)
+        processor.max_retries = 1
+        async with client:
+            try:
+                await processor.start()
+            except Exception:
+                pass
+
+    asyncio.run(run())
+    assert cache.lookup(CLOSED_URL) is None
+    assert not list(tmp_path.glob("*.part"))
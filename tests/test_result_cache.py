@@ -0,0 +1,49 @@
+from src.services.result_cache import DataSPACache
+from src.services.spa_service import DataLossesSummary, DataSPA
+from src.utils.app_config import AppDataConfig
+
+
+def _data_spa(stop: str) -> DataSPA:
+    summary = DataLossesSummary(
+        RANGE="", STOP=stop, PR="", MTBF="", UPDT="", PDT="", NATR=""
+    )
+    return DataSPA(data_losses=summary, stops_reason=[])
+
+
+def test_lru_eviction_and_counters():
+    cache = DataSPACache(max_entries=2)
+    cache.put(("18", "PACK", "2020-01-01", "1"), _data_spa("1"))
+    cache.put(("21", "PACK", "2020-01-01", "1"), _data_spa("2"))
+
+    assert cache.get(("18", "PACK", "2020-01-01", "1")).data_losses.STOP == "1"
+    cache.put(("26", "PACK", "2020-01-01", "1"), _data_spa("3"))
+
+    assert cache.get(("21", "PACK", "2020-01-01", "1")) is None
+    assert cache.get(("18", "PACK", "2020-01-01", "1")) is not None
+    assert cache.stats() == {"hits": 2, "misses": 1, "size": 2}
+
+
+def test_running_period_expires_after_ttl():
+    cache = DataSPACache(open_ttl=0)
+    cache.put(("18", "PACK", "2999-01-01", "1"), _data_spa("1"))
+    cache.put(("18", "PACK", "2020-01-01", "1"), _data_spa("1"))
+
+    assert cache.get(("18", "PACK", "2999-01-01", "1")) is None
+    assert cache.get(("18", "PACK", "2020-01-01", "1")) is not None
+
+
+def test_results_are_dropped_when_the_spa_server_changes():
+    def config(url):
+        return AppDataConfig(
+            environment="production", username="", password="", link_up=(), url=url
+        )
+
+    cache = DataSPACache()
+    cache.use_source(config("https://spa.example/db.aspx?"))
+    cache.put(("18", "PACK", "2020-01-01", "1"), _data_spa("1"))
+
+    cache.use_source(config("https://spa.example/db.aspx?"))
+    assert cache.get(("18", "PACK", "2020-01-01", "1")) is not None
+
+    cache.use_source(config("https://other.example/db.aspx?"))
+    assert cache.get(("18", "PACK", "2020-01-01", "1")) is None
@@ -0,0 +1,51 @@
+import asyncio
+from io import StringIO
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.services.spa_extractor import extract_loss_tree, extract_loss_tree_tables
+from src.services.spa_service import SPADataProcessor
+
+ASSETS = Path(__file__).resolve().parent.parent / "assets"
+FIXTURES = sorted(path.name for path in ASSETS.glob("response*.html"))
+
+
+def _data_spa(tables: list[pd.DataFrame]):
+    processor = SPADataProcessor(url="", config=None)
+    processor.selected_table = processor.select_relevant_table(tables)
+    processor.spa_dict = processor.split_table_into_dict()
+    return asyncio.run(processor.get_data_spa())
+
+
+@pytest.mark.parametrize("fixture", FIXTURES)
+def test_extractor_matches_read_html_table(fixture):
+    html = (ASSETS / fixture).read_text(encoding="utf-8")
+    legacy_tables = pd.read_html(StringIO(html))
+    legacy = next(df for df in legacy_tables if len(df) > 20)
+
+    extracted = extract_loss_tree(html)
+
+    pd.testing.assert_frame_equal(extracted, legacy)
+    assert _data_spa(extract_loss_tree_tables(html)) == _data_spa(legacy_tables)
+
+
+def test_extractor_skips_layout_tables_and_scripts():
+    rows = "".join(f"<tr><td>{i}</td><td>x</td></tr>" for i in range(25))
+    html = (
+        "<html><head><style>td {color: red}</style>"
+        "<script>var t = '<table>';</script></head><body>"
+        "<table><tr><td><table><tr><td>layout</td></tr></table></td></tr></table>"
+        f"<table><tbody>{rows}</tbody></table></body></html>"
+    )
+
+    frame = extract_loss_tree(html)
+
+    assert frame.shape == (25, 2)
+    assert frame.iat[24, 0] == 24
+
+
+def test_extractor_returns_empty_without_loss_tree():
+    assert extract_loss_tree("<html><body><p>Login</p></body></html>").empty
+    assert extract_loss_tree_tables("<html><body></body></html>") == []
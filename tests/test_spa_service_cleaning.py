@@ -47,3 +47,70 @@ def test_line_performance_cleaning_and_partition():
     assert details[1].Line == "Line A"
     # fourth row contained '\u00A0SubLine - extra' but had missing Stops and should be dropped; next is Line B
     assert details[2].Line == "Line B"
+
+
+def test_line_performance_values_are_stringified_per_cell():
+    rows = [
+        [None] * 10,
+        [None, "Line A", 3, None, "1.5", None, None, None, None, "Detail A"],
+        [None, "Line A", 2, None, None, None, None, None, None, 42],
+    ]
+    df = pd.DataFrame(rows, columns=list(range(10)))
+
+    processor = SPADataProcessor(url="", config=None)
+    processor.spa_dict = {"line_performance_details": df}
+
+    details = asyncio.run(processor.get_line_performance_details())
+
+    assert [
+        d.model_dump(include={"Line", "Detail", "Stops", "Downtime"}) for d in details
+    ] == [
+        {"Line": "Line A", "Detail": "Detail A", "Stops": "3.0", "Downtime": "1.5"},
+        {"Line": "Line A", "Detail": "42", "Stops": "2.0", "Downtime": None},
+    ]
+
+
+def test_stop_and_downtime_are_parsed_once_into_arrays():
+    rows = [
+        [None] * 10,
+        [None, "Line A", "3", None, "1.5", None, None, None, None, "Detail A"],
+        [None, "Line A", "7", None, "12.0", None, None, None, None, "Detail B"],
+        [None, "Line A", "x", None, "00:05", None, None, None, None, "Detail C"],
+        [None, "Line A", "1", None, None, None, None, None, None, "Detail D"],
+    ]
+    processor = SPADataProcessor(url="", config=None)
+    processor.spa_dict = {
+        "line_performance_details": pd.DataFrame(rows, columns=list(range(10))),
+        "time_range": pd.DataFrame([[""] * 10] * 6),
+        "unplanned": pd.DataFrame([[""] * 10] * 2),
+        "planned": pd.DataFrame([[""] * 10] * 2),
+        "rate_loss": pd.DataFrame([[""] * 10] * 4),
+    }
+
+    data_spa = asyncio.run(processor.get_data_spa())
+
+    assert [d.StopCount for d in data_spa.stops_reason] == [3, 7, None, 1]
+    assert [d.DowntimeSeconds for d in data_spa.stops_reason] == [
+        90.0,
+        720.0,
+        300.0,
+        None,
+    ]
+    assert data_spa.stop_counts.tolist() == [3, 7, 0, 1]
+    assert data_spa.total_stops() == 11
+    assert data_spa.total_downtime_seconds() == 1110.0
+    assert [d.Detail for d in data_spa.sorted_reasons()] == [
+        "Detail B",
+        "Detail C",
+        "Detail A",
+        "Detail D",
+    ]
+    assert [d.Detail for d in data_spa.sorted_reasons("stops")][:2] == [
+        "Detail B",
+        "Detail A",
+    ]
+    # Arrays rebuilt from the models match the ones filled during extraction
+    rebuilt = data_spa.model_copy(deep=True)
+    rebuilt._stop_counts = rebuilt._downtime_seconds = None
+    assert rebuilt.stop_counts.tolist() == data_spa.stop_counts.tolist()
+    assert rebuilt == data_spa
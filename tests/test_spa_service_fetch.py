@@ -0,0 +1,73 @@
+import asyncio
+import threading
+from pathlib import Path
+
+import httpx
+import pytest
+
+from src.services.parse_executor import ParseExecutor
+from src.services.spa_extractor import LossTreeStreamExtractor
+from src.services.spa_service import SPADataProcessor
+
+FIXTURE = Path(__file__).resolve().parent.parent / "assets" / "response3.html"
+
+
+def _run(stream_parse: bool, failures: int = 0):
+    body = FIXTURE.read_bytes()
+    calls = {"count": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        if calls["count"] <= failures:
+            return httpx.Response(500, request=request)
+        return httpx.Response(
+            200, content=body, headers={"Content-Type": "text/html; charset=utf-8"}
+        )
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            processor = SPADataProcessor(
+                "http://spa.test/db.aspx",
+                client=client,
+                backoff_factor=0,
+                parse_executor=ParseExecutor("thread", 1),
+                stream_parse=stream_parse,
+            )
+            await processor.start()
+            return await processor.get_data_spa()
+
+    return asyncio.run(run()), calls["count"]
+
+
+@pytest.mark.parametrize("stream_parse", [False, True])
+def test_fetch_parses_loss_tree(stream_parse):
+    data_spa, calls = _run(stream_parse)
+
+    assert calls == 1
+    assert data_spa.data_losses.STOP == "17"
+    assert data_spa.data_losses.RANGE == "2025-11-03 06:00 to 2025-11-04 06:00"
+    assert len(data_spa.stops_reason) == 40
+
+
+def test_streaming_matches_buffered_and_keeps_retries():
+    streamed, calls = _run(stream_parse=True, failures=2)
+    buffered, _ = _run(stream_parse=False)
+
+    assert calls == 3
+    assert streamed == buffered
+
+
+def test_streamed_chunks_are_parsed_off_the_loop_thread(monkeypatch):
+    threads = set()
+    feed = LossTreeStreamExtractor.feed
+
+    def recording_feed(self, chunk):
+        threads.add(threading.get_ident())
+        return feed(self, chunk)
+
+    monkeypatch.setattr(LossTreeStreamExtractor, "feed", recording_feed)
+    data_spa, _ = _run(stream_parse=True)
+
+    assert data_spa.data_losses.STOP == "17"
+    assert len(threads) == 1
+    assert threading.get_ident() not in threads
@@ -0,0 +1,105 @@
+import time
+
+import pandas as pd
+
+from src.services.record_service import build_record_rows
+from src.services.suggestion_index import SuggestionIndex, normalize
+
+
+def _rows(card_id, issue, details=(("d", ["reset"]),), lu="LU21"):
+    cards = [
+        {
+            "id": card_id,
+            "issue": issue,
+            "details": [
+                {"detail": detail, "actions": list(actions)}
+                for detail, actions in details
+            ],
+        }
+    ]
+    return build_record_rows(
+        cards, username="ops", lu=lu, tanggal="2025-11-18", shift="Shift 1"
+    )
+
+
+def _loaded(*row_lists):
+    index = SuggestionIndex()
+    index.load(pd.DataFrame([row for rows in row_lists for row in rows]))
+    return index
+
+
+def test_normalize_folds_case_and_spaces():
+    assert normalize("  Gripper   JAM ") == "gripper jam"
+
+
+def test_suggestions_are_ranked_by_use_and_exclude_the_typed_text():
+    index = _loaded(
+        _rows("c1", "Gripper jam"),
+        _rows("c2", "Gripper jam"),
+        _rows("c3", "Gripper worn"),
+        _rows("c4", "Glue low"),
+    )
+
+    assert index.suggest("issue", "gr") == ["Gripper jam", "Gripper worn"]
+    # Texts used equally often come in alphabetical order
+    assert index.suggest("issue", "G") == ["Gripper jam", "Glue low", "Gripper worn"]
+    assert index.suggest("issue", "gripper jam") == []
+    assert index.suggest("issue", "") == []
+
+
+def test_issue_and_detail_count_once_per_card_despite_repeated_rows():
+    index = _loaded(
+        _rows("c1", "Sealer hot", details=(("Heater", ["a", "b", "c"]),)),
+        _rows("c2", "Sealer cold"),
+        _rows("c3", "Sealer cold"),
+    )
+
+    assert index.suggest("issue", "seal") == ["Sealer cold", "Sealer hot"]
+    assert index.suggest("action", "") == []
+
+
+def test_selected_lu_comes_first_and_other_lus_fill_up():
+    index = _loaded(
+        _rows("c1", "Filler leak", lu="LU18"),
+        _rows("c2", "Filler leak", lu="LU18"),
+        _rows("c3", "Filler empty", lu="LU21"),
+    )
+
+    assert index.suggest("issue", "fil", lu="LU21") == ["Filler empty", "Filler leak"]
+    assert index.suggest("issue", "fil", lu="LU18") == ["Filler leak", "Filler empty"]
+    assert index.suggest("issue", "fil", lu="LU21", limit=1) == ["Filler empty"]
+
+
+def test_resaved_card_replaces_its_earlier_texts():
+    index = _loaded(_rows("c1", "Capper stuck"))
+    index.add_rows(_rows("c1", "Capper torque"))
+    index.add_rows(_rows("c2", "Carton skew"))
+
+    assert index.suggest("issue", "ca") == ["Capper torque", "Carton skew"]
+
+
+def test_saves_during_the_initial_load_are_applied_after_it():
+    index = SuggestionIndex()
+    index.add_rows(_rows("c1", "Labeler skew"))
+    index.add_rows(_rows("c2", "Labeler glue"))
+    assert index.suggest("issue", "lab") == []
+
+    # The store read already contained the save of c1
+    index.load(pd.DataFrame(_rows("c1", "Labeler skew")))
+
+    assert index.loaded
+    assert index.suggest("issue", "lab") == ["Labeler glue", "Labeler skew"]
+
+
+def test_lookup_stays_fast_on_a_large_history():
+    rows = [
+        {"card_id": f"c{n}", "lu": f"LU{n % 4}", "issue": f"issue {n % 5000} x"}
+        for n in range(50_000)
+    ]
+    index = SuggestionIndex()
+    index.load(pd.DataFrame(rows))
+
+    started = time.perf_counter()
+    for _ in range(100):
+        index.suggest("issue", "issue 12", lu="LU1")
+    assert (time.perf_counter() - started) / 100 < 0.01